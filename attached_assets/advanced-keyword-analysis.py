@@ -8,17 +8,21 @@
 
 import os
 import re
+import sys
 import json
 import time
 import random
 import sqlite3
 import logging
+import queue
 import asyncio
+import threading
 import requests
 import numpy as np
 import pandas as pd
 import urllib.parse
 from datetime import datetime, timedelta
+from contextlib import contextmanager
 from typing import Dict, List, Tuple, Union, Any, Optional
 
 # 웹 크롤링 및 비동기 처리 라이브러리
@@ -42,6 +46,19 @@ from flask import Flask, render_template, request, jsonify, send_file
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 
+# 의미 분석기 임베딩 저장소 (선택적) - server/api/ml 모듈은 경로에 직접 추가해야 가져올 수 있음
+ML_MODULE_DIR = os.environ.get('ML_MODULE_DIR') or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'server', 'api', 'ml')
+)
+if os.path.isdir(ML_MODULE_DIR) and ML_MODULE_DIR not in sys.path:
+    sys.path.append(ML_MODULE_DIR)
+
+try:
+    from semantic_analyzer import index_keywords as index_keyword_embeddings
+    HAS_EMBEDDING_INDEXER = True
+except ImportError:
+    HAS_EMBEDDING_INDEXER = False
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -61,6 +78,10 @@ CONFIG = {
     "NAVER_ACCESS_LICENSE": "01000000005a79e0d0ffff30be92041e87dd2444c689e1209efbe2f9ea58fd3a3ae67ee01e",
     "NAVER_SECRET_KEY": "AQAAAABaeeDQ//8wvpIEHofdJETGcg3aHhG5YRGgFHPnSsNISw==",
     "DB_PATH": "gugongil_keywords.db",
+    "DB_CACHE_SIZE_KB": 65536,  # 연결별 SQLite 페이지 캐시 크기(KiB)
+    "DB_MMAP_SIZE": 268435456,  # SQLite 메모리 매핑 크기(바이트)
+    "DB_BUSY_TIMEOUT": 30.0,    # 쓰기 잠금 대기 시간(초)
+    "DB_POOL_SIZE": 8,          # 최대 SQLite 연결 수 (스레드 간 대여/반납)
     "MAX_PAGES": 20,            # 크롤링할 최대 페이지 수
     "CRAWL_DELAY": 1.5,         # 페이지 간 딜레이(초)
     "REQUEST_TIMEOUT": 10,      # API 및 크롤링 요청 타임아웃(초)
@@ -73,331 +94,874 @@ CONFIG = {
     "PROXY_LIST_FILE": "proxy_list.json",  # 프록시 목록 파일
 }
 
+class SQLiteConnectionManager:
+    """
+    SQLite 연결 관리 클래스
+    - 최대 pool_size개 연결을 열어 두고 cursor()/transaction() 구간 동안만 대여 후 반납
+      (요청마다 새 스레드를 쓰는 웹 서버에서도 연결 수가 늘지 않음, 한 번에 한 스레드만 사용)
+    - WAL 저널, synchronous=NORMAL, 페이지 캐시, mmap 크기 등 PRAGMA는 연결을 열 때 한 번만 적용
+    - transaction() 컨텍스트로 커밋/롤백 관리 (중첩 호출은 같은 연결에서 SAVEPOINT 사용)
+    """
+    
+    def __init__(self, db_path: str, cache_size_kb: int = CONFIG["DB_CACHE_SIZE_KB"],
+                 mmap_size: int = CONFIG["DB_MMAP_SIZE"], busy_timeout: float = CONFIG["DB_BUSY_TIMEOUT"],
+                 pool_size: int = CONFIG["DB_POOL_SIZE"]):
+        self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout = busy_timeout
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._connections = []
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+    
+    def _open(self) -> sqlite3.Connection:
+        """새 연결 생성 및 PRAGMA 적용"""
+        # isolation_level=None: 트랜잭션은 transaction()에서 직접 BEGIN/COMMIT
+        # check_same_thread=False: 대여한 스레드만 사용하므로 반납 후 다른 스레드가 재사용 가능
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None,
+                               check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')  # 음수는 KiB 단위
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """유휴 연결 대여 (없으면 pool_size까지 새로 열고, 가득 찼으면 반납될 때까지 대기)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            create = len(self._connections) < self.pool_size
+            if create:
+                # 자리를 먼저 확보한 뒤 잠금 밖에서 연결
+                self._connections.append(None)
+        if not create:
+            try:
+                return self._idle.get(timeout=self.busy_timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    f"SQLite 연결 대기 시간 초과 ({self.pool_size}개 모두 사용 중)"
+                )
+        
+        try:
+            conn = self._open()
+        except BaseException:
+            with self._lock:
+                self._connections.remove(None)
+            raise
+        with self._lock:
+            self._connections[self._connections.index(None)] = conn
+        return conn
+    
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """연결 반납 (끝나지 않은 트랜잭션은 롤백)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error as e:
+            # 사용할 수 없는 연결은 풀에서 제거
+            logger.warning("SQLite 연결 반납 오류, 연결 폐기: %s", str(e))
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            return
+        self._idle.put(conn)
+    
+    @contextmanager
+    def connection(self):
+        """
+        현재 스레드의 연결 대여 (중첩 호출은 같은 연결을 공유, 가장 바깥 구간이 끝나면 반납)
+        
+        Yields:
+            sqlite3.Connection
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.holds += 1
+            try:
+                yield conn
+            finally:
+                self._local.holds -= 1
+            return
+        
+        conn = self._acquire()
+        self._local.conn, self._local.holds, self._local.depth = conn, 1, 0
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._release(conn)
+    
+    @contextmanager
+    def cursor(self, row_factory=None):
+        """
+        읽기용 커서 (트랜잭션 밖에서는 자동 커밋 모드)
+        
+        Args:
+            row_factory: 이 커서에만 적용할 행 팩토리 (예: sqlite3.Row)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            if row_factory is not None:
+                cursor.row_factory = row_factory
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+    
+    @contextmanager
+    def transaction(self, row_factory=None, immediate: bool = True):
+        """
+        트랜잭션 커서 (정상 종료 시 커밋, 예외 발생 시 롤백 후 예외 전달)
+        
+        Args:
+            row_factory: 이 커서에만 적용할 행 팩토리
+            immediate: True면 BEGIN IMMEDIATE로 시작해 쓰기 잠금을 미리 확보
+                       (WAL에서 읽기 후 쓰기로 승격하면 다른 쓰기와 겹칠 때 대기 없이 실패하므로 기본값)
+        """
+        with self.connection() as conn:
+            depth = self._local.depth
+            savepoint = f'sp_{depth}'
+            
+            if depth == 0:
+                conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            else:
+                conn.execute(f'SAVEPOINT {savepoint}')
+            self._local.depth = depth + 1
+            
+            try:
+                with self.cursor(row_factory) as cursor:
+                    yield cursor
+            except BaseException:
+                if depth == 0:
+                    conn.rollback()
+                else:
+                    conn.execute(f'ROLLBACK TO {savepoint}')
+                    conn.execute(f'RELEASE {savepoint}')
+                raise
+            else:
+                if depth == 0:
+                    conn.commit()
+                else:
+                    conn.execute(f'RELEASE {savepoint}')
+            finally:
+                self._local.depth = depth
+    
+    def close_all(self) -> None:
+        """
+        열린 모든 연결 닫기 (종료 시 호출)
+        
+        Raises:
+            sqlite3.Error: 닫지 못한 연결이 있는 경우 (모든 연결을 시도한 뒤 발생)
+        """
+        with self._lock:
+            connections, self._connections = [c for c in self._connections if c is not None], []
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        
+        failed = []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error("SQLite 연결 닫기 오류: %s", str(e))
+                failed.append(e)
+        if failed:
+            raise sqlite3.OperationalError(f"SQLite 연결 {len(failed)}개를 닫지 못했습니다: {failed[0]}")
+
+class KeywordEmbeddingIndexer:
+    """
+    새 키워드 임베딩 백그라운드 색인 클래스
+    - 저장 경로에서는 큐에 넣기만 하고, 작업 스레드가 모아 둔 키워드를 nlp.pipe 한 번으로 색인
+    - spaCy 모델을 불러올 수 없으면 한 번만 기록하고 이후 키워드는 색인하지 않음
+    """
+    
+    def __init__(self, index_fn, batch_size: int = 256, max_queue: int = 100000):
+        self.index_fn = index_fn
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.disabled = False
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def enqueue(self, keyword: str) -> None:
+        """색인할 키워드 추가 (큐가 가득 차면 버림)"""
+        if self.disabled:
+            return
+        try:
+            self.queue.put_nowait(keyword)
+        except queue.Full:
+            logger.warning("임베딩 색인 큐가 가득 차 키워드를 건너뜀: %s", keyword)
+            return
+        
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='keyword-embedding-indexer', daemon=True)
+                self._thread.start()
+    
+    def join(self) -> None:
+        """큐에 들어간 키워드가 모두 처리될 때까지 대기"""
+        self.queue.join()
+    
+    def _run(self) -> None:
+        """큐에서 키워드를 배치 단위로 꺼내 색인"""
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                if not self.disabled:
+                    self.index_fn(list(dict.fromkeys(batch)))
+            except (ImportError, OSError) as e:
+                # 모델이 없으면 키워드마다 다시 불러오지 않도록 비활성화
+                self.disabled = True
+                logger.warning("임베딩 색인 비활성화 (모델 로드 실패): %s", str(e))
+            except Exception as e:
+                logger.warning("임베딩 색인 오류: %d개 키워드 - %s", len(batch), str(e))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
 class DatabaseManager:
     """
     데이터베이스 관리 클래스
     - 키워드 데이터 저장, 조회, 분석 기능 제공
-    - SQLite 기반으로 구현
+    - SQLite 기반으로 구현 (스레드별 연결 재사용)
     """
     
+    # IN (...) 조회 한 번에 바인딩할 최대 변수 수 (구버전 SQLite 기본 제한 999 이하)
+    MAX_BIND_PARAMS = 900
+    
+    # 스키마 마이그레이션 (버전, 설명, SQL 목록) - PRAGMA user_version으로 적용 버전 추적
+    # 이미 배포된 항목은 수정하지 말고 새 버전을 뒤에 추가
+    MIGRATIONS = [
+        (1, "조회 경로별 인덱스 추가", [
+            # get_keyword_data: 키워드별 상품을 순위순으로 조회
+            'CREATE INDEX IF NOT EXISTS idx_products_keyword_rank ON products(keyword_id, rank)',
+            # get_keyword_data / get_top_related_keywords: 관계 강도순 관련 키워드 (커버링)
+            'CREATE INDEX IF NOT EXISTS idx_related_keywords_strength '
+            'ON related_keywords(main_keyword_id, relation_strength DESC, related_keyword)',
+            # get_ranking_history: 키워드 + 기간 조건 (커버링)
+            'CREATE INDEX IF NOT EXISTS idx_keyword_rankings_keyword_date '
+            'ON keyword_rankings(keyword_id, date, rank, product_id)',
+            # clean_old_data: 기간 조건 삭제
+            'CREATE INDEX IF NOT EXISTS idx_keyword_rankings_date ON keyword_rankings(date)',
+            # get_keyword_stats: 최근 크롤링 성공률 및 최근 활동 (커버링)
+            'CREATE INDEX IF NOT EXISTS idx_crawl_logs_created_status ON crawl_logs(created_at, status)',
+            # get_all_keywords: 전체/카테고리별 최근 갱신순
+            'CREATE INDEX IF NOT EXISTS idx_keywords_updated ON keywords(updated_at)',
+            'CREATE INDEX IF NOT EXISTS idx_keywords_category_updated ON keywords(category, updated_at)',
+        ]),
+    ]
+    
+    # 실행 계획 점검 대상 조회 (전체 테이블 스캔이 없어야 하는 경로)
+    HOT_QUERIES = {
+        'keyword_products': (
+            'SELECT product_name, price, rank FROM products WHERE keyword_id = ? ORDER BY rank', (1,)
+        ),
+        'keyword_related': (
+            'SELECT related_keyword, relation_strength FROM related_keywords '
+            'WHERE main_keyword_id = ? ORDER BY relation_strength DESC', (1,)
+        ),
+        'keyword_trends': (
+            'SELECT date, search_volume FROM keyword_trends WHERE keyword_id = ? ORDER BY date', (1,)
+        ),
+        'ranking_history': (
+            'SELECT kr.date, kr.rank, p.product_name FROM keyword_rankings kr '
+            'JOIN products p ON kr.product_id = p.id '
+            "WHERE kr.keyword_id = ? AND kr.date >= date('now', '-30 day') ORDER BY kr.date, kr.rank", (1,)
+        ),
+        'crawl_success_rate': (
+            "SELECT COUNT(*), SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) FROM crawl_logs "
+            "WHERE created_at >= datetime('now', '-7 day')", ()
+        ),
+        'recent_activity': (
+            'SELECT keyword, source, status, created_at FROM crawl_logs ORDER BY created_at DESC LIMIT 10', ()
+        ),
+        'all_keywords': (
+            'SELECT id, keyword FROM keywords ORDER BY updated_at DESC LIMIT 100', ()
+        ),
+        'category_keywords': (
+            'SELECT id, keyword FROM keywords WHERE category = ? ORDER BY updated_at DESC LIMIT 100', ('c',)
+        ),
+    }
+    
     def __init__(self, db_path: str = CONFIG["DB_PATH"]):
         self.db_path = db_path
+        self.connections = SQLiteConnectionManager(db_path)
+        self.keyword_listeners = []
         self._init_database()
+        
+        # 새 키워드는 백그라운드에서 모아 임베딩 저장소에 추가 (저장 경로에서 spaCy를 실행하지 않음)
+        self.embedding_indexer = None
+        if HAS_EMBEDDING_INDEXER:
+            self.embedding_indexer = KeywordEmbeddingIndexer(index_keyword_embeddings)
+            self.add_keyword_listener(lambda keyword_id, keyword: self.embedding_indexer.enqueue(keyword))
+    
+    def add_keyword_listener(self, callback) -> None:
+        """새 키워드 저장 시 호출할 콜백 등록 (callback(keyword_id, keyword))"""
+        self.keyword_listeners.append(callback)
+    
+    def _notify_keyword_listeners(self, keyword_id: int, keyword: str) -> None:
+        """키워드 리스너 호출 (리스너 오류는 저장 결과에 영향을 주지 않음)"""
+        for callback in self.keyword_listeners:
+            try:
+                callback(keyword_id, keyword)
+            except Exception as e:
+                logger.warning("키워드 리스너 오류: %s - %s", keyword, str(e))
+    
+    def close(self) -> None:
+        """데이터베이스 연결 닫기"""
+        self.connections.close_all()
     
     def _init_database(self) -> None:
         """데이터베이스 초기화 및 필요한 테이블 생성"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 키워드 테이블
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS keywords (
-            id INTEGER PRIMARY KEY,
-            keyword TEXT NOT NULL,
-            category TEXT,
-            search_volume INTEGER,
-            competition REAL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(keyword, category)
-        )
-        ''')
-        
-        # 관련 키워드 테이블
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS related_keywords (
-            id INTEGER PRIMARY KEY,
-            main_keyword_id INTEGER,
-            related_keyword TEXT NOT NULL,
-            relation_strength REAL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (main_keyword_id) REFERENCES keywords(id),
-            UNIQUE(main_keyword_id, related_keyword)
-        )
-        ''')
-        
-        # 상품 정보 테이블
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY,
-            keyword_id INTEGER,
-            product_name TEXT NOT NULL,
-            price INTEGER,
-            brand TEXT,
-            mall_name TEXT,
-            product_url TEXT UNIQUE,
-            image_url TEXT,
-            rank INTEGER,
-            review_count INTEGER DEFAULT 0,
-            rating REAL DEFAULT 0,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (keyword_id) REFERENCES keywords(id)
-        )
-        ''')
-        
-        # 키워드 트렌드 데이터 테이블
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS keyword_trends (
-            id INTEGER PRIMARY KEY,
-            keyword_id INTEGER,
-            date DATE,
-            search_volume INTEGER,
-            pc_ratio REAL,
-            mobile_ratio REAL,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (keyword_id) REFERENCES keywords(id),
-            UNIQUE(keyword_id, date)
-        )
-        ''')
+        with self.connections.transaction() as cursor:
+            # 키워드 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keywords (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT NOT NULL,
+                category TEXT,
+                search_volume INTEGER,
+                competition REAL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(keyword, category)
+            )
+            ''')
+            
+            # 관련 키워드 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS related_keywords (
+                id INTEGER PRIMARY KEY,
+                main_keyword_id INTEGER,
+                related_keyword TEXT NOT NULL,
+                relation_strength REAL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (main_keyword_id) REFERENCES keywords(id),
+                UNIQUE(main_keyword_id, related_keyword)
+            )
+            ''')
+            
+            # 상품 정보 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY,
+                keyword_id INTEGER,
+                product_name TEXT NOT NULL,
+                price INTEGER,
+                brand TEXT,
+                mall_name TEXT,
+                product_url TEXT UNIQUE,
+                image_url TEXT,
+                rank INTEGER,
+                review_count INTEGER DEFAULT 0,
+                rating REAL DEFAULT 0,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (keyword_id) REFERENCES keywords(id)
+            )
+            ''')
+            
+            # 키워드 트렌드 데이터 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_trends (
+                id INTEGER PRIMARY KEY,
+                keyword_id INTEGER,
+                date DATE,
+                search_volume INTEGER,
+                pc_ratio REAL,
+                mobile_ratio REAL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (keyword_id) REFERENCES keywords(id),
+                UNIQUE(keyword_id, date)
+            )
+            ''')
+            
+            # 크롤링 로그 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_logs (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT,
+                source TEXT,  -- 'api' 또는 'crawl'
+                status TEXT,  -- 'success' 또는 'failure'
+                details TEXT,
+                products_count INTEGER,
+                related_keywords_count INTEGER,
+                execution_time REAL,  -- 실행 시간(초)
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # 광고 키워드 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ad_keywords (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT UNIQUE,
+                ad_rank INTEGER,
+                ad_cpc REAL,  -- 클릭당 비용
+                is_active BOOLEAN DEFAULT 1,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+            ''')
+            
+            # 키워드 순위 추적 테이블
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_rankings (
+                id INTEGER PRIMARY KEY,
+                keyword_id INTEGER,
+                product_id INTEGER,
+                rank INTEGER,
+                date DATE,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (keyword_id) REFERENCES keywords(id),
+                FOREIGN KEY (product_id) REFERENCES products(id),
+                UNIQUE(keyword_id, product_id, date)
+            )
+            ''')
         
-        # 크롤링 로그 테이블
+        self._migrate()
+        logger.info("데이터베이스 초기화 완료: %s", self.db_path)
+    
+    def _migrate(self) -> None:
+        """
+        미적용 스키마 마이그레이션 실행
+        
+        버전마다 한 트랜잭션에서 SQL과 PRAGMA user_version 갱신을 함께 커밋합니다.
+        쓰기 잠금을 잡은 뒤 버전을 읽으므로 여러 프로세스가 동시에 시작해도 한 번만 적용됩니다.
+        """
+        for version, description, statements in self.MIGRATIONS:
+            with self.connections.transaction() as cursor:
+                cursor.execute('PRAGMA user_version')
+                if cursor.fetchone()[0] >= version:
+                    continue
+                
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(f'PRAGMA user_version = {int(version)}')
+            
+            logger.info("스키마 마이그레이션 적용: v%d %s", version, description)
+    
+    def schema_version(self) -> int:
+        """현재 스키마 버전 (PRAGMA user_version) 반환"""
+        with self.connections.cursor() as cursor:
+            cursor.execute('PRAGMA user_version')
+            return cursor.fetchone()[0]
+    
+    def explain_query_plan(self, sql: str, params: Tuple = ()) -> List[str]:
+        """
+        조회 실행 계획 반환
+        
+        Args:
+            sql: 조회 SQL
+            params: 바인딩 파라미터
+        
+        Returns:
+            EXPLAIN QUERY PLAN의 detail 목록 (예: "SEARCH products USING INDEX ...")
+        """
+        with self.connections.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[3] for row in cursor.fetchall()]
+    
+    def find_full_scans(self) -> Dict[str, List[str]]:
+        """
+        HOT_QUERIES 중 전체 스캔 또는 임시 정렬이 필요한 조회 찾기
+        
+        ORDER BY ... LIMIT 조회의 "SCAN ... USING INDEX"는 인덱스 순서대로 읽다가
+        LIMIT에서 멈추므로 전체 스캔으로 보지 않습니다.
+        
+        Returns:
+            {조회 이름: 문제가 된 실행 계획 detail 목록} 딕셔너리 (문제가 없으면 빈 딕셔너리)
+        """
+        problems = {}
+        for name, (sql, params) in self.HOT_QUERIES.items():
+            details = [
+                detail for detail in self.explain_query_plan(sql, params)
+                if (detail.startswith('SCAN ') and 'USING' not in detail) or 'TEMP B-TREE' in detail
+            ]
+            if details:
+                logger.warning("전체 스캔 조회 발견: %s - %s", name, details)
+                problems[name] = details
+        return problems
+        
+    def _upsert_keyword(self, cursor: sqlite3.Cursor, keyword: str, category: str = None,
+                        search_volume: int = 0, competition: float = 0) -> Tuple[int, bool]:
+        """키워드 행 저장 후 (ID, 신규 여부) 반환 (호출 측 트랜잭션 안에서 실행)"""
+        # 이미 존재하는 키워드인지 확인
         cursor.execute('''
-        CREATE TABLE IF NOT EXISTS crawl_logs (
-            id INTEGER PRIMARY KEY,
-            keyword TEXT,
-            source TEXT,  -- 'api' 또는 'crawl'
-            status TEXT,  -- 'success' 또는 'failure'
-            details TEXT,
-            products_count INTEGER,
-            related_keywords_count INTEGER,
-            execution_time REAL,  -- 실행 시간(초)
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
+        SELECT id FROM keywords WHERE keyword = ? AND (category = ? OR category IS NULL)
+        ''', (keyword, category))
+        result = cursor.fetchone()
         
-        # 광고 키워드 테이블
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS ad_keywords (
-            id INTEGER PRIMARY KEY,
-            keyword TEXT UNIQUE,
-            ad_rank INTEGER,
-            ad_cpc REAL,  -- 클릭당 비용
-            is_active BOOLEAN DEFAULT 1,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
+        if result:
+            # 기존 키워드 업데이트
+            keyword_id = result[0]
+            cursor.execute('''
+            UPDATE keywords 
+            SET search_volume = ?, competition = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            ''', (search_volume, competition, keyword_id))
+            return keyword_id, False
         
-        # 키워드 순위 추적 테이블
+        # 새 키워드 삽입
         cursor.execute('''
-        CREATE TABLE IF NOT EXISTS keyword_rankings (
-            id INTEGER PRIMARY KEY,
-            keyword_id INTEGER,
-            product_id INTEGER,
-            rank INTEGER,
-            date DATE,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (keyword_id) REFERENCES keywords(id),
-            FOREIGN KEY (product_id) REFERENCES products(id),
-            UNIQUE(keyword_id, product_id, date)
-        )
-        ''')
-        
-        conn.commit()
-        conn.close()
-        logger.info("데이터베이스 초기화 완료: %s", self.db_path)
+        INSERT INTO keywords (keyword, category, search_volume, competition)
+        VALUES (?, ?, ?, ?)
+        ''', (keyword, category, search_volume, competition))
+        return cursor.lastrowid, True
     
     def save_keyword(self, keyword: str, category: str = None, search_volume: int = 0, 
                    competition: float = 0) -> int:
         """키워드 정보 저장 및 ID 반환"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            # 이미 존재하는 키워드인지 확인
-            cursor.execute('''
-            SELECT id FROM keywords WHERE keyword = ? AND (category = ? OR category IS NULL)
-            ''', (keyword, category))
-            result = cursor.fetchone()
+            with self.connections.transaction() as cursor:
+                keyword_id, is_new = self._upsert_keyword(cursor, keyword, category, search_volume, competition)
             
-            if result:
-                # 기존 키워드 업데이트
-                keyword_id = result[0]
-                cursor.execute('''
-                UPDATE keywords 
-                SET search_volume = ?, competition = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-                ''', (search_volume, competition, keyword_id))
-            else:
-                # 새 키워드 삽입
-                cursor.execute('''
-                INSERT INTO keywords (keyword, category, search_volume, competition)
-                VALUES (?, ?, ?, ?)
-                ''', (keyword, category, search_volume, competition))
-                keyword_id = cursor.lastrowid
-            
-            conn.commit()
+            # 커밋 후 호출 (리스너가 다른 연결로 키워드를 읽을 수 있도록)
+            if is_new:
+                self._notify_keyword_listeners(keyword_id, keyword)
             return keyword_id
         
         except Exception as e:
-            conn.rollback()
             logger.error("키워드 저장 오류: %s - %s", keyword, str(e))
             return None
+    
+    @staticmethod
+    def _related_keyword_rows(main_keyword_id: int, related_keywords: List[Dict]) -> List[Tuple]:
+        """관련 키워드 목록을 INSERT 파라미터 행으로 변환"""
+        return [
+            (main_keyword_id, keyword_data.get('keyword', ''), keyword_data.get('strength', 1.0))
+            for keyword_data in related_keywords
+            if keyword_data.get('keyword', '')
+        ]
+    
+    @staticmethod
+    def _product_rows(keyword_id: int, products_data: List[Dict]) -> List[Tuple]:
+        """상품 목록을 UPSERT 파라미터 행으로 변환 (순위는 수집 순서 기준)"""
+        rows = []
+        for rank, product in enumerate(products_data, 1):
+            product_name = product.get('title', '')
+            product_url = product.get('url', '')
+            
+            if not product_name or not product_url:
+                continue
+            
+            rows.append((
+                keyword_id, product_name, product.get('price', 0), product.get('brand', ''),
+                product.get('mall', ''), product_url, product.get('image_url', ''), rank,
+                product.get('reviews', 0), product.get('rating', 0.0)
+            ))
+        return rows
+    
+    @staticmethod
+    def _trend_rows(keyword_id: int, trend_data: List[Dict]) -> List[Tuple]:
+        """트렌드 데이터를 INSERT 파라미터 행으로 변환"""
+        return [
+            (keyword_id, data_point.get('date', ''), data_point.get('volume', 0),
+             data_point.get('pc_ratio', 0.0), data_point.get('mobile_ratio', 0.0))
+            for data_point in trend_data
+            if data_point.get('date', '')
+        ]
+    
+    def _write_related_keywords(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> None:
+        """관련 키워드 행 일괄 저장 (호출 측 트랜잭션 안에서 실행)"""
+        if rows:
+            cursor.executemany('''
+            INSERT OR REPLACE INTO related_keywords 
+            (main_keyword_id, related_keyword, relation_strength, created_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ''', rows)
+    
+    def _write_products(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> None:
+        """
+        상품 행 일괄 UPSERT 및 순위 추적 행 저장 (호출 측 트랜잭션 안에서 실행)
+        
+        UPSERT가 UPDATE로 끝나면 lastrowid가 갱신되지 않으므로, 상품 ID는
+        저장 후 product_url로 다시 조회해 순위 행에 연결합니다.
+        """
+        if not rows:
+            return
         
-        finally:
-            conn.close()
+        cursor.executemany('''
+        INSERT INTO products 
+        (keyword_id, product_name, price, brand, mall_name, product_url, image_url, rank, review_count, rating, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(product_url) DO UPDATE SET
+        product_name = excluded.product_name,
+        price = excluded.price,
+        brand = excluded.brand,
+        mall_name = excluded.mall_name,
+        image_url = excluded.image_url,
+        rank = excluded.rank,
+        review_count = excluded.review_count,
+        rating = excluded.rating,
+        updated_at = CURRENT_TIMESTAMP
+        ''', rows)
+        
+        # product_url -> 상품 ID (SQLite 바인딩 변수 제한을 넘지 않도록 나눠서 조회)
+        urls = list(dict.fromkeys(row[5] for row in rows))
+        product_ids = {}
+        for start in range(0, len(urls), self.MAX_BIND_PARAMS):
+            chunk = urls[start:start + self.MAX_BIND_PARAMS]
+            cursor.execute(
+                f"SELECT product_url, id FROM products WHERE product_url IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            product_ids.update(cursor.fetchall())
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        cursor.executemany('''
+        INSERT OR REPLACE INTO keyword_rankings
+        (keyword_id, product_id, rank, date)
+        VALUES (?, ?, ?, ?)
+        ''', [(row[0], product_ids[row[5]], row[7], today) for row in rows])
+    
+    def _write_keyword_trend(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> None:
+        """트렌드 행 일괄 저장 (호출 측 트랜잭션 안에서 실행)"""
+        if rows:
+            cursor.executemany('''
+            INSERT OR REPLACE INTO keyword_trends
+            (keyword_id, date, search_volume, pc_ratio, mobile_ratio)
+            VALUES (?, ?, ?, ?, ?)
+            ''', rows)
     
     def save_related_keywords(self, main_keyword_id: int, related_keywords: List[Dict]) -> bool:
         """관련 키워드 저장"""
         if not related_keywords:
             return True
             
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            for keyword_data in related_keywords:
-                related_keyword = keyword_data.get('keyword', '')
-                relation_strength = keyword_data.get('strength', 1.0)
-                
-                if not related_keyword:
-                    continue
-                
-                # UPSERT 구문 (INSERT OR REPLACE)
-                cursor.execute('''
-                INSERT OR REPLACE INTO related_keywords 
-                (main_keyword_id, related_keyword, relation_strength, created_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ''', (main_keyword_id, related_keyword, relation_strength))
+            with self.connections.transaction() as cursor:
+                self._write_related_keywords(cursor, self._related_keyword_rows(main_keyword_id, related_keywords))
             
-            conn.commit()
             return True
         
         except Exception as e:
-            conn.rollback()
             logger.error("관련 키워드 저장 오류: %s - %s", main_keyword_id, str(e))
             return False
-        
-        finally:
-            conn.close()
     
     def save_products(self, keyword_id: int, products_data: List[Dict]) -> bool:
         """상품 정보 저장"""
         if not products_data:
             return True
             
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            for rank, product in enumerate(products_data, 1):
-                # 기본 필드
-                product_name = product.get('title', '')
-                price = product.get('price', 0)
-                brand = product.get('brand', '')
-                mall_name = product.get('mall', '')
-                product_url = product.get('url', '')
-                image_url = product.get('image_url', '')
-                review_count = product.get('reviews', 0)
-                rating = product.get('rating', 0.0)
-                
-                if not product_name or not product_url:
-                    continue
-                
-                # UPSERT 구문
-                cursor.execute('''
-                INSERT INTO products 
-                (keyword_id, product_name, price, brand, mall_name, product_url, image_url, rank, review_count, rating, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(product_url) DO UPDATE SET
-                product_name = excluded.product_name,
-                price = excluded.price,
-                brand = excluded.brand,
-                mall_name = excluded.mall_name,
-                image_url = excluded.image_url,
-                rank = excluded.rank,
-                review_count = excluded.review_count,
-                rating = excluded.rating,
-                updated_at = CURRENT_TIMESTAMP
-                ''', (keyword_id, product_name, price, brand, mall_name, product_url, image_url, rank, review_count, rating))
-                
-                # 순위 추적 테이블에도 저장
-                product_id = cursor.lastrowid
-                today = datetime.now().strftime('%Y-%m-%d')
-                
-                cursor.execute('''
-                INSERT OR REPLACE INTO keyword_rankings
-                (keyword_id, product_id, rank, date)
-                VALUES (?, ?, ?, ?)
-                ''', (keyword_id, product_id, rank, today))
+            with self.connections.transaction() as cursor:
+                self._write_products(cursor, self._product_rows(keyword_id, products_data))
             
-            conn.commit()
             return True
         
         except Exception as e:
-            conn.rollback()
             logger.error("상품 정보 저장 오류: %s - %s", keyword_id, str(e))
             return False
-        
-        finally:
-            conn.close()
     
     def save_keyword_trend(self, keyword_id: int, trend_data: List[Dict]) -> bool:
         """키워드 트렌드 데이터 저장"""
         if not trend_data:
             return True
             
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            for data_point in trend_data:
-                date = data_point.get('date', '')
-                search_volume = data_point.get('volume', 0)
-                pc_ratio = data_point.get('pc_ratio', 0.0)
-                mobile_ratio = data_point.get('mobile_ratio', 0.0)
-                
-                if not date:
-                    continue
-                
-                cursor.execute('''
-                INSERT OR REPLACE INTO keyword_trends
-                (keyword_id, date, search_volume, pc_ratio, mobile_ratio)
-                VALUES (?, ?, ?, ?, ?)
-                ''', (keyword_id, date, search_volume, pc_ratio, mobile_ratio))
+            with self.connections.transaction() as cursor:
+                self._write_keyword_trend(cursor, self._trend_rows(keyword_id, trend_data))
             
-            conn.commit()
             return True
         
         except Exception as e:
-            conn.rollback()
             logger.error("트렌드 데이터 저장 오류: %s - %s", keyword_id, str(e))
             return False
+    
+    def save_keyword_details_batch(self, batch: List[Dict]) -> bool:
+        """
+        여러 키워드의 관련 키워드/상품/트렌드를 한 트랜잭션에서 일괄 저장
+        
+        테이블마다 executemany 한 번으로 저장하므로 여러 페이지를 크롤링한
+        수백 개 상품도 커밋 한 번으로 기록됩니다. 하나라도 실패하면 전체를 롤백합니다.
+        
+        Args:
+            batch: {"keyword_id", "related_keywords", "products", "trends"} 딕셔너리 목록
+                   (keyword_id 외 항목은 생략 가능)
+        
+        Returns:
+            저장 성공 여부
+        """
+        related_rows, product_rows, trend_rows = [], [], []
+        for item in batch:
+            keyword_id = item['keyword_id']
+            related_rows.extend(self._related_keyword_rows(keyword_id, item.get('related_keywords') or []))
+            product_rows.extend(self._product_rows(keyword_id, item.get('products') or []))
+            trend_rows.extend(self._trend_rows(keyword_id, item.get('trends') or []))
+        
+        if not (related_rows or product_rows or trend_rows):
+            return True
         
-        finally:
-            conn.close()
+        try:
+            with self.connections.transaction() as cursor:
+                self._write_related_keywords(cursor, related_rows)
+                self._write_products(cursor, product_rows)
+                self._write_keyword_trend(cursor, trend_rows)
+            
+            return True
+        
+        except Exception as e:
+            logger.error("키워드 상세 데이터 일괄 저장 오류: %s", str(e))
+            return False
+    
+    def save_analysis_batch(self, keywords_data: Dict[str, Dict], category: str = None) -> Dict[str, int]:
+        """
+        깊이 N 분석 결과 전체(메인 키워드 + 관련 키워드)를 한 트랜잭션에서 저장
+        
+        키워드 행을 먼저 저장해 ID를 얻은 뒤 관련 키워드/상품/트렌드/광고 키워드를
+        테이블별 executemany로 기록합니다. 중간에 실패하면 전체를 롤백하고,
+        새 키워드 리스너는 커밋이 끝난 뒤에만 호출합니다.
+        
+        Args:
+            keywords_data: {키워드: 분석 데이터} 딕셔너리 (KeywordAnalyzer.analyze_keyword 결과의 keywords_data)
+            category: 카테고리
+        
+        Returns:
+            {키워드: 키워드 ID} 딕셔너리 (저장 실패 시 빈 딕셔너리)
+        """
+        if not keywords_data:
+            return {}
+        
+        keyword_ids = {}
+        new_keywords = []
+        related_rows, product_rows, trend_rows, ad_rows = [], [], [], []
+        
+        try:
+            with self.connections.transaction() as cursor:
+                for keyword, data in keywords_data.items():
+                    keyword_id, is_new = self._upsert_keyword(
+                        cursor, keyword, category,
+                        data.get("avg_search_volume", 0), data.get("competition", 0)
+                    )
+                    keyword_ids[keyword] = keyword_id
+                    if is_new:
+                        new_keywords.append((keyword_id, keyword))
+                    
+                    related_rows.extend(self._related_keyword_rows(keyword_id, data.get("related_keywords") or []))
+                    product_rows.extend(self._product_rows(keyword_id, data.get("products") or []))
+                    trend_rows.extend(self._trend_rows(
+                        keyword_id, [item for item in data.get("search_volume") or [] if isinstance(item, dict)]
+                    ))
+                    ad_rows.extend(
+                        (ad["title"], 0, 0.0) for ad in data.get("ad_keywords") or []
+                        if isinstance(ad, dict) and "title" in ad
+                    )
+                
+                self._write_related_keywords(cursor, related_rows)
+                self._write_products(cursor, product_rows)
+                self._write_keyword_trend(cursor, trend_rows)
+                self._write_ad_keywords(cursor, ad_rows)
+        
+        except Exception as e:
+            logger.error("분석 결과 일괄 저장 오류: %s", str(e))
+            return {}
+        
+        for keyword_id, keyword in new_keywords:
+            self._notify_keyword_listeners(keyword_id, keyword)
+        return keyword_ids
     
     def log_crawl_activity(self, keyword: str, source: str, status: str, details: str = "",
                          products_count: int = 0, related_keywords_count: int = 0,
                          execution_time: float = 0.0) -> None:
         """크롤링 활동 로그 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-            INSERT INTO crawl_logs
-            (keyword, source, status, details, products_count, related_keywords_count, execution_time)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (keyword, source, status, details, products_count, related_keywords_count, execution_time))
+            with self.connections.transaction() as cursor:
+                cursor.execute('''
+                INSERT INTO crawl_logs
+                (keyword, source, status, details, products_count, related_keywords_count, execution_time)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (keyword, source, status, details, products_count, related_keywords_count, execution_time))
             
-            conn.commit()
-        
         except Exception as e:
-            conn.rollback()
             logger.error("로그 저장 오류: %s - %s", keyword, str(e))
-        
-        finally:
-            conn.close()
     
-    def get_keyword_data(self, keyword: str, category: str = None) -> Dict:
-        """키워드 관련 모든 데이터 조회"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        result = {
+    # 키워드 상세 조회 (관련 키워드/상품/트렌드를 JSON1 집계로 한 번에 조회)
+    # 각 하위 조회의 ORDER BY 순서가 json_group_array 배열 순서가 됨
+    # JSON1은 REAL을 유효숫자 15자리로 직렬화하므로, REAL 값은 왕복 가능한 17자리 문자열로
+    # 받아 _decode_real_fields에서 float로 되돌림 (정수/NULL은 그대로)
+    KEYWORD_DATA_QUERY = '''
+    SELECT
+        k.keyword, k.category, k.search_volume, k.competition, k.created_at, k.updated_at,
+        (SELECT json_group_array(json_object(
+                    'keyword', related_keyword,
+                    'strength', CASE typeof(relation_strength) WHEN 'real'
+                                THEN printf('%!.17g', relation_strength) ELSE relation_strength END))
+         FROM (SELECT related_keyword, relation_strength
+               FROM related_keywords
+               WHERE main_keyword_id = k.id
+               ORDER BY relation_strength DESC)) AS related_keywords,
+        (SELECT json_group_array(json_object(
+                    'title', product_name, 'price', price, 'brand', brand, 'mall', mall_name,
+                    'url', product_url, 'image_url', image_url, 'rank', rank,
+                    'reviews', review_count,
+                    'rating', CASE typeof(rating) WHEN 'real' THEN printf('%!.17g', rating) ELSE rating END))
+         FROM (SELECT product_name, price, brand, mall_name, product_url, image_url, rank, review_count, rating
+               FROM products
+               WHERE keyword_id = k.id
+               ORDER BY rank)) AS products,
+        (SELECT json_group_array(json_object(
+                    'date', date, 'volume', search_volume,
+                    'pc_ratio', CASE typeof(pc_ratio) WHEN 'real' THEN printf('%!.17g', pc_ratio) ELSE pc_ratio END,
+                    'mobile_ratio', CASE typeof(mobile_ratio) WHEN 'real'
+                                    THEN printf('%!.17g', mobile_ratio) ELSE mobile_ratio END))
+         FROM (SELECT date, search_volume, pc_ratio, mobile_ratio
+               FROM keyword_trends
+               WHERE keyword_id = k.id
+               ORDER BY date)) AS trends
+    FROM keywords k
+    WHERE k.keyword IN ({placeholders}) AND (k.category = ? OR k.category IS NULL)
+    ORDER BY k.category IS NULL
+    '''
+    
+    # KEYWORD_DATA_QUERY의 하위 목록별 REAL 필드
+    KEYWORD_DATA_REAL_FIELDS = {
+        'related_keywords': ('strength',),
+        'products': ('rating',),
+        'trends': ('pc_ratio', 'mobile_ratio'),
+    }
+    
+    # 키워드 지표만 조회 (추천 등 하위 목록이 필요 없는 경로)
+    KEYWORD_METRICS_QUERY = '''
+    SELECT keyword, search_volume, competition
+    FROM keywords
+    WHERE keyword IN ({placeholders}) AND (category = ? OR category IS NULL)
+    ORDER BY category IS NULL
+    '''
+    
+    @staticmethod
+    def _decode_real_fields(items: List[Dict], fields: Tuple[str, ...]) -> List[Dict]:
+        """17자리 문자열로 받은 REAL 필드를 float로 복원"""
+        for item in items:
+            for field in fields:
+                if isinstance(item.get(field), str):
+                    item[field] = float(item[field])
+        return items
+    
+    @staticmethod
+    def _empty_keyword_data(keyword: str, category: str = None) -> Dict:
+        """조회 결과가 없을 때 반환하는 기본 키워드 데이터"""
+        return {
             'keyword': keyword,
             'category': category,
             'search_volume': 0,
@@ -407,178 +971,183 @@ class DatabaseManager:
             'trends': [],
             'found': False
         }
+    
+    def get_keyword_data(self, keyword: str, category: str = None) -> Dict:
+        """키워드 관련 모든 데이터 조회"""
+        return self.get_keywords_data([keyword], category).get(keyword) or self._empty_keyword_data(keyword, category)
+    
+    def get_keywords_data(self, keywords: List[str], category: str = None) -> Dict[str, Dict]:
+        """
+        여러 키워드의 관련 키워드/상품/트렌드 데이터를 일괄 조회
+        
+        키워드 묶음마다 조회 한 번으로 하위 목록까지 JSON 배열로 받아오므로
+        키워드 수와 관계없이 테이블별 추가 왕복이 없습니다.
+        
+        Args:
+            keywords: 조회할 키워드 목록
+            category: 카테고리 (해당 카테고리 또는 카테고리 없는 키워드와 일치)
+        
+        Returns:
+            {키워드: 키워드 데이터} 딕셔너리 (없는 키워드는 found=False 기본값)
+        """
+        unique_keywords = list(dict.fromkeys(keywords))
+        results = {keyword: self._empty_keyword_data(keyword, category) for keyword in unique_keywords}
+        if not unique_keywords:
+            return results
         
         try:
-            # 키워드 기본 정보 조회
-            cursor.execute('''
-            SELECT id, search_volume, competition, created_at, updated_at
-            FROM keywords
-            WHERE keyword = ? AND (category = ? OR category IS NULL)
-            ''', (keyword, category))
-            
-            keyword_data = cursor.fetchone()
-            if not keyword_data:
-                return result
-                
-            keyword_id = keyword_data['id']
-            result['search_volume'] = keyword_data['search_volume']
-            result['competition'] = keyword_data['competition']
-            result['created_at'] = keyword_data['created_at']
-            result['updated_at'] = keyword_data['updated_at']
-            result['found'] = True
-            
-            # 관련 키워드 조회
-            cursor.execute('''
-            SELECT related_keyword, relation_strength
-            FROM related_keywords
-            WHERE main_keyword_id = ?
-            ORDER BY relation_strength DESC
-            ''', (keyword_id,))
-            
-            related_keywords = cursor.fetchall()
-            result['related_keywords'] = [
-                {'keyword': row['related_keyword'], 'strength': row['relation_strength']}
-                for row in related_keywords
-            ]
-            
-            # 상품 정보 조회
-            cursor.execute('''
-            SELECT product_name, price, brand, mall_name, product_url, image_url, rank, review_count, rating
-            FROM products
-            WHERE keyword_id = ?
-            ORDER BY rank
-            ''', (keyword_id,))
-            
-            products = cursor.fetchall()
-            result['products'] = [
-                {
-                    'title': row['product_name'],
-                    'price': row['price'],
-                    'brand': row['brand'],
-                    'mall': row['mall_name'],
-                    'url': row['product_url'],
-                    'image_url': row['image_url'],
-                    'rank': row['rank'],
-                    'reviews': row['review_count'],
-                    'rating': row['rating']
-                }
-                for row in products
-            ]
-            
-            # 트렌드 데이터 조회
-            cursor.execute('''
-            SELECT date, search_volume, pc_ratio, mobile_ratio
-            FROM keyword_trends
-            WHERE keyword_id = ?
-            ORDER BY date
-            ''', (keyword_id,))
-            
-            trends = cursor.fetchall()
-            result['trends'] = [
-                {
-                    'date': row['date'],
-                    'volume': row['search_volume'],
-                    'pc_ratio': row['pc_ratio'],
-                    'mobile_ratio': row['mobile_ratio']
-                }
-                for row in trends
-            ]
+            with self.connections.cursor(sqlite3.Row) as cursor:
+                chunk_size = self.MAX_BIND_PARAMS - 1
+                for start in range(0, len(unique_keywords), chunk_size):
+                    chunk = unique_keywords[start:start + chunk_size]
+                    cursor.execute(
+                        self.KEYWORD_DATA_QUERY.format(placeholders=','.join('?' * len(chunk))),
+                        (*chunk, category)
+                    )
+                    
+                    for row in cursor.fetchall():
+                        result = results[row['keyword']]
+                        # 같은 키워드가 카테고리 일치/미지정 두 행이면 카테고리 일치 행 우선
+                        if result['found']:
+                            continue
+                        
+                        result.update({
+                            'search_volume': row['search_volume'],
+                            'competition': row['competition'],
+                            'found': True,
+                            'created_at': row['created_at'],
+                            'updated_at': row['updated_at']
+                        })
+                        for column, fields in self.KEYWORD_DATA_REAL_FIELDS.items():
+                            result[column] = self._decode_real_fields(json.loads(row[column]), fields)
             
-            return result
+            return results
         
         except Exception as e:
-            logger.error("키워드 데이터 조회 오류: %s - %s", keyword, str(e))
-            return result
+            logger.error("키워드 데이터 조회 오류: %s - %s", keywords[:5], str(e))
+            return results
+    
+    def get_keywords_metrics(self, keywords: List[str], category: str = None) -> Dict[str, Dict]:
+        """
+        여러 키워드의 검색량/경쟁도만 일괄 조회
         
-        finally:
-            conn.close()
+        get_keywords_data와 같은 카테고리 규칙을 따르지만 관련 키워드/상품/트렌드는
+        읽지 않습니다.
+        
+        Args:
+            keywords: 조회할 키워드 목록
+            category: 카테고리 (해당 카테고리 또는 카테고리 없는 키워드와 일치)
+        
+        Returns:
+            {키워드: {"keyword", "search_volume", "competition", "found"}} 딕셔너리
+        """
+        unique_keywords = list(dict.fromkeys(keywords))
+        results = {
+            keyword: {'keyword': keyword, 'search_volume': 0, 'competition': 0, 'found': False}
+            for keyword in unique_keywords
+        }
+        if not unique_keywords:
+            return results
+        
+        try:
+            with self.connections.cursor(sqlite3.Row) as cursor:
+                chunk_size = self.MAX_BIND_PARAMS - 1
+                for start in range(0, len(unique_keywords), chunk_size):
+                    chunk = unique_keywords[start:start + chunk_size]
+                    cursor.execute(
+                        self.KEYWORD_METRICS_QUERY.format(placeholders=','.join('?' * len(chunk))),
+                        (*chunk, category)
+                    )
+                    
+                    for row in cursor.fetchall():
+                        result = results[row['keyword']]
+                        # 카테고리 일치 행 우선
+                        if result['found']:
+                            continue
+                        result.update({
+                            'search_volume': row['search_volume'],
+                            'competition': row['competition'],
+                            'found': True
+                        })
+            
+            return results
+        
+        except Exception as e:
+            logger.error("키워드 지표 조회 오류: %s - %s", keywords[:5], str(e))
+            return results
     
     def get_all_keywords(self, category: str = None, limit: int = 100, offset: int = 0) -> List[Dict]:
         """모든 키워드 목록 조회"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         keywords = []
         
         try:
-            if category:
-                cursor.execute('''
-                SELECT id, keyword, category, search_volume, competition, created_at, updated_at
-                FROM keywords
-                WHERE category = ?
-                ORDER BY updated_at DESC
-                LIMIT ? OFFSET ?
-                ''', (category, limit, offset))
-            else:
-                cursor.execute('''
-                SELECT id, keyword, category, search_volume, competition, created_at, updated_at
-                FROM keywords
-                ORDER BY updated_at DESC
-                LIMIT ? OFFSET ?
-                ''', (limit, offset))
-            
-            rows = cursor.fetchall()
-            for row in rows:
-                keywords.append({
-                    'id': row['id'],
-                    'keyword': row['keyword'],
-                    'category': row['category'],
-                    'search_volume': row['search_volume'],
-                    'competition': row['competition'],
-                    'created_at': row['created_at'],
-                    'updated_at': row['updated_at']
-                })
-            
-            return keywords
+            with self.connections.cursor(sqlite3.Row) as cursor:
+                if category:
+                    cursor.execute('''
+                    SELECT id, keyword, category, search_volume, competition, created_at, updated_at
+                    FROM keywords
+                    WHERE category = ?
+                    ORDER BY updated_at DESC
+                    LIMIT ? OFFSET ?
+                    ''', (category, limit, offset))
+                else:
+                    cursor.execute('''
+                    SELECT id, keyword, category, search_volume, competition, created_at, updated_at
+                    FROM keywords
+                    ORDER BY updated_at DESC
+                    LIMIT ? OFFSET ?
+                    ''', (limit, offset))
+
+                rows = cursor.fetchall()
+                for row in rows:
+                    keywords.append({
+                        'id': row['id'],
+                        'keyword': row['keyword'],
+                        'category': row['category'],
+                        'search_volume': row['search_volume'],
+                        'competition': row['competition'],
+                        'created_at': row['created_at'],
+                        'updated_at': row['updated_at']
+                    })
+
+                return keywords
         
         except Exception as e:
             logger.error("키워드 목록 조회 오류: %s", str(e))
             return []
-        
-        finally:
-            conn.close()
     
     def get_top_related_keywords(self, main_keyword: str, limit: int = 10) -> List[str]:
         """특정 키워드의 상위 관련 키워드 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-            SELECT k.id FROM keywords k
-            WHERE k.keyword = ?
-            ''', (main_keyword,))
-            
-            result = cursor.fetchone()
-            if not result:
-                return []
+            with self.connections.cursor() as cursor:
+                cursor.execute('''
+                SELECT k.id FROM keywords k
+                WHERE k.keyword = ?
+                ''', (main_keyword,))
+
+                result = cursor.fetchone()
+                if not result:
+                    return []
                 
-            main_keyword_id = result[0]
-            
-            cursor.execute('''
-            SELECT related_keyword
-            FROM related_keywords
-            WHERE main_keyword_id = ?
-            ORDER BY relation_strength DESC
-            LIMIT ?
-            ''', (main_keyword_id, limit))
-            
-            rows = cursor.fetchall()
-            return [row[0] for row in rows]
+                main_keyword_id = result[0]
+
+                cursor.execute('''
+                SELECT related_keyword
+                FROM related_keywords
+                WHERE main_keyword_id = ?
+                ORDER BY relation_strength DESC
+                LIMIT ?
+                ''', (main_keyword_id, limit))
+
+                rows = cursor.fetchall()
+                return [row[0] for row in rows]
         
         except Exception as e:
             logger.error("관련 키워드 조회 오류: %s - %s", main_keyword, str(e))
             return []
-        
-        finally:
-            conn.close()
     
     def get_keyword_stats(self, days: int = 7) -> Dict:
         """키워드 데이터 통계 정보 조회"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         stats = {
             'total_keywords': 0,
             'total_products': 0,
@@ -589,209 +1158,187 @@ class DatabaseManager:
         }
         
         try:
-            # 총 키워드 수
-            cursor.execute('SELECT COUNT(*) FROM keywords')
-            stats['total_keywords'] = cursor.fetchone()[0]
-            
-            # 총 상품 수
-            cursor.execute('SELECT COUNT(*) FROM products')
-            stats['total_products'] = cursor.fetchone()[0]
-            
-            # 총 관련 키워드 수
-            cursor.execute('SELECT COUNT(*) FROM related_keywords')
-            stats['total_related_keywords'] = cursor.fetchone()[0]
-            
-            # 크롤링 성공률
-            cursor.execute('''
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as success
-            FROM crawl_logs
-            WHERE created_at >= datetime('now', '-7 day')
-            ''')
-            
-            result = cursor.fetchone()
-            total_crawls = result[0] if result[0] else 0
-            success_crawls = result[1] if result[1] else 0
-            
-            if total_crawls > 0:
-                stats['crawl_success_rate'] = round((success_crawls / total_crawls) * 100, 2)
-            
-            # 인기 카테고리
-            cursor.execute('''
-            SELECT category, COUNT(*) as count
-            FROM keywords
-            WHERE category IS NOT NULL
-            GROUP BY category
-            ORDER BY count DESC
-            LIMIT 5
-            ''')
-            
-            categories = cursor.fetchall()
-            stats['top_categories'] = [
-                {'category': row[0], 'count': row[1]}
-                for row in categories
-            ]
-            
-            # 최근 활동
-            cursor.execute('''
-            SELECT keyword, source, status, created_at
-            FROM crawl_logs
-            ORDER BY created_at DESC
-            LIMIT 10
-            ''')
-            
-            activities = cursor.fetchall()
-            stats['recent_activity'] = [
-                {
-                    'keyword': row[0],
-                    'source': row[1],
-                    'status': row[2],
-                    'timestamp': row[3]
-                }
-                for row in activities
-            ]
-            
-            return stats
+            with self.connections.cursor() as cursor:
+                # 총 키워드 수
+                cursor.execute('SELECT COUNT(*) FROM keywords')
+                stats['total_keywords'] = cursor.fetchone()[0]
+
+                # 총 상품 수
+                cursor.execute('SELECT COUNT(*) FROM products')
+                stats['total_products'] = cursor.fetchone()[0]
+
+                # 총 관련 키워드 수
+                cursor.execute('SELECT COUNT(*) FROM related_keywords')
+                stats['total_related_keywords'] = cursor.fetchone()[0]
+
+                # 크롤링 성공률
+                cursor.execute('''
+                SELECT 
+                    COUNT(*) as total,
+                    SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) as success
+                FROM crawl_logs
+                WHERE created_at >= datetime('now', '-7 day')
+                ''')
+
+                result = cursor.fetchone()
+                total_crawls = result[0] if result[0] else 0
+                success_crawls = result[1] if result[1] else 0
+
+                if total_crawls > 0:
+                    stats['crawl_success_rate'] = round((success_crawls / total_crawls) * 100, 2)
+
+                # 인기 카테고리
+                cursor.execute('''
+                SELECT category, COUNT(*) as count
+                FROM keywords
+                WHERE category IS NOT NULL
+                GROUP BY category
+                ORDER BY count DESC
+                LIMIT 5
+                ''')
+
+                categories = cursor.fetchall()
+                stats['top_categories'] = [
+                    {'category': row[0], 'count': row[1]}
+                    for row in categories
+                ]
+
+                # 최근 활동
+                cursor.execute('''
+                SELECT keyword, source, status, created_at
+                FROM crawl_logs
+                ORDER BY created_at DESC
+                LIMIT 10
+                ''')
+
+                activities = cursor.fetchall()
+                stats['recent_activity'] = [
+                    {
+                        'keyword': row[0],
+                        'source': row[1],
+                        'status': row[2],
+                        'timestamp': row[3]
+                    }
+                    for row in activities
+                ]
+
+                return stats
         
         except Exception as e:
             logger.error("통계 정보 조회 오류: %s", str(e))
             return stats
-        
-        finally:
-            conn.close()
     
     def is_ad_keyword(self, keyword: str) -> bool:
         """광고 키워드인지 확인"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute('''
-            SELECT is_active FROM ad_keywords
-            WHERE keyword = ?
-            ''', (keyword,))
-            
-            result = cursor.fetchone()
-            return bool(result and result[0])
+            with self.connections.cursor() as cursor:
+                cursor.execute('''
+                SELECT is_active FROM ad_keywords
+                WHERE keyword = ?
+                ''', (keyword,))
+
+                result = cursor.fetchone()
+                return bool(result and result[0])
         
         except Exception as e:
             logger.error("광고 키워드 확인 오류: %s - %s", keyword, str(e))
             return False
-        
-        finally:
-            conn.close()
     
-    def save_ad_keyword(self, keyword: str, ad_rank: int = 0, ad_cpc: float = 0.0) -> bool:
-        """광고 키워드 저장"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute('''
+    def _write_ad_keywords(self, cursor: sqlite3.Cursor, rows: List[Tuple]) -> None:
+        """(키워드, 광고 순위, CPC) 행 일괄 저장 (호출 측 트랜잭션 안에서 실행)"""
+        if rows:
+            cursor.executemany('''
             INSERT OR REPLACE INTO ad_keywords
             (keyword, ad_rank, ad_cpc, is_active, updated_at)
             VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
-            ''', (keyword, ad_rank, ad_cpc))
+            ''', rows)
+    
+    def save_ad_keyword(self, keyword: str, ad_rank: int = 0, ad_cpc: float = 0.0) -> bool:
+        """광고 키워드 저장"""
+        try:
+            with self.connections.transaction() as cursor:
+                self._write_ad_keywords(cursor, [(keyword, ad_rank, ad_cpc)])
             
-            conn.commit()
             return True
         
         except Exception as e:
-            conn.rollback()
             logger.error("광고 키워드 저장 오류: %s - %s", keyword, str(e))
             return False
-        
-        finally:
-            conn.close()
     
     def get_ranking_history(self, keyword: str, product_url: str = None, days: int = 30) -> List[Dict]:
         """특정 키워드의 상품 순위 변동 이력 조회"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
         history = []
         
         try:
-            # 키워드 ID 조회
-            cursor.execute('SELECT id FROM keywords WHERE keyword = ?', (keyword,))
-            keyword_result = cursor.fetchone()
-            
-            if not keyword_result:
-                return history
+            with self.connections.cursor(sqlite3.Row) as cursor:
+                # 키워드 ID 조회
+                cursor.execute('SELECT id FROM keywords WHERE keyword = ?', (keyword,))
+                keyword_result = cursor.fetchone()
+
+                if not keyword_result:
+                    return history
                 
-            keyword_id = keyword_result['id']
-            
-            if product_url:
-                # 특정 상품의 순위 이력
-                cursor.execute('''
-                SELECT kr.date, kr.rank, p.product_name, p.brand
-                FROM keyword_rankings kr
-                JOIN products p ON kr.product_id = p.id
-                WHERE kr.keyword_id = ? AND p.product_url = ?
-                AND kr.date >= date('now', '-' || ? || ' day')
-                ORDER BY kr.date
-                ''', (keyword_id, product_url, days))
-            else:
-                # 전체 상품 순위 이력 (최근 30일)
-                cursor.execute('''
-                SELECT kr.date, kr.rank, p.product_name, p.brand, p.product_url
-                FROM keyword_rankings kr
-                JOIN products p ON kr.product_id = p.id
-                WHERE kr.keyword_id = ?
-                AND kr.date >= date('now', '-' || ? || ' day')
-                ORDER BY kr.date, kr.rank
-                ''', (keyword_id, days))
-            
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                history.append({
-                    'date': row['date'],
-                    'rank': row['rank'],
-                    'product_name': row['product_name'],
-                    'brand': row['brand'],
-                    'product_url': row.get('product_url', '')
-                })
-            
-            return history
+                keyword_id = keyword_result['id']
+
+                if product_url:
+                    # 특정 상품의 순위 이력
+                    cursor.execute('''
+                    SELECT kr.date, kr.rank, p.product_name, p.brand
+                    FROM keyword_rankings kr
+                    JOIN products p ON kr.product_id = p.id
+                    WHERE kr.keyword_id = ? AND p.product_url = ?
+                    AND kr.date >= date('now', '-' || ? || ' day')
+                    ORDER BY kr.date
+                    ''', (keyword_id, product_url, days))
+                else:
+                    # 전체 상품 순위 이력 (최근 30일)
+                    cursor.execute('''
+                    SELECT kr.date, kr.rank, p.product_name, p.brand, p.product_url
+                    FROM keyword_rankings kr
+                    JOIN products p ON kr.product_id = p.id
+                    WHERE kr.keyword_id = ?
+                    AND kr.date >= date('now', '-' || ? || ' day')
+                    ORDER BY kr.date, kr.rank
+                    ''', (keyword_id, days))
+
+                rows = cursor.fetchall()
+
+                for row in rows:
+                    history.append({
+                        'date': row['date'],
+                        'rank': row['rank'],
+                        'product_name': row['product_name'],
+                        'brand': row['brand'],
+                        'product_url': row['product_url'] if 'product_url' in row.keys() else ''
+                    })
+
+                return history
         
         except Exception as e:
             logger.error("순위 이력 조회 오류: %s - %s", keyword, str(e))
             return []
-        
-        finally:
-            conn.close()
     
     def clean_old_data(self, days: int = CONFIG["DATA_EXPIRY_DAYS"]) -> bool:
         """오래된 데이터 정리"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            # 오래된 크롤링 로그 삭제
-            cursor.execute('''
-            DELETE FROM crawl_logs
-            WHERE created_at < datetime('now', '-' || ? || ' day')
-            ''', (days,))
-            
-            # 오래된 키워드 순위 데이터 삭제
-            cursor.execute('''
-            DELETE FROM keyword_rankings
-            WHERE date < date('now', '-' || ? || ' day')
-            ''', (days,))
+            with self.connections.transaction() as cursor:
+                # 오래된 크롤링 로그 삭제
+                cursor.execute('''
+                DELETE FROM crawl_logs
+                WHERE created_at < datetime('now', '-' || ? || ' day')
+                ''', (days,))
+
+                # 오래된 키워드 순위 데이터 삭제
+                cursor.execute('''
+                DELETE FROM keyword_rankings
+                WHERE date < date('now', '-' || ? || ' day')
+                ''', (days,))
             
-            conn.commit()
             return True
         
         except Exception as e:
-            conn.rollback()
             logger.error("데이터 정리 오류: %s", str(e))
             return False
-        
-        finally:
-            conn.close()
 
 class NaverAPI:
     """
@@ -2079,54 +2626,22 @@ class KeywordAnalyzer:
             return {"error": str(e), "keyword": keyword}
     
     async def save_analysis_results(self, results: Dict) -> None:
-        """분석 결과를 데이터베이스에 저장"""
-        main_keyword = results["main_keyword"]
-        category = results.get("category")
+        """
+        분석 결과를 데이터베이스에 저장
+        
+        전체 결과를 한 트랜잭션으로 저장하며, 디스크 동기화 동안 이벤트 루프가
+        멈추지 않도록 작업 스레드에서 실행합니다.
+        """
+        keywords_data = results.get("keywords_data") or {}
+        if not keywords_data:
+            return
         
         try:
-            # 각 키워드별 데이터 처리
-            for keyword, data in results["keywords_data"].items():
-                # 1. 키워드 기본 정보 저장
-                search_volume = data.get("avg_search_volume", 0)
-                competition = data.get("competition", 0)
-                
-                keyword_id = self.db.save_keyword(
-                    keyword=keyword,
-                    category=category,
-                    search_volume=search_volume,
-                    competition=competition
-                )
-                
-                if not keyword_id:
-                    logger.error(f"키워드 '{keyword}' 저장 실패")
-                    continue
-                
-                # 2. 관련 키워드 저장
-                related_keywords = data.get("related_keywords", [])
-                if related_keywords:
-                    self.db.save_related_keywords(keyword_id, related_keywords)
-                
-                # 3. 상품 정보 저장
-                products = data.get("products", [])
-                if products:
-                    self.db.save_products(keyword_id, products)
-                
-                # 4. 트렌드 데이터 저장
-                trend_data = data.get("search_volume", [])
-                if trend_data:
-                    trend_list = []
-                    for item in trend_data:
-                        if isinstance(item, dict):
-                            trend_list.append(item)
-                    
-                    if trend_list:
-                        self.db.save_keyword_trend(keyword_id, trend_list)
-                
-                # 5. 광고 키워드 저장
-                ad_keywords = data.get("ad_keywords", [])
-                for ad in ad_keywords:
-                    if isinstance(ad, dict) and "title" in ad:
-                        self.db.save_ad_keyword(ad["title"])
+            keyword_ids = await asyncio.to_thread(
+                self.db.save_analysis_batch, keywords_data, results.get("category")
+            )
+            if not keyword_ids:
+                logger.error(f"'{results['main_keyword']}' 분석 결과 저장 실패")
         
         except Exception as e:
             logger.error(f"분석 결과 저장 중 오류: {str(e)}")
@@ -2409,12 +2924,18 @@ class KeywordAnalyzer:
             # 2. 관련 키워드 추천
             related_keywords = keyword_data["related_keywords"]
             
+            # 관련 키워드는 검색량/경쟁도만 필요하므로 지표만 한 번에 조회
+            related_data_map = self.db.get_keywords_metrics([
+                kw_data["keyword"] for kw_data in related_keywords
+                if isinstance(kw_data, dict) and "keyword" in kw_data
+            ])
+            
             # 검색량과 경쟁도 기준으로 필터링
             best_related = []
             for kw_data in related_keywords:
                 if isinstance(kw_data, dict) and "keyword" in kw_data:
                     related_kw = kw_data["keyword"]
-                    related_data = self.db.get_keyword_data(related_kw)
+                    related_data = related_data_map[related_kw]
                     
                     if related_data["found"]:
                         search_volume = related_data["search_volume"]
@@ -2438,7 +2959,7 @@ class KeywordAnalyzer:
                     
                     # 이미 광고 키워드인지 확인
                     if not self.db.is_ad_keyword(related_kw):
-                        related_data = self.db.get_keyword_data(related_kw)
+                        related_data = related_data_map[related_kw]
                         
                         if related_data["found"]:
                             search_volume = related_data["search_volume"]
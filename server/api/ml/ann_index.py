@@ -0,0 +1,306 @@
+"""
+근사 최근접 이웃(ANN) 인덱스 모듈
+
+키워드 임베딩 행렬 위에서 코사인 유사도 상위 k개 이웃을 빠르게 찾기 위한
+순수 numpy 구현의 IVF(역색인) 인덱스와 소규모 코퍼스용 완전 탐색 인덱스를 제공합니다.
+"""
+import os
+import time
+import logging
+import numpy as np
+
+def _normalize(vectors):
+    """행 단위 L2 정규화 (영벡터는 그대로 유지)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+def _top_k(similarities, k):
+    """유사도 배열에서 상위 k개 위치를 내림차순으로 반환"""
+    if len(similarities) > k:
+        candidates = np.argpartition(-similarities, k - 1)[:k]
+    else:
+        candidates = np.arange(len(similarities))
+    return candidates[np.argsort(-similarities[candidates], kind='stable')]
+
+class ExactIndex:
+    """
+    완전 탐색 인덱스
+
+    모든 벡터와의 유사도를 계산합니다. 코퍼스가 작을 때 사용하며
+    IVF 인덱스의 재현율 측정 기준으로도 쓰입니다.
+    """
+
+    kind = 'exact'
+
+    def __init__(self, dim):
+        self.dim = dim
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, dim), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, vectors):
+        """
+        벡터 추가
+
+        Args:
+            ids: 벡터 ID 배열 (임베딩 저장소 행 번호)
+            vectors: (N, dim) 벡터 행렬
+        """
+        if len(ids) == 0:
+            return
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+        self.vectors = np.concatenate([self.vectors, _normalize(vectors)])
+
+    def search(self, query, k):
+        """
+        상위 k개 이웃 검색
+
+        Args:
+            query: 질의 벡터
+            k: 반환할 이웃 수
+
+        Returns:
+            (ID 배열, 코사인 유사도 배열) - 유사도 내림차순
+        """
+        if len(self.ids) == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        similarities = self.vectors @ _normalize(query)
+        order = _top_k(similarities, k)
+        return self.ids[order], similarities[order]
+
+    def _state(self):
+        return {'ids': self.ids, 'vectors': self.vectors}
+
+    def _load_state(self, state):
+        self.ids = state['ids']
+        self.vectors = state['vectors']
+
+class IVFIndex:
+    """
+    IVF(Inverted File) 인덱스
+
+    구면 k-means로 벡터 공간을 n_lists개 셀로 나누고, 질의와 가장 가까운
+    n_probe개 셀의 벡터만 비교합니다. 새 벡터는 가장 가까운 셀에 바로 추가됩니다.
+    """
+
+    kind = 'ivf'
+
+    def __init__(self, dim, n_lists=256, n_probe=16):
+        """
+        초기화
+
+        Args:
+            dim: 벡터 차원
+            n_lists: 셀(클러스터) 수
+            n_probe: 검색 시 확인할 셀 수
+        """
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.centroids = None
+        self.list_ids = []
+        self.list_vectors = []
+
+    def __len__(self):
+        return int(sum(len(ids) for ids in self.list_ids))
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def train(self, vectors, n_iter=10, sample_size=None, seed=42):
+        """
+        셀 중심 학습 (구면 k-means)
+
+        Args:
+            vectors: 학습용 (N, dim) 벡터 행렬
+            n_iter: 반복 횟수
+            sample_size: 학습에 사용할 최대 표본 수 (기본값: 셀당 64개)
+            seed: 난수 시드
+        """
+        rng = np.random.default_rng(seed)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.n_lists = max(1, min(self.n_lists, len(vectors)))
+
+        sample_size = sample_size or self.n_lists * 64
+        if len(vectors) > sample_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        vectors = _normalize(vectors)
+
+        centroids = vectors[rng.choice(len(vectors), self.n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            counts = np.bincount(assignments, minlength=self.n_lists)
+
+            # 비어 있는 셀은 기존 중심 유지
+            empty = counts == 0
+            sums[empty] = centroids[empty]
+            centroids = _normalize(sums)
+
+        self.centroids = centroids
+        self.list_ids = [np.empty(0, dtype=np.int64) for _ in range(self.n_lists)]
+        self.list_vectors = [np.empty((0, self.dim), dtype=np.float32) for _ in range(self.n_lists)]
+
+    def add(self, ids, vectors):
+        """
+        벡터 추가 (가장 가까운 셀에 할당)
+
+        Args:
+            ids: 벡터 ID 배열 (임베딩 저장소 행 번호)
+            vectors: (N, dim) 벡터 행렬
+        """
+        if not self.is_trained:
+            raise RuntimeError('IVF 인덱스가 학습되지 않았습니다.')
+        if len(ids) == 0:
+            return
+
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = _normalize(vectors)
+        assignments = np.argmax(vectors @ self.centroids.T, axis=1)
+
+        for list_no in np.unique(assignments):
+            mask = assignments == list_no
+            self.list_ids[list_no] = np.concatenate([self.list_ids[list_no], ids[mask]])
+            self.list_vectors[list_no] = np.concatenate([self.list_vectors[list_no], vectors[mask]])
+
+    def search(self, query, k):
+        """
+        상위 k개 근사 이웃 검색
+
+        Args:
+            query: 질의 벡터
+            k: 반환할 이웃 수
+
+        Returns:
+            (ID 배열, 코사인 유사도 배열) - 유사도 내림차순
+        """
+        if not self.is_trained or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = _normalize(query)
+        probes = _top_k(self.centroids @ query, min(self.n_probe, self.n_lists))
+
+        ids = np.concatenate([self.list_ids[p] for p in probes])
+        if len(ids) == 0:
+            return ids, np.empty(0, dtype=np.float32)
+        vectors = np.concatenate([self.list_vectors[p] for p in probes])
+
+        similarities = vectors @ query
+        order = _top_k(similarities, k)
+        return ids[order], similarities[order]
+
+    def _state(self):
+        offsets = np.cumsum([0] + [len(ids) for ids in self.list_ids])
+        return {
+            'centroids': self.centroids,
+            'n_probe': np.array(self.n_probe),
+            'offsets': offsets,
+            'ids': np.concatenate(self.list_ids) if self.list_ids else np.empty(0, dtype=np.int64),
+            'vectors': np.concatenate(self.list_vectors) if self.list_vectors else np.empty((0, self.dim), dtype=np.float32)
+        }
+
+    def _load_state(self, state):
+        self.centroids = state['centroids']
+        self.n_lists = len(self.centroids)
+        self.n_probe = int(state['n_probe'])
+        offsets = state['offsets']
+        self.list_ids = [state['ids'][offsets[i]:offsets[i + 1]] for i in range(self.n_lists)]
+        self.list_vectors = [state['vectors'][offsets[i]:offsets[i + 1]] for i in range(self.n_lists)]
+
+INDEX_TYPES = {ExactIndex.kind: ExactIndex, IVFIndex.kind: IVFIndex}
+
+def build_index(ids, vectors, exact_threshold=20000, n_lists=None, n_probe=16, seed=42):
+    """
+    코퍼스 크기에 맞는 인덱스 생성
+
+    Args:
+        ids: 벡터 ID 배열
+        vectors: (N, dim) 벡터 행렬
+        exact_threshold: 이보다 작은 코퍼스는 완전 탐색 인덱스 사용
+        n_lists: IVF 셀 수 (기본값: sqrt(N))
+        n_probe: IVF 검색 시 확인할 셀 수
+        seed: 난수 시드
+
+    Returns:
+        ExactIndex 또는 IVFIndex 인스턴스
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    dim = vectors.shape[1]
+
+    if len(vectors) < exact_threshold:
+        index = ExactIndex(dim)
+    else:
+        index = IVFIndex(dim, n_lists=n_lists or int(np.sqrt(len(vectors))), n_probe=n_probe)
+        index.train(vectors, seed=seed)
+
+    index.add(ids, vectors)
+    return index
+
+def save_index(index, path, n_indexed):
+    """
+    인덱스 파일 저장 (임시 파일에 기록 후 교체)
+
+    Args:
+        index: 저장할 인덱스
+        path: .npz 파일 경로
+        n_indexed: 인덱스에 반영된 임베딩 저장소 행 수
+    """
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, kind=np.array(index.kind), dim=np.array(index.dim),
+             n_indexed=np.array(n_indexed), **index._state())
+    os.replace(tmp_path, path)
+
+def load_index(path):
+    """
+    인덱스 파일 로드
+
+    Args:
+        path: .npz 파일 경로
+
+    Returns:
+        (인덱스, 인덱스에 반영된 임베딩 저장소 행 수)
+    """
+    with np.load(path) as state:
+        index = INDEX_TYPES[str(state['kind'])](int(state['dim']))
+        index._load_state({key: state[key] for key in state.files})
+        return index, int(state['n_indexed'])
+
+def measure_recall(index, exact_index, queries, k=20):
+    """
+    완전 탐색 대비 재현율(recall@k) 측정
+
+    Args:
+        index: 평가할 인덱스
+        exact_index: 같은 벡터를 담은 ExactIndex
+        queries: (Q, dim) 질의 벡터 행렬
+        k: 비교할 이웃 수
+
+    Returns:
+        재현율과 질의당 평균 지연 시간 딕셔너리
+    """
+    recalls = []
+    elapsed = 0.0
+
+    for query in queries:
+        expected, _ = exact_index.search(query, k)
+        start = time.perf_counter()
+        found, _ = index.search(query, k)
+        elapsed += time.perf_counter() - start
+
+        if len(expected):
+            recalls.append(len(np.intersect1d(expected, found)) / len(expected))
+
+    recall = float(np.mean(recalls)) if recalls else 1.0
+    logging.info(f"ANN 재현율@{k}: {recall:.3f} ({len(queries)}개 질의)")
+    return {
+        'k': k,
+        'queries': len(queries),
+        'recall': recall,
+        'avg_latency_ms': elapsed / max(len(queries), 1) * 1000
+    }
@@ -0,0 +1,67 @@
+"""
+배열 바이너리 전송 모듈
+
+대량 일괄 예측에서 특성 행렬과 결과를 JSON 대신 .npy 파일(헤더 + float64 버퍼)로
+주고받습니다. JSON 경로와 같은 float64를 사용하므로 전송 방식에 따라 결과가 달라지지 않습니다. 파일은 tmpfs(/dev/shm)에 두면 공유 메모리처럼 동작하며,
+np.load(mmap_mode='r')로 복사 없이 매핑합니다.
+"""
+import os
+import tempfile
+import numpy as np
+
+TRANSPORT_DTYPE = np.float64
+
+def transport_dir():
+    """전송 파일 기본 디렉토리 (공유 메모리 tmpfs가 있으면 사용)"""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+def load_features(data, key='features'):
+    """
+    요청 데이터에서 특성 행렬 가져오기
+
+    `<key>_path`가 있으면 .npy 파일을 메모리 매핑하고, 없으면 JSON 배열 `<key>`를 사용합니다.
+
+    Args:
+        data: 요청 데이터 딕셔너리
+        key: 특성 행렬 필드 이름
+
+    Returns:
+        (행 수, 특성 수) 배열 (float64 파일 입력은 읽기 전용 memmap, 다른 자료형은 float64로 변환)
+    """
+    path = data.get(f'{key}_path')
+    if path:
+        array = np.load(path, mmap_mode='r', allow_pickle=False)
+        if array.dtype != TRANSPORT_DTYPE:
+            array = array.astype(TRANSPORT_DTYPE)
+        return array
+    return np.asarray(data.get(key, []), dtype=np.float64)
+
+def save_array(path, array):
+    """
+    배열을 float64 .npy 파일로 저장 (임시 파일에 기록 후 교체)
+
+    Args:
+        path: 저장 경로
+        array: 저장할 배열
+
+    Returns:
+        {"output_path", "shape", "dtype"} 딕셔너리 (응답 JSON에 포함)
+    """
+    array = np.ascontiguousarray(array, dtype=TRANSPORT_DTYPE)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    return {
+        'output_path': path,
+        'shape': list(array.shape),
+        'dtype': array.dtype.str
+    }
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+의미 분석기 / ML 브릿지 성능 측정 도구
+
+고정 시드로 만든 한국어 합성 키워드 코퍼스에서 주요 연산의 지연 시간 백분위수(p50/p95/p99),
+처리량, 최대 메모리(RSS)를 측정합니다. 연산마다 별도 프로세스에서 실행해 메모리 측정이 서로
+섞이지 않으며, 결과 JSON을 이전 결과와 비교해 성능 저하를 확인할 수 있습니다.
+
+사용 예:
+    python3 benchmark.py --sizes 1000,100000 --output bench.json
+    python3 benchmark.py --operations predict_success_probability --compare bench.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+import importlib.util
+import logging
+
+import numpy as np
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+
+ML_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OPERATIONS = (
+    'analyze_keyword_meaning',
+    'find_semantic_related_keywords',
+    'identify_market_segments',
+    'predict_search_volume',
+    'predict_success_probability',
+    'predict_search_volume_batch',
+    'predict_success_probability_batch'
+)
+
+# 합성 코퍼스 재료 (쇼핑 검색어 형태: [수식어] 명사 [접미어])
+CORPUS_NOUNS = [
+    '노트북', '마우스', '키보드', '모니터', '이어폰', '헤드폰', '스피커', '충전기', '케이블', '태블릿',
+    '운동화', '샌들', '슬리퍼', '백팩', '지갑', '시계', '선글라스', '모자', '장갑', '목도리',
+    '비타민', '유산균', '오메가3', '홍삼', '단백질', '콜라겐', '루테인', '마그네슘', '밀크씨슬', '프로폴리스',
+    '냉장고', '세탁기', '청소기', '에어컨', '가습기', '제습기', '전자레인지', '에어프라이어', '커피머신', '정수기',
+    '소파', '침대', '책상', '의자', '옷장', '수납장', '매트리스', '베개', '이불', '커튼',
+    '립스틱', '선크림', '토너', '세럼', '크림', '클렌저', '마스크팩', '샴푸', '향수', '파운데이션'
+]
+CORPUS_MODIFIERS = [
+    '인기', '최고', '저렴한', '고급', '추천', '신상', '할인', '프리미엄', '가성비', '무선',
+    '휴대용', '대용량', '미니', '여성', '남성', '아동', '유기농', '국산', '수입', '친환경'
+]
+CORPUS_SUFFIXES = [
+    '추천', '가격', '할인', '후기', '구매', '비교', '종류', '브랜드', '사용법', '효과',
+    '최저가', '순위', '정품', '세트', '선물', '리뷰', '부작용', '문제', '해결', '방법'
+]
+
+# 추가 명사 생성용 한글 음절 (초성/중성/종성 조합)
+HANGUL_BASE = 0xAC00
+
+def _synthetic_noun(rng):
+    """2~3음절 합성 명사"""
+    syllables = []
+    for _ in range(rng.randint(2, 3)):
+        initial = rng.randrange(19)
+        medial = rng.randrange(21)
+        final = rng.choice((0, 0, 4, 8, 16, 21))
+        syllables.append(chr(HANGUL_BASE + (initial * 21 + medial) * 28 + final))
+    return ''.join(syllables)
+
+def generate_corpus(size, seed=42):
+    """
+    한국어 합성 키워드 코퍼스 생성
+
+    같은 크기와 시드면 항상 같은 코퍼스를 돌려주며, 실제 상품 명사를 먼저 쓰고
+    부족하면 합성 명사를 섞어 중복 없는 키워드를 만듭니다.
+
+    Args:
+        size: 키워드 수
+        seed: 난수 시드
+
+    Returns:
+        키워드 목록
+    """
+    rng = random.Random(seed)
+    nouns = list(CORPUS_NOUNS)
+    # 조합 수가 코퍼스 크기의 몇 배가 되도록 명사 목록 확장
+    combinations_per_noun = (len(CORPUS_MODIFIERS) + 1) * (len(CORPUS_SUFFIXES) + 1)
+    while len(nouns) * combinations_per_noun < size * 3:
+        nouns.append(_synthetic_noun(rng))
+
+    corpus = []
+    seen = set()
+    while len(corpus) < size:
+        noun = rng.choice(nouns)
+        parts = [noun]
+        if rng.random() < 0.5:
+            parts.insert(0, rng.choice(CORPUS_MODIFIERS))
+        if rng.random() < 0.7:
+            parts.append(rng.choice(CORPUS_SUFFIXES))
+        keyword = ' '.join(parts)
+        if keyword not in seen:
+            seen.add(keyword)
+            corpus.append(keyword)
+    return corpus
+
+def search_features(keyword, rng):
+    """검색량 예측 특성 (machine-learning-enhancer.ts extractKeywordFeatures 형태)"""
+    trends = [rng.randint(100, 50000) for _ in range(12)]
+    growth = (trends[-1] - trends[0]) / trends[0]
+    features = [len(keyword), len(keyword.split()), float(np.mean(trends[-3:])), float(np.mean(trends)), growth]
+    return features + [0.0] * (20 - len(features))
+
+def success_features(keyword, rng):
+    """성공 확률 특성 (machine-learning-enhancer.ts extractSuccessFeatures 순서)"""
+    return [
+        rng.randint(100, 100000), rng.randint(0, 5000), rng.randint(1000, 200000), rng.random() * 100,
+        rng.random(), rng.random(), rng.uniform(-0.5, 1.0), float(rng.random() < 0.5),
+        0.3, 5, len(keyword), len(keyword.split())
+    ]
+
+def peak_rss_mb():
+    """현재 프로세스 최대 RSS (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def load_bridge_module():
+    """ml-bridge.py 모듈 로드 (파일 이름에 하이픈이 있어 직접 임포트 불가)"""
+    spec = importlib.util.spec_from_file_location('ml_bridge', os.path.join(ML_DIR, 'ml-bridge.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _semantic_setup(corpus, work_dir, index=True):
+    """코퍼스 전체를 임베딩 저장소에 넣고 이웃 검색 인덱스를 구축한 분석기"""
+    from semantic_analyzer import SemanticKeywordAnalyzer
+
+    analyzer = SemanticKeywordAnalyzer(embedding_dir=work_dir)
+    if index:
+        analyzer._vectorize_keywords(corpus)
+        analyzer.rebuild_semantic_index(recall_queries=0)
+    return analyzer
+
+def prepare_operation(operation, corpus, rng, batch_size, work_dir):
+    """
+    연산 준비 (모델 로드, 인덱스 구축 등)
+
+    Returns:
+        질의 키워드를 받아 연산을 한 번 실행하는 함수
+    """
+    if operation == 'analyze_keyword_meaning':
+        analyzer = _semantic_setup(corpus, work_dir, index=False)
+        return analyzer.analyze_keyword_meaning
+
+    if operation == 'find_semantic_related_keywords':
+        analyzer = _semantic_setup(corpus, work_dir)
+        return lambda keyword: analyzer.find_semantic_related_keywords(keyword, top_n=20)
+
+    if operation == 'identify_market_segments':
+        analyzer = _semantic_setup(corpus, work_dir)
+
+        def run(keyword):
+            related = analyzer.find_semantic_related_keywords(keyword, top_n=30)
+            return analyzer.identify_market_segments(keyword, related)
+        # 브릿지 identify_market_segments 명령어와 같이 연관 키워드 검색 비용까지 포함
+        return run
+
+    bridge = load_bridge_module().MachineLearningBridge()
+
+    if operation == 'predict_search_volume':
+        return lambda keyword: bridge.process_command('predict_search_volume', json.dumps(search_features(keyword, rng)))
+
+    if operation == 'predict_success_probability':
+        return lambda keyword: bridge.process_command('predict_success_probability', json.dumps(success_features(keyword, rng)))
+
+    if operation == 'predict_search_volume_batch':
+        def run(keyword):
+            features = [search_features(keyword, rng) for _ in range(batch_size)]
+            return bridge.process_command('predict_search_volume_batch', json.dumps({'features': features, 'seed': 0}))
+        return run
+
+    if operation == 'predict_success_probability_batch':
+        def run(keyword):
+            features = [success_features(keyword, rng) for _ in range(batch_size)]
+            return bridge.process_command('predict_success_probability_batch', json.dumps({'features': features}))
+        return run
+
+    raise ValueError(f'알 수 없는 연산: {operation}')
+
+def run_operation(operation, size, iterations=200, warmup=10, seed=42, batch_size=100):
+    """
+    연산 하나를 현재 프로세스에서 측정
+
+    Args:
+        operation: 연산 이름
+        size: 코퍼스 크기
+        iterations: 측정 반복 수
+        warmup: 측정 전 예열 반복 수
+        seed: 코퍼스/질의 난수 시드
+        batch_size: 일괄 예측 연산의 한 번 요청 행 수
+
+    Returns:
+        측정 결과 딕셔너리
+    """
+    corpus = generate_corpus(size, seed=seed)
+    rng = random.Random(seed + 1)
+    queries = [rng.choice(corpus) for _ in range(warmup + iterations)]
+
+    with tempfile.TemporaryDirectory(prefix='ml-bench-') as work_dir:
+        setup_start = time.perf_counter()
+        run = prepare_operation(operation, corpus, rng, batch_size, work_dir)
+        setup_seconds = time.perf_counter() - setup_start
+
+        for keyword in queries[:warmup]:
+            run(keyword)
+
+        latencies = []
+        start = time.perf_counter()
+        for keyword in queries[warmup:]:
+            call_start = time.perf_counter()
+            run(keyword)
+            latencies.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    rows_per_call = batch_size if operation.endswith('_batch') else 1
+    return {
+        'operation': operation,
+        'corpus_size': size,
+        'iterations': iterations,
+        'rows_per_call': rows_per_call,
+        'setup_seconds': setup_seconds,
+        'latency_ms': {
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'mean': float(latencies_ms.mean()),
+            'max': float(latencies_ms.max())
+        },
+        'throughput_per_sec': iterations * rows_per_call / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+def run_isolated(operation, size, args):
+    """연산을 별도 프로세스에서 측정 (최대 RSS가 다른 연산과 섞이지 않도록)"""
+    command = [
+        sys.executable, os.path.abspath(__file__), '--run-one', operation,
+        '--sizes', str(size), '--iterations', str(args.iterations), '--warmup', str(args.warmup),
+        '--seed', str(args.seed), '--batch-size', str(args.batch_size)
+    ]
+    process = subprocess.run(command, stdout=subprocess.PIPE, text=True)
+    lines = [line for line in process.stdout.splitlines() if line.strip()]
+    if process.returncode != 0 or not lines:
+        return {'operation': operation, 'corpus_size': size, 'error': f'측정 실패 (코드: {process.returncode})'}
+    return json.loads(lines[-1])
+
+def environment_info():
+    """비교용 실행 환경 정보"""
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'numpy': np.__version__
+    }
+    for module_name in ('sklearn', 'spacy'):
+        try:
+            info[module_name] = __import__(module_name).__version__
+        except ImportError:
+            info[module_name] = None
+    try:
+        info['commit'] = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ML_DIR,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.strip() or None
+    except OSError:
+        info['commit'] = None
+    return info
+
+def compare_results(current, baseline, max_regression=0.2):
+    """
+    이전 측정 결과와 비교
+
+    Args:
+        current: 이번 측정 결과 딕셔너리
+        baseline: 이전 측정 결과 딕셔너리
+        max_regression: 허용하는 p95 지연 시간 증가 비율
+
+    Returns:
+        (비교 행 목록, 성능 저하 여부)
+    """
+    previous = {
+        (result['operation'], result['corpus_size']): result
+        for result in baseline.get('results', []) if 'error' not in result
+    }
+
+    rows = []
+    regressed = False
+    for result in current.get('results', []):
+        before = previous.get((result['operation'], result['corpus_size']))
+        if before is None or 'error' in result:
+            continue
+
+        row = {'operation': result['operation'], 'corpus_size': result['corpus_size']}
+        for q in ('p50', 'p95', 'p99'):
+            row[f'{q}_change'] = result['latency_ms'][q] / before['latency_ms'][q] - 1 if before['latency_ms'][q] else 0.0
+        row['throughput_change'] = (
+            result['throughput_per_sec'] / before['throughput_per_sec'] - 1 if before['throughput_per_sec'] else 0.0
+        )
+        row['rss_change_mb'] = result['peak_rss_mb'] - before['peak_rss_mb']
+        row['regressed'] = row['p95_change'] > max_regression
+        regressed = regressed or row['regressed']
+        rows.append(row)
+    return rows, regressed
+
+def print_report(report, comparison=None):
+    """측정 결과 표 출력 (표준 오류)"""
+    header = f"{'operation':<36}{'size':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>11}{'RSS MB':>9}"
+    print(header, file=sys.stderr)
+    for result in report['results']:
+        if 'error' in result:
+            print(f"{result['operation']:<36}{result['corpus_size']:>9}  {result['error']}", file=sys.stderr)
+            continue
+        latency = result['latency_ms']
+        print(
+            f"{result['operation']:<36}{result['corpus_size']:>9}{latency['p50']:>10.2f}{latency['p95']:>10.2f}"
+            f"{latency['p99']:>10.2f}{result['throughput_per_sec']:>11.1f}{result['peak_rss_mb']:>9.1f}",
+            file=sys.stderr
+        )
+
+    if comparison:
+        print('\n비교 (이전 대비 변화율)', file=sys.stderr)
+        for row in comparison:
+            flag = '  <- 성능 저하' if row['regressed'] else ''
+            print(
+                f"{row['operation']:<36}{row['corpus_size']:>9}  p50 {row['p50_change']:+.1%}  p95 {row['p95_change']:+.1%}"
+                f"  p99 {row['p99_change']:+.1%}  처리량 {row['throughput_change']:+.1%}  RSS {row['rss_change_mb']:+.1f}MB{flag}",
+                file=sys.stderr
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description='의미 분석기 / ML 브릿지 성능 측정')
+    parser.add_argument('--sizes', default='1000', help='코퍼스 크기 목록 (쉼표 구분, 1000 ~ 1000000)')
+    parser.add_argument('--operations', default=','.join(OPERATIONS), help='측정할 연산 (쉼표 구분)')
+    parser.add_argument('--iterations', type=int, default=200, help='연산별 측정 반복 수')
+    parser.add_argument('--warmup', type=int, default=10, help='측정 전 예열 반복 수')
+    parser.add_argument('--seed', type=int, default=42, help='코퍼스/질의 난수 시드')
+    parser.add_argument('--batch-size', type=int, default=100, help='일괄 예측 연산의 요청당 행 수')
+    parser.add_argument('--output', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='허용 p95 지연 증가 비율 (초과 시 종료 코드 1)')
+    parser.add_argument('--in-process', action='store_true', help='연산별 별도 프로세스 없이 측정')
+    parser.add_argument('--run-one', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    # 별도 프로세스 측정 모드: 결과 JSON 한 줄만 표준 출력에 기록
+    if args.run_one:
+        result = run_operation(args.run_one, sizes[0], iterations=args.iterations, warmup=args.warmup,
+                               seed=args.seed, batch_size=args.batch_size)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    operations = [name.strip() for name in args.operations.split(',') if name.strip()]
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        parser.error(f"알 수 없는 연산: {', '.join(unknown)}")
+
+    results = []
+    for size in sizes:
+        for operation in operations:
+            logging.info(f"측정 중: {operation} (코퍼스 {size}개)")
+            if args.in_process:
+                try:
+                    results.append(run_operation(operation, size, iterations=args.iterations, warmup=args.warmup,
+                                                 seed=args.seed, batch_size=args.batch_size))
+                except Exception as e:
+                    results.append({'operation': operation, 'corpus_size': size, 'error': str(e)})
+            else:
+                results.append(run_isolated(operation, size, args))
+
+    report = {
+        'environment': environment_info(),
+        'config': {
+            'sizes': sizes, 'iterations': args.iterations, 'warmup': args.warmup,
+            'seed': args.seed, 'batch_size': args.batch_size
+        },
+        'results': results
+    }
+
+    comparison, regressed = None, False
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparison, regressed = compare_results(report, baseline, args.max_regression)
+        report['comparison'] = {'baseline': baseline.get('environment'), 'rows': comparison}
+
+    print_report(report, comparison)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logging.info(f"결과 저장: {args.output}")
+
+    if regressed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+ML 브릿지 지표 모듈
+
+명령어별 처리 단계(parse, model_load, inference, serialization, total) 소요 시간 히스토그램과
+요청/오류/대체 결과(fallback) 카운터를 프로세스 단위로 모으고, JSON 또는 Prometheus
+텍스트 형식으로 내보냅니다.
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+# 히스토그램 버킷 상한 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = 'ml_bridge'
+
+class Histogram:
+    """
+    누적 버킷 히스토그램
+
+    관측값을 버킷별로 세고, 백분위수는 버킷 경계 사이를 선형 보간해 추정합니다.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        """관측값 추가"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        """
+        백분위수 추정
+
+        Args:
+            q: 0~1 사이 백분위
+
+        Returns:
+            추정값 (초, 관측값이 없으면 0)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for i, bucket_count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if bucket_count and cumulative + bucket_count >= rank:
+                fraction = (rank - cumulative) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max)
+            cumulative += bucket_count
+            lower = upper
+        return self.max
+
+    def to_dict(self):
+        """JSON 출력용 요약"""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts))
+        }
+
+class BridgeMetrics:
+    """
+    브릿지 지표 저장소
+
+    현재 처리 중인 명령어를 스레드별로 기억하므로 모델 레지스트리처럼 명령어를 모르는
+    하위 모듈도 stage_timer/record_stage로 해당 명령어의 단계 시간을 기록할 수 있습니다.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._context = threading.local()
+
+    @property
+    def current_command(self):
+        return getattr(self._context, 'command', None) or 'unknown'
+
+    @contextmanager
+    def command(self, name):
+        """명령어 처리 구간 (요청 수와 전체 소요 시간 기록)"""
+        previous = getattr(self._context, 'command', None)
+        self._context.command = name
+        self.increment('requests_total', command=name)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment('errors_total', command=name)
+            raise
+        finally:
+            self.record_stage('total', time.perf_counter() - start, command=name)
+            self._context.command = previous
+
+    @contextmanager
+    def stage_timer(self, stage):
+        """현재 명령어의 처리 단계 소요 시간 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def record_stage(self, stage, seconds, command=None):
+        """처리 단계 소요 시간 추가"""
+        key = (command or self.current_command, stage)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name, amount=1, **labels):
+        """카운터 증가"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def record_error(self, command=None):
+        """명령어 오류 수 증가 (예외 없이 오류 응답을 돌려준 경우)"""
+        self.increment('errors_total', command=command or self.current_command)
+
+    def record_fallback(self, kind):
+        """대체 결과 사용 횟수 증가 (현재 명령어 기준)"""
+        self.increment('fallbacks_total', command=self.current_command, kind=kind)
+        self._context.fallbacks = getattr(self._context, 'fallbacks', 0) + 1
+
+    def fallback_count(self):
+        """현재 스레드에서 대체 결과를 사용한 누적 횟수 (계산 전후 비교용)"""
+        return getattr(self._context, 'fallbacks', 0)
+
+    def reset(self):
+        """모든 지표 초기화"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def snapshot(self):
+        """
+        JSON 출력용 지표
+
+        Returns:
+            {"uptime_seconds", "commands": {명령어: {단계: 히스토그램 요약}}, "counters": [...]}
+        """
+        with self._lock:
+            commands = {}
+            for (command, stage), histogram in sorted(self._histograms.items()):
+                commands.setdefault(command, {})[stage] = histogram.to_dict()
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {
+            'uptime_seconds': time.time() - self.started_at,
+            'commands': commands,
+            'counters': counters
+        }
+
+    def to_prometheus(self, extra_labels=None):
+        """
+        Prometheus 텍스트 형식 출력
+
+        Args:
+            extra_labels: 모든 지표에 붙일 레이블 (워커 이름 등)
+
+        Returns:
+            텍스트 노출 형식 문자열
+        """
+        extra = dict(extra_labels or {})
+        lines = [
+            f'# HELP {METRIC_PREFIX}_stage_seconds ML bridge command stage latency',
+            f'# TYPE {METRIC_PREFIX}_stage_seconds histogram'
+        ]
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        for (command, stage), histogram in histograms:
+            labels = {**extra, 'command': command, 'stage': stage}
+            cumulative = 0
+            for bound, bucket_count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_bucket{_labels({**labels, "le": bound})} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_sum{_labels(labels)} {histogram.sum}')
+            lines.append(f'{METRIC_PREFIX}_stage_seconds_count{_labels(labels)} {histogram.count}')
+
+        declared = set()
+        for (name, labels), value in counters:
+            if name not in declared:
+                lines.append(f'# TYPE {METRIC_PREFIX}_{name} counter')
+                declared.add(name)
+            lines.append(f'{METRIC_PREFIX}_{name}{_labels({**extra, **dict(labels)})} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+def _labels(labels):
+    """Prometheus 레이블 문자열"""
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{key}="{escaped}"')
+    return '{' + ','.join(parts) + '}'
+
+def merge_prometheus(texts):
+    """
+    여러 프로세스의 Prometheus 텍스트를 지표 이름별로 묶어 하나로 합치기
+
+    Args:
+        texts: to_prometheus 출력 목록 (각 표본 줄이 해당 지표의 # TYPE 줄 뒤에 있어야 함)
+
+    Returns:
+        합친 텍스트 (HELP/TYPE 줄은 지표마다 한 번)
+    """
+    families = {}
+    for text in texts:
+        family = None
+        for line in text.splitlines():
+            if line.startswith('# '):
+                family = line.split()[2]
+                entry = families.setdefault(family, {'meta': [], 'samples': []})
+                if line not in entry['meta']:
+                    entry['meta'].append(line)
+            elif line and family is not None:
+                families[family]['samples'].append(line)
+
+    lines = []
+    for entry in families.values():
+        lines.extend(entry['meta'])
+        lines.extend(entry['samples'])
+    return '\n'.join(lines) + '\n'
+
+# 프로세스 전역 지표 저장소
+METRICS = BridgeMetrics()
+
+def stage_timer(stage):
+    """현재 명령어의 처리 단계 소요 시간 기록 (with 문)"""
+    return METRICS.stage_timer(stage)
+
+def record_stage(stage, seconds):
+    """현재 명령어의 처리 단계 소요 시간 추가"""
+    METRICS.record_stage(stage, seconds)
+
+def record_fallback(kind):
+    """대체 결과 사용 횟수 증가"""
+    METRICS.record_fallback(kind)
+
+def fallback_count():
+    """현재 스레드에서 대체 결과를 사용한 누적 횟수"""
+    return METRICS.fallback_count()
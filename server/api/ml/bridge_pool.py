@@ -0,0 +1,531 @@
+"""
+ML 브릿지 워커 풀 모듈
+
+상주 브릿지(`ml-bridge.py --serve`) 워커 프로세스 여러 개를 띄우고, 줄 단위 JSON 요청을
+명령어 종류(spaCy 의미 분석 / scikit-learn 모델 예측)에 따라 워커 그룹으로 나눠 보냅니다.
+처리 중인 요청 수가 한도를 넘으면 즉시 과부하 오류로 응답하고, 종료된 워커는 다시 시작합니다.
+"""
+import os
+import re
+import sys
+import json
+import time
+import queue
+import logging
+import threading
+import subprocess
+
+from bridge_metrics import merge_prometheus
+
+# spaCy 모델을 사용하는 명령어 (의미 분석 워커 그룹으로 보냄)
+SEMANTIC_COMMANDS = frozenset((
+    'analyze_keyword_meaning', 'analyze_keywords_batch', 'find_semantic_related',
+    'identify_market_segments', 'segment_keywords', 'fit_segment_model', 'assign_segments',
+    'rebuild_semantic_index'
+))
+
+# 모든 워커에 보내 결과를 합치는 명령어 (프로세스별 지표, 결과 캐시, 로드된 모델 상태)
+# compile_models는 한 워커만 컴파일하고, 다른 워커는 ModelRegistry가 파일 변경을 감지해 다시 로드
+BROADCAST_COMMANDS = frozenset(('stats', 'cache_stats', 'model_status'))
+
+# 워커 응답 줄 앞부분의 요청 ID ('{"id": 12, ...')
+RESPONSE_ID_PATTERN = re.compile(r'^\{"id": (-?\d+|null)')
+
+# 브로드캐스트 명령어 응답 대기 시간 (초, 지나면 응답한 워커 결과만으로 응답)
+BROADCAST_TIMEOUT_SECONDS = 2.0
+
+# 워커 재시작 간격 (연속으로 종료되면 점점 늘림)
+RESTART_BACKOFF_SECONDS = (0.5, 1, 2, 5, 10)
+
+class BridgeOverloadedError(RuntimeError):
+    """처리 중인 요청 수 한도 초과"""
+
+class BridgeWorker:
+    """
+    브릿지 워커 프로세스
+
+    요청은 워커별 전송 큐에 넣고 전송 스레드가 표준 입력에 기록하므로, 바쁜 워커의 파이프가
+    가득 차도 요청을 읽는 쪽은 멈추지 않습니다. 표준 출력을 읽는 스레드가 응답을 풀에 전달합니다.
+    처리 중 요청(pending)은 요청 스레드, 전송/읽기 스레드, 재시작 경로에서 모두 바뀌므로
+    워커 잠금 아래에서만 변경합니다.
+    """
+
+    def __init__(self, pool, group, index):
+        """
+        초기화
+
+        Args:
+            pool: 소속 BridgePool
+            group: 워커 그룹 ('semantic' 또는 'model')
+            index: 그룹 내 번호
+        """
+        self.pool = pool
+        self.group = group
+        self.index = index
+        self.name = f'{group}-{index}'
+        self.process = None
+        self.reader = None
+        self.writer = None
+        self.outbox = None
+        self.pending = {}
+        self.restarts = 0
+        self.started_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def inflight(self):
+        return len(self.pending)
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """워커 프로세스 실행"""
+        command = [sys.executable, self.pool.bridge_path, '--serve', '--workers', '1']
+        if self.group != 'semantic' or not self.pool.warmup:
+            command.append('--no-warmup')
+
+        # 여러 워커가 코어를 나눠 쓰므로 워커 내부 병렬 처리는 1개 스레드로 제한
+        env = dict(os.environ)
+        env.setdefault('OMP_NUM_THREADS', '1')
+        env.setdefault('OPENBLAS_NUM_THREADS', '1')
+        env.setdefault('MKL_NUM_THREADS', '1')
+        env.setdefault('ML_MODEL_N_JOBS', '1')
+
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+            bufsize=1 << 16
+        )
+        self.started_at = time.time()
+        self.outbox = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, args=(self.process, self.outbox), daemon=True)
+        self.writer.start()
+        self.reader = threading.Thread(target=self._read_loop, args=(self.process,), daemon=True)
+        self.reader.start()
+        logging.info(f"ML 브릿지 워커 시작: {self.name} (PID {self.process.pid})")
+
+    def reserve(self, worker_id, request):
+        """
+        처리 중 요청 자리 확보 (풀 잠금 안에서 호출해 한도 확인과 함께 반영)
+
+        Args:
+            worker_id: 워커 내부 요청 ID
+            request: 원래 요청 정보 (client_id, write 함수 등)
+        """
+        with self._lock:
+            self.pending[worker_id] = request
+
+    def release(self, worker_id, finished=True):
+        """
+        처리 중 요청 조회 (finished면 목록에서 제거)
+
+        Returns:
+            원래 요청 정보 (이미 응답했거나 실패 처리된 요청이면 None)
+        """
+        with self._lock:
+            if finished:
+                return self.pending.pop(worker_id, None)
+            return self.pending.get(worker_id)
+
+    def release_all(self):
+        """처리 중 요청 전체를 목록에서 제거해 반환"""
+        with self._lock:
+            requests = list(self.pending.values())
+            self.pending.clear()
+        return requests
+
+    def send(self, worker_id, line):
+        """
+        reserve한 요청을 전송 큐에 추가 (기록은 전송 스레드가 담당하므로 대기하지 않음)
+
+        Args:
+            worker_id: 워커 내부 요청 ID
+            line: 워커 내부 ID로 바꾼 요청 JSON 문자열
+        """
+        if self.outbox is None:
+            self.release(worker_id)
+            raise RuntimeError(f'워커가 시작되지 않았습니다 ({self.name})')
+        self.outbox.put((worker_id, line.encode('utf-8') + b'\n'))
+
+    def _write_loop(self, process, outbox):
+        """전송 큐의 요청을 표준 입력에 기록 (None을 받으면 표준 입력을 닫고 종료)"""
+        while True:
+            item = outbox.get()
+            if item is None:
+                break
+            worker_id, data = item
+            try:
+                process.stdin.write(data)
+                process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                # 종료된 프로세스의 나머지 요청은 handle_exit가 오류로 응답
+                request = self.release(worker_id)
+                if request is not None:
+                    self.pool.fail_request(request, f'워커 전송 실패 ({self.name}): {e}')
+        try:
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    def _read_loop(self, process):
+        """응답 읽기 (프로세스가 종료되면 풀에 알림)"""
+        for raw_line in process.stdout:
+            line = raw_line.decode('utf-8').rstrip('\n')
+            if line:
+                self.pool.handle_response(self, line)
+        process.wait()
+        self.pool.handle_exit(self, process)
+
+    def stop(self):
+        """워커 프로세스 종료 (전달된 요청은 처리를 마칠 때까지 대기)"""
+        if self.process is not None and self.process.poll() is None:
+            try:
+                # 전송 스레드가 큐에 남은 요청을 모두 기록한 뒤 표준 입력을 닫음
+                self.outbox.put(None)
+                self.process.wait(timeout=30)
+            except Exception:
+                self.process.kill()
+        if self.writer is not None:
+            self.writer.join(timeout=5)
+        if self.reader is not None:
+            self.reader.join(timeout=5)
+
+class BridgePool:
+    """
+    브릿지 워커 풀 클래스
+
+    클라이언트 요청 ID는 워커마다 고유한 내부 ID로 바꿔 전달하고, 응답 줄은 다시 파싱하지 않고
+    앞부분의 ID만 원래 ID로 바꿔 돌려줍니다.
+    """
+
+    def __init__(self, bridge_path, workers=None, semantic_workers=None, max_inflight=None, warmup=True,
+                 broadcast_timeout=BROADCAST_TIMEOUT_SECONDS):
+        """
+        초기화
+
+        Args:
+            bridge_path: ml-bridge.py 경로
+            workers: 전체 워커 수 (기본값: CPU 코어 수)
+            semantic_workers: 의미 분석 워커 수 (기본값: 전체의 1/4, 최소 1)
+            max_inflight: 처리 중 요청 수 한도 (기본값: 워커 수 x 8)
+            warmup: 의미 분석 워커 시작 시 spaCy 모델 사전 로드 여부
+            broadcast_timeout: stats/cache_stats/model_status 응답 대기 시간 (초)
+        """
+        workers = max(2, workers or os.cpu_count() or 2)
+        semantic_workers = semantic_workers or max(1, workers // 4)
+        semantic_workers = min(max(1, semantic_workers), workers - 1)
+
+        self.bridge_path = bridge_path
+        self.warmup = warmup
+        self.max_inflight = max_inflight or workers * 8
+        self.broadcast_timeout = broadcast_timeout
+        self.groups = {
+            'semantic': [BridgeWorker(self, 'semantic', i) for i in range(semantic_workers)],
+            'model': [BridgeWorker(self, 'model', i) for i in range(workers - semantic_workers)]
+        }
+
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._closed = False
+        self.overloaded = 0
+        self.crashes = 0
+
+    @property
+    def workers(self):
+        return self.groups['semantic'] + self.groups['model']
+
+    @property
+    def inflight(self):
+        return sum(worker.inflight for worker in self.workers)
+
+    def start(self):
+        """모든 워커 시작"""
+        for worker in self.workers:
+            worker.start()
+        logging.info(
+            f"ML 브릿지 워커 풀 시작: 의미 분석 {len(self.groups['semantic'])}개, "
+            f"모델 예측 {len(self.groups['model'])}개, 처리 중 요청 한도 {self.max_inflight}"
+        )
+
+    def close(self):
+        """모든 워커 종료"""
+        self._closed = True
+        for worker in self.workers:
+            worker.stop()
+
+    @staticmethod
+    def route(command):
+        """명령어를 처리할 워커 그룹 이름"""
+        return 'semantic' if command in SEMANTIC_COMMANDS else 'model'
+
+    def submit(self, line, write):
+        """
+        요청 한 줄 처리
+
+        풀 상태 조회(pool_stats)는 직접 응답하고, 나머지는 워커 그룹 중 처리 중 요청이
+        가장 적은 워커로 보냅니다. 응답은 write로 비동기 전달됩니다.
+
+        Args:
+            line: {"id": ..., "command": ..., "data": ...} 형태의 JSON 문자열
+            write: 응답 한 줄(JSON 문자열)을 기록하는 함수 (여러 스레드에서 호출될 수 있음)
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            write(json.dumps({'id': None, 'error': f'잘못된 요청 형식: {e}'}, ensure_ascii=False))
+            return
+
+        client_id = request.get('id')
+        command = request.get('command')
+
+        if command == 'pool_stats':
+            write('{"id": %s, "result": %s}' % (json.dumps(client_id), json.dumps(self.stats(), ensure_ascii=False)))
+            return
+
+        if command in BROADCAST_COMMANDS:
+            self._broadcast(request, write)
+            return
+
+        try:
+            with self._lock:
+                if self.inflight >= self.max_inflight:
+                    self.overloaded += 1
+                    raise BridgeOverloadedError(
+                        f'ML 브릿지 과부하: 처리 중인 요청 {self.inflight}개 (한도 {self.max_inflight})'
+                    )
+                worker = self._select_worker(self.route(command))
+                worker_id = self._next_id
+                self._next_id += 1
+                # 한도 확인과 같은 잠금 안에서 자리를 확보해야 동시 요청이 한도를 넘지 않음
+                worker.reserve(worker_id, {'client_id': json.dumps(client_id), 'write': write, 'command': command})
+
+            request['id'] = worker_id
+            worker.send(worker_id, json.dumps(request, ensure_ascii=False))
+        except BridgeOverloadedError as e:
+            write(json.dumps({'id': client_id, 'error': str(e), 'overloaded': True}, ensure_ascii=False))
+        except Exception as e:
+            logging.error(f"워커 요청 전달 오류 ({command}): {str(e)}")
+            write(json.dumps({'id': client_id, 'error': str(e)}, ensure_ascii=False))
+
+    def _broadcast(self, request, write):
+        """
+        모든 워커에 요청을 보내고 결과를 합쳐 한 번에 응답
+
+        JSON 형식은 {"pool": 풀 상태, "workers": {워커 이름: 결과}}, Prometheus 형식은
+        워커별 텍스트를 지표 이름별로 합친 뒤 풀 지표를 덧붙입니다. 긴 작업을 처리 중인
+        워커 때문에 모니터링 요청이 막히지 않도록 broadcast_timeout이 지나면 그때까지 응답한
+        워커 결과로 응답하고, 나머지 워커는 {"error", "timeout": true}로 표시합니다.
+        """
+        client_id = request.get('id')
+        data = request.get('data') or {}
+        if isinstance(data, str):
+            data = json.loads(data) if data else {}
+        prometheus = data.get('format') == 'prometheus'
+
+        workers = [worker for worker in self.workers if worker.alive]
+        results = {}
+        lock = threading.Lock()
+        state = {'done': False}
+
+        def finish():
+            with lock:
+                if state['done']:
+                    return
+                state['done'] = True
+                for worker in workers:
+                    if worker.name not in results:
+                        results[worker.name] = {'error': '응답 시간 초과', 'timeout': True}
+            timer.cancel()
+            if prometheus:
+                texts = [result.get('text', '') for result in results.values() if isinstance(result, dict)]
+                result = {'format': 'prometheus', 'text': merge_prometheus(texts) + self._pool_prometheus()}
+            else:
+                result = {'pool': self.stats(), 'workers': results}
+            write('{"id": %s, "result": %s}' % (json.dumps(client_id), json.dumps(result, ensure_ascii=False)))
+
+        def collector(worker):
+            def collect(line):
+                message = json.loads(line)
+                with lock:
+                    if state['done']:
+                        # 시간 초과 뒤 도착한 응답은 버림
+                        return
+                    results[worker.name] = message['result'] if 'result' in message else {'error': message.get('error')}
+                    done = len(results) == len(workers)
+                if done:
+                    finish()
+            return collect
+
+        timer = threading.Timer(self.broadcast_timeout, finish)
+        timer.daemon = True
+        if not workers:
+            finish()
+            return
+        timer.start()
+
+        for worker in workers:
+            with self._lock:
+                worker_id = self._next_id
+                self._next_id += 1
+                worker.reserve(worker_id, {'client_id': 'null', 'write': collector(worker),
+                                           'command': request.get('command')})
+            forwarded = dict(request, id=worker_id)
+            try:
+                worker.send(worker_id, json.dumps(forwarded, ensure_ascii=False))
+            except Exception as e:
+                collector(worker)(json.dumps({'id': None, 'error': str(e)}, ensure_ascii=False))
+
+    def _pool_prometheus(self):
+        """풀 상태 Prometheus 지표"""
+        return (
+            '# TYPE ml_bridge_pool_inflight gauge\n'
+            f'ml_bridge_pool_inflight {self.inflight}\n'
+            '# TYPE ml_bridge_pool_overloaded_total counter\n'
+            f'ml_bridge_pool_overloaded_total {self.overloaded}\n'
+            '# TYPE ml_bridge_pool_worker_crashes_total counter\n'
+            f'ml_bridge_pool_worker_crashes_total {self.crashes}\n'
+        )
+
+    def _select_worker(self, group):
+        """그룹에서 살아 있고 처리 중 요청이 가장 적은 워커 선택"""
+        candidates = [worker for worker in self.groups[group] if worker.alive]
+        if not candidates:
+            # 한 그룹이 모두 재시작 중이면 다른 그룹 워커가 대신 처리 (모든 워커가 모든 명령어 지원)
+            candidates = [worker for worker in self.workers if worker.alive]
+        if not candidates:
+            raise RuntimeError('사용 가능한 ML 브릿지 워커가 없습니다.')
+        return min(candidates, key=lambda worker: worker.inflight)
+
+    def handle_response(self, worker, line):
+        """워커 응답 한 줄을 요청한 클라이언트에 전달"""
+        match = RESPONSE_ID_PATTERN.match(line)
+        if not match or match.group(1) == 'null':
+            # 준비 완료 이벤트 등 요청과 무관한 줄
+            return
+
+        worker_id = int(match.group(1))
+        rest = line[match.end():]
+        finished = not rest.startswith(', "chunk"')
+
+        request = worker.release(worker_id, finished)
+        if request is None:
+            return
+
+        try:
+            request['write']('{"id": %s%s' % (request['client_id'], rest))
+        except Exception as e:
+            logging.warning(f"클라이언트 응답 전달 실패: {str(e)}")
+
+    def fail_request(self, request, message):
+        """전달하지 못한 요청에 오류로 응답"""
+        try:
+            request['write'](json.dumps({
+                'id': json.loads(request['client_id']),
+                'error': message
+            }, ensure_ascii=False))
+        except Exception:
+            pass
+
+    def handle_exit(self, worker, process):
+        """워커 종료 처리 (처리 중 요청은 오류로 응답하고 워커 재시작)"""
+        # 풀 잠금 안에서 비워야 종료 직전에 이 워커로 배정된 요청도 함께 실패 처리됨
+        with self._lock:
+            pending = worker.release_all()
+        # 아직 기록하지 않은 요청은 전송 스레드가 버리고 종료
+        if worker.outbox is not None and process is worker.process:
+            worker.outbox.put(None)
+        for request in pending:
+            self.fail_request(request, f"ML 브릿지 워커 종료 ({worker.name}, 코드: {process.returncode})")
+
+        if self._closed or process is not worker.process:
+            return
+
+        self.crashes += 1
+        logging.error(f"ML 브릿지 워커 종료: {worker.name} (코드: {process.returncode}, 실패 요청 {len(pending)}개)")
+
+        # 시작 직후 종료를 반복하면 재시작 간격을 늘림
+        if time.time() - worker.started_at < 30:
+            delay = RESTART_BACKOFF_SECONDS[min(worker.restarts, len(RESTART_BACKOFF_SECONDS) - 1)]
+        else:
+            worker.restarts = 0
+            delay = RESTART_BACKOFF_SECONDS[0]
+        worker.restarts += 1
+
+        def restart():
+            time.sleep(delay)
+            if not self._closed:
+                worker.start()
+
+        threading.Thread(target=restart, daemon=True).start()
+
+    def stats(self):
+        """워커별 상태와 처리 중 요청 수"""
+        return {
+            'max_inflight': self.max_inflight,
+            'inflight': self.inflight,
+            'overloaded': self.overloaded,
+            'crashes': self.crashes,
+            'workers': [
+                {
+                    'name': worker.name,
+                    'pid': worker.process.pid if worker.process else None,
+                    'alive': worker.alive,
+                    'inflight': worker.inflight,
+                    'restarts': worker.restarts
+                }
+                for worker in self.workers
+            ]
+        }
+
+def serve_pool_stdio(pool):
+    """표준 입출력 기반 풀 상주 모드"""
+    write_lock = threading.Lock()
+
+    def write(response):
+        with write_lock:
+            sys.stdout.write(response + '\n')
+            sys.stdout.flush()
+
+    write(json.dumps({'id': None, 'event': 'ready'}))
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if line:
+                pool.submit(line, write)
+    finally:
+        pool.close()
+
+def serve_pool_socket(pool, socket_path):
+    """Unix 소켓 기반 풀 상주 모드"""
+    import socketserver
+
+    class PoolRequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            write_lock = threading.Lock()
+
+            def write(response):
+                with write_lock:
+                    self.wfile.write((response + '\n').encode('utf-8'))
+                    self.wfile.flush()
+
+            for raw_line in self.rfile:
+                line = raw_line.decode('utf-8').strip()
+                if line:
+                    pool.submit(line, write)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, PoolRequestHandler) as server:
+        server.daemon_threads = True
+        logging.info(f"ML 브릿지 워커 풀 소켓 대기 중: {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            pool.close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
@@ -0,0 +1,233 @@
+"""
+키워드 임베딩 저장소 모듈
+
+키워드 벡터를 디스크에 한 번만 계산해 두고, 여러 브릿지 프로세스가
+메모리 매핑된 float32 .npy 행렬을 복사 없이 공유하도록 관리합니다.
+"""
+import os
+import re
+import json
+import fcntl
+import threading
+import logging
+import numpy as np
+
+# 기본 저장 디렉토리
+EMBEDDING_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'embeddings')
+
+class KeywordEmbeddingStore:
+    """
+    키워드 임베딩 저장소 클래스
+
+    모델 이름/버전/차원별로 `<키>.npy` 벡터 행렬, 한 줄에 키워드 하나인 추가 전용
+    `<키>.keywords.jsonl`, 확정된 행 수와 키워드 파일 길이를 담은 `<키>.meta.json`을
+    유지합니다. 추가 시에는 파일 잠금 아래에서 행과 키워드 줄을 먼저 기록한 뒤 메타
+    파일을 원자적으로 교체하므로, 읽는 쪽은 항상 완전히 기록된 행만 보고 새로 확정된
+    줄만 이어서 읽습니다. (추가 비용은 기존 키워드 수와 무관)
+    """
+
+    def __init__(self, model_name, model_version, dim, store_dir=None, initial_capacity=1024):
+        """
+        초기화
+
+        Args:
+            model_name: 벡터를 생성한 모델 이름
+            model_version: 모델 버전
+            dim: 벡터 차원
+            store_dir: 저장 디렉토리 (기본값: EMBEDDING_DIR)
+            initial_capacity: 최초 행렬 할당 행 수
+        """
+        self.dim = int(dim)
+        self.store_dir = store_dir or EMBEDDING_DIR
+        self.initial_capacity = initial_capacity
+        self.key = re.sub(r'[^0-9A-Za-z._-]+', '_', f'{model_name}-{model_version}-{self.dim}')
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        base_path = os.path.join(self.store_dir, self.key)
+        self.matrix_path = base_path + '.npy'
+        self.keywords_path = base_path + '.keywords.jsonl'
+        self.meta_path = base_path + '.meta.json'
+        self.legacy_index_path = base_path + '.index.json'
+        self.lock_path = base_path + '.lock'
+
+        self._keywords = []
+        self._rows = {}
+        self._keywords_offset = 0
+        self._matrix = None
+        self._meta_signature = None
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.legacy_index_path) and not os.path.exists(self.meta_path):
+            self._migrate_legacy_index()
+        self.refresh()
+
+    def __len__(self):
+        return len(self._keywords)
+
+    def __contains__(self, keyword):
+        return keyword in self._rows
+
+    @property
+    def keywords(self):
+        """행 순서대로 정렬된 키워드 목록"""
+        return self._keywords
+
+    @property
+    def matrix(self):
+        """(N, dim) 읽기 전용 메모리 매핑 행렬"""
+        if self._matrix is None:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self._matrix[:len(self._keywords)]
+
+    def refresh(self):
+        """다른 프로세스가 추가한 키워드가 있으면 인덱스와 행렬 다시 매핑"""
+        with self._lock:
+            self._load_if_changed()
+
+    def lookup(self, keywords):
+        """
+        키워드별 행 번호 조회
+
+        Args:
+            keywords: 키워드 문자열 목록
+
+        Returns:
+            행 번호 배열 (저장되지 않은 키워드는 -1)
+        """
+        self.refresh()
+        return np.array([self._rows.get(kw, -1) for kw in keywords], dtype=np.int64)
+
+    def add(self, keywords, vectors):
+        """
+        새 키워드 벡터 추가
+
+        이미 저장된 키워드는 무시합니다.
+
+        Args:
+            keywords: 키워드 문자열 목록
+            vectors: (len(keywords), dim) 벡터 행렬
+
+        Returns:
+            새로 추가된 키워드 수
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keywords), self.dim)
+
+        with self._lock, open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._load_if_changed()
+
+                new_rows = {}
+                for i, kw in enumerate(keywords):
+                    if kw not in self._rows and kw not in new_rows:
+                        new_rows[kw] = i
+                if not new_rows:
+                    return 0
+
+                count = len(self._keywords)
+                new_keywords = list(new_rows.keys())
+                matrix = self._writable_matrix(count + len(new_keywords))
+                matrix[count:count + len(new_keywords)] = vectors[list(new_rows.values())]
+                matrix.flush()
+                del matrix
+
+                # 행 기록이 끝난 뒤 키워드 줄 추가, 마지막으로 메타 교체(확정)
+                offset = self._append_keywords(new_keywords)
+                self._write_meta(count + len(new_keywords), offset)
+                self._load_if_changed()
+                return len(new_keywords)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _writable_matrix(self, required_rows):
+        """필요한 행 수를 수용하는 쓰기용 메모리 매핑 행렬 반환 (부족하면 확장)"""
+        count = len(self._keywords)
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+
+        if required_rows <= capacity:
+            return np.lib.format.open_memmap(self.matrix_path, mode='r+')
+
+        # 용량을 두 배로 늘린 새 파일을 만든 뒤 교체 (기존 매핑은 이전 파일을 계속 참조)
+        new_capacity = max(self.initial_capacity, capacity * 2, required_rows)
+        tmp_path = self.matrix_path + '.tmp'
+        grown = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32,
+                                          shape=(new_capacity, self.dim))
+        if count:
+            grown[:count] = self._matrix[:count]
+        grown.flush()
+        os.replace(tmp_path, self.matrix_path)
+        logging.info(f"임베딩 저장소 확장: {self.key} ({capacity} -> {new_capacity})")
+        return grown
+
+    def _append_keywords(self, keywords):
+        """
+        키워드 파일 끝에 키워드 줄 추가 (파일 잠금 안에서 호출)
+
+        확정되지 않은 꼬리(기록 도중 중단된 이전 추가분)는 먼저 잘라냅니다.
+
+        Returns:
+            추가 후 키워드 파일 길이(바이트)
+        """
+        with open(self.keywords_path, 'ab') as f:
+            f.truncate(self._keywords_offset)
+            f.write(''.join(json.dumps(kw, ensure_ascii=False) + '\n' for kw in keywords).encode('utf-8'))
+            f.flush()
+            return f.tell()
+
+    def _write_meta(self, count, offset):
+        """메타 파일 원자적 기록 (확정된 행 수와 키워드 파일 길이)"""
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'dim': self.dim, 'count': count, 'keywords_offset': offset}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _migrate_legacy_index(self):
+        """이전 형식(<키>.index.json 전체 목록)을 추가 전용 키워드 파일로 변환"""
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if os.path.exists(self.meta_path):
+                    return
+                with open(self.legacy_index_path, encoding='utf-8') as f:
+                    keywords = json.load(f)['keywords']
+                self._keywords_offset = 0
+                offset = self._append_keywords(keywords)
+                self._write_meta(len(keywords), offset)
+                os.remove(self.legacy_index_path)
+                logging.info(f"임베딩 저장소 인덱스 변환: {self.key} ({len(keywords)}개)")
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_if_changed(self):
+        """메타 파일이 바뀌었으면 새로 확정된 키워드만 이어서 읽고 행렬 다시 매핑"""
+        try:
+            stat = os.stat(self.meta_path)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if signature == self._meta_signature:
+            return
+
+        with open(self.meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+
+        count, offset = meta['count'], meta['keywords_offset']
+        if count < len(self._keywords) or offset < self._keywords_offset:
+            # 저장소가 새로 만들어진 경우 처음부터 다시 읽기
+            self._keywords, self._rows, self._keywords_offset = [], {}, 0
+
+        if offset > self._keywords_offset:
+            with open(self.keywords_path, 'rb') as f:
+                f.seek(self._keywords_offset)
+                data = f.read(offset - self._keywords_offset)
+            # 키워드 안의 U+2028 등도 str.splitlines()는 줄바꿈으로 보므로 기록한 b'\n'으로만 분리
+            for line in data.split(b'\n'):
+                if not line:
+                    continue
+                keyword = json.loads(line.decode('utf-8'))
+                self._rows[keyword] = len(self._keywords)
+                self._keywords.append(keyword)
+            self._keywords_offset = offset
+
+        self._matrix = np.load(self.matrix_path, mmap_mode='r')
+        self._meta_signature = signature
@@ -0,0 +1,320 @@
+"""
+랜덤 포레스트 컴파일 모듈
+
+학습된 scikit-learn RandomForest 모델의 모든 트리를 평평한 numpy 노드 배열
+(feature, threshold, left, right, value)로 변환하고, 모든 행과 트리를 한 번에
+내려가는 벡터화 탐색으로 예측합니다. 단일 행 예측에서 scikit-learn의 입력 검증과
+트리별 병렬 처리 오버헤드를 피하기 위한 용도입니다.
+"""
+import os
+import numpy as np
+
+COMPILED_SUFFIX = '.forest.npz'
+
+# 한 번에 탐색하는 최대 행 수 (행 수 x 트리 수 크기의 인덱스 배열 메모리 제한)
+PREDICT_CHUNK_ROWS = 4096
+
+class CompiledForest:
+    """
+    컴파일된 랜덤 포레스트 클래스
+
+    리프 노드는 자기 자신을 좌우 자식으로 가리키며, 모든 (행, 트리) 쌍을 한 단계씩
+    동시에 내려가다 리프에 도달한 쌍은 제외합니다. scikit-learn과 같이 입력을 float32로
+    변환한 뒤 float64 분기 임계값과 비교하므로 예측 결과가 원본 모델과 일치합니다.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots,
+                 max_depth, n_features, classes=None, feature_importances=None, source_sha256=None):
+        """
+        초기화
+
+        Args:
+            feature: (노드 수,) 분기 특성 인덱스 (리프는 0)
+            threshold: (노드 수,) 분기 임계값
+            left: (노드 수,) 왼쪽 자식 전역 인덱스 (리프는 자기 자신)
+            right: (노드 수,) 오른쪽 자식 전역 인덱스 (리프는 자기 자신)
+            missing_left: (노드 수,) 결측값이 왼쪽으로 가는지 여부
+            value: 회귀는 (노드 수,), 분류는 (노드 수, 클래스 수) 정규화 확률
+            roots: (트리 수,) 트리별 루트 노드 전역 인덱스
+            max_depth: 전체 트리 중 최대 깊이
+            n_features: 입력 특성 수
+            classes: 분류 모델의 클래스 레이블 (회귀는 None)
+            feature_importances: 원본 모델의 특성 중요도
+            source_sha256: 변환한 원본 모델 파일 체크섬
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        self.classes_ = classes
+        self.feature_importances_ = feature_importances
+        self.source_sha256 = source_sha256
+        self.is_leaf = self.left == np.arange(len(self.left))
+
+    @property
+    def is_classifier(self):
+        return self.classes_ is not None
+
+    @classmethod
+    def from_sklearn(cls, model, source_sha256=None):
+        """
+        학습된 RandomForestRegressor/RandomForestClassifier 변환
+
+        Args:
+            model: 단일 출력 랜덤 포레스트 모델
+            source_sha256: 원본 모델 파일 체크섬 (컴파일 결과의 유효성 확인용)
+
+        Returns:
+            CompiledForest 인스턴스
+        """
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError('다중 출력 모델은 지원하지 않습니다.')
+
+        classes = getattr(model, 'classes_', None)
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        max_depth = 0
+        offset = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int64)
+            is_leaf = tree.children_left < 0
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            if hasattr(tree, 'missing_go_to_left'):
+                missing.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+            else:
+                missing.append(np.zeros(tree.node_count, dtype=bool))
+
+            if classes is None:
+                values.append(tree.value[:, 0, 0].astype(np.float64))
+            else:
+                # 버전에 따라 value가 샘플 수 또는 비율이므로 노드별 확률로 정규화
+                counts = tree.value[:, 0, :].astype(np.float64)
+                totals = counts.sum(axis=1, keepdims=True)
+                values.append(counts / np.where(totals > 0, totals, 1.0))
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += tree.node_count
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            missing_left=np.concatenate(missing),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int64),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=classes,
+            feature_importances=np.asarray(model.feature_importances_, dtype=np.float64),
+            source_sha256=source_sha256
+        )
+
+    def _leaf_values(self, X):
+        """(행 수, 트리 수) 리프 노드 값 배열 계산"""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        if n_features != self.n_features_in_:
+            raise ValueError(f'특성 수 불일치: {n_features}개 입력, 모델은 {self.n_features_in_}개 필요')
+
+        # (행, 트리) 쌍을 1차원으로 펼치고 리프에 도달한 쌍은 다음 단계에서 제외
+        n_trees = len(self.roots)
+        nodes = np.tile(self.roots, n_rows)
+        offsets = np.repeat(np.arange(n_rows) * n_features, n_trees)
+        flat_X = X.ravel()
+        active = np.arange(len(nodes))
+
+        for _ in range(self.max_depth):
+            current = nodes[active]
+            splitting = ~self.is_leaf[current]
+            if not splitting.all():
+                active = active[splitting]
+                current = current[splitting]
+                if not len(active):
+                    break
+            x = flat_X[offsets[active] + self.feature[current]].astype(np.float64)
+            go_left = (x <= self.threshold[current]) | (np.isnan(x) & self.missing_left[current])
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+
+        return self.value[nodes].reshape((n_rows, n_trees) + self.value.shape[1:])
+
+    def _mean_over_trees(self, X):
+        """행 단위로 나눠 트리 평균 계산"""
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        chunks = [
+            self._leaf_values(X[start:start + PREDICT_CHUNK_ROWS]).mean(axis=1)
+            for start in range(0, len(X), PREDICT_CHUNK_ROWS)
+        ]
+        return np.concatenate(chunks) if chunks else np.empty((0,) + self.value.shape[1:])
+
+    def predict_proba(self, X):
+        """
+        클래스 확률 예측 (분류 모델 전용)
+
+        Args:
+            X: (행 수, 특성 수) 특성 행렬
+
+        Returns:
+            (행 수, 클래스 수) 확률 배열
+        """
+        if not self.is_classifier:
+            raise AttributeError('회귀 모델은 predict_proba를 지원하지 않습니다.')
+        return self._mean_over_trees(X)
+
+    def predict(self, X):
+        """
+        예측 (회귀는 트리 평균, 분류는 평균 확률이 가장 높은 클래스)
+
+        Args:
+            X: (행 수, 특성 수) 특성 행렬
+
+        Returns:
+            (행 수,) 예측 배열
+        """
+        result = self._mean_over_trees(X)
+        if self.is_classifier:
+            return self.classes_[np.argmax(result, axis=1)]
+        return result
+
+    def save(self, path):
+        """
+        npz 파일로 저장 (임시 파일에 기록 후 교체)
+
+        Args:
+            path: 저장 경로 (<모델 이름>.forest.npz)
+        """
+        arrays = {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'missing_left': self.missing_left,
+            'value': self.value,
+            'roots': self.roots,
+            'max_depth': np.array(self.max_depth),
+            'n_features': np.array(self.n_features_in_),
+            'feature_importances': self.feature_importances_,
+            'source_sha256': np.array(self.source_sha256 or '')
+        }
+        if self.classes_ is not None:
+            arrays['classes'] = self.classes_
+
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        try:
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        npz 파일에서 로드
+
+        Args:
+            path: compile 결과 파일 경로
+
+        Returns:
+            CompiledForest 인스턴스
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                feature=data['feature'],
+                threshold=data['threshold'],
+                left=data['left'],
+                right=data['right'],
+                missing_left=data['missing_left'],
+                value=data['value'],
+                roots=data['roots'],
+                max_depth=data['max_depth'],
+                n_features=data['n_features'],
+                classes=data['classes'] if 'classes' in data.files else None,
+                feature_importances=data['feature_importances'],
+                source_sha256=str(data['source_sha256']) or None
+            )
+
+def verify_compiled(model, compiled, X, tolerance=1e-9):
+    """
+    컴파일 결과와 원본 모델 예측 비교
+
+    Args:
+        model: 원본 scikit-learn 모델
+        compiled: CompiledForest 인스턴스
+        X: 비교에 사용할 특성 행렬
+        tolerance: 허용 최대 절대 오차
+
+    Returns:
+        {"rows", "max_abs_diff", "match"} 딕셔너리
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if compiled.is_classifier:
+        expected = model.predict_proba(X)
+        actual = compiled.predict_proba(X)
+    else:
+        expected = model.predict(X)
+        actual = compiled.predict(X)
+
+    max_abs_diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+    return {
+        'rows': len(X),
+        'max_abs_diff': max_abs_diff,
+        'match': max_abs_diff <= tolerance
+    }
+
+def compile_model(model, path, source_sha256=None, probe_rows=256, seed=42):
+    """
+    모델 컴파일 후 원본과 예측이 일치할 때만 저장
+
+    학습 데이터가 남아 있지 않으므로 각 분기 임계값 주변 값을 섞은 탐색용 입력으로
+    모든 경로를 고르게 지나도록 비교합니다.
+
+    Args:
+        model: 원본 scikit-learn 모델
+        path: 저장 경로
+        source_sha256: 원본 모델 파일 체크섬
+        probe_rows: 비교용 입력 행 수
+        seed: 비교용 입력 난수 시드
+
+    Returns:
+        verify_compiled 결과에 "nodes", "trees", "max_depth", "saved"를 더한 딕셔너리
+    """
+    compiled = CompiledForest.from_sklearn(model, source_sha256=source_sha256)
+
+    rng = np.random.default_rng(seed)
+    n_features = compiled.n_features_in_
+    split_nodes = ~compiled.is_leaf
+    probe = rng.random((probe_rows, n_features))
+    for column in range(n_features):
+        thresholds = compiled.threshold[split_nodes & (compiled.feature == column)]
+        if len(thresholds):
+            picks = rng.choice(thresholds, size=probe_rows)
+            probe[:, column] = picks + rng.normal(scale=1e-3, size=probe_rows) * np.maximum(np.abs(picks), 1.0)
+
+    result = verify_compiled(model, compiled, probe)
+    result.update({
+        'nodes': int(len(compiled.feature)),
+        'trees': int(len(compiled.roots)),
+        'max_depth': compiled.max_depth,
+        'saved': False
+    })
+
+    if result['match']:
+        compiled.save(path)
+        result['saved'] = True
+    return result
@@ -0,0 +1,141 @@
+"""
+사전 다중 패턴 매칭 모듈
+
+의도/카테고리/감성 사전의 모든 단어를 Aho-Corasick 오토마톤 하나로 컴파일해
+키워드를 한 번만 훑어 모든 사전 매칭 결과를 얻습니다.
+"""
+from collections import deque
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick 오토마톤
+
+    텍스트 길이에 비례하는 시간에 모든 패턴의 등장 여부를 찾으며,
+    패턴 수가 늘어나도 검색 비용은 거의 늘지 않습니다.
+    """
+
+    def __init__(self, patterns):
+        """
+        초기화
+
+        Args:
+            patterns: 패턴 문자열 목록 (패턴 ID는 목록 내 위치)
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            if pattern:
+                self._insert(pattern, pattern_id)
+        self._build_failure_links()
+
+    def _insert(self, pattern, pattern_id):
+        """트라이에 패턴 추가"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] = self._output[state] + (pattern_id,)
+
+    def _build_failure_links(self):
+        """너비 우선 탐색으로 실패 링크와 출력 집합 구성"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_ids(self, text):
+        """
+        텍스트에 등장하는 패턴 ID 집합 반환
+
+        Args:
+            text: 검색할 문자열
+
+        Returns:
+            등장한 패턴 ID 집합
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+class LexiconMatcher:
+    """
+    사전 매처 클래스
+
+    {사전 이름: {그룹: [단어, ...]}} 형태의 여러 사전을 하나의 오토마톤으로 컴파일하고,
+    매칭 결과를 사전/그룹별로 원래 단어 순서대로 돌려줍니다.
+    """
+
+    def __init__(self, lexicons):
+        """
+        초기화
+
+        Args:
+            lexicons: {사전 이름: {그룹: [단어, ...]}} 딕셔너리
+        """
+        self.lexicons = lexicons
+
+        # 단어별로 (사전, 그룹, 위치) 목록을 모아 중복 단어도 한 번만 컴파일
+        self._words = []
+        self._entries = []
+        word_ids = {}
+        for lexicon_name, groups in lexicons.items():
+            for group, words in groups.items():
+                for position, word in enumerate(words):
+                    if word not in word_ids:
+                        word_ids[word] = len(self._words)
+                        self._words.append(word)
+                        self._entries.append([])
+                    self._entries[word_ids[word]].append((lexicon_name, group, position))
+
+        self._automaton = AhoCorasickAutomaton(self._words)
+
+    def match(self, text):
+        """
+        텍스트에 포함된 사전 단어 찾기
+
+        Args:
+            text: 검색할 문자열
+
+        Returns:
+            {사전 이름: {그룹: [매칭 단어, ...]}} 딕셔너리 (매칭된 그룹만 포함,
+            단어는 사전에 정의된 순서)
+        """
+        positions = {}
+        for word_id in self._automaton.find_ids(text):
+            for lexicon_name, group, position in self._entries[word_id]:
+                positions.setdefault(lexicon_name, {}).setdefault(group, []).append(position)
+
+        result = {}
+        for lexicon_name, groups in positions.items():
+            words_by_group = self.lexicons[lexicon_name]
+            result[lexicon_name] = {
+                group: [words_by_group[group][p] for p in sorted(group_positions)]
+                for group, group_positions in groups.items()
+            }
+        return result
@@ -7,6 +7,8 @@
 import { spawn } from 'child_process';
 import { logger } from '../../utils/logger';
 import { DatabaseConnector } from '../collectors/database-connector';
+import { MLBridgeClient, getMLBridgeClient } from './ml-bridge-client';
+import { NpyArray, createTransportPath, writeNpyMatrix, readNpy, removeTransportFiles } from './npy-transport';
 import path from 'path';
 import { fileURLToPath } from 'url';
 
@@ -24,6 +26,16 @@ export interface SearchVolumeForecast {
   upper: number;
 }
 
+/**
+ * 일괄 검색량 예측 결과 인터페이스 (행: 키워드, 열: 1개월 후부터 horizon개월 후까지)
+ */
+export interface SearchVolumeForecastBatch {
+  horizon: number;
+  forecast: number[][];
+  lower: number[][];
+  upper: number[][];
+}
+
 /**
  * 성공 확률 예측 결과 인터페이스
  */
@@ -83,6 +95,49 @@ export interface MarketSegment {
   keywords: string[];
 }
 
+/**
+ * 대량 키워드 세그먼트 분할 결과 인터페이스
+ */
+export interface KeywordSegmentation {
+  k: number;
+  silhouette_scores: Record<string, number>;
+  segments: Array<MarketSegment & { size: number }>;
+  keywords: number;
+  vectorized: number;
+}
+
+/**
+ * 카테고리 세그먼트 모델 학습 결과 인터페이스
+ */
+export interface SegmentModelSummary {
+  category: string;
+  k: number;
+  segments: Array<{ id: number; label: string; size: number }>;
+  keywords: number;
+  vectorized: number;
+}
+
+/**
+ * 세그먼트 배정 결과 인터페이스 (벡터가 없는 키워드는 segment_id가 null)
+ */
+export interface SegmentAssignment {
+  keyword: string;
+  segment_id: number | null;
+  label: string | null;
+  distance: number | null;
+}
+
+/**
+ * 대량 키워드 세그먼트 분할 옵션
+ */
+export interface KeywordSegmentationOptions {
+  nClusters?: number;
+  kMin?: number;
+  kMax?: number;
+  maxKeywordsPerSegment?: number;
+  seed?: number;
+}
+
 /**
  * 머신러닝 강화 시스템 클래스
  */
@@ -90,6 +145,8 @@ export class MachineLearningEnhancer {
   private db: DatabaseConnector;
   private pythonPath: string;
   private mlBridgePath: string;
+  private bridgeClient: MLBridgeClient | null;
+  private binaryTransportMinRows: number;
 
   /**
    * 생성자
@@ -99,15 +156,71 @@ export class MachineLearningEnhancer {
     this.db = db;
     this.pythonPath = 'python3';
     this.mlBridgePath = path.join(__dirname, 'ml-bridge.py');
+
+    // 기본적으로 상주 브릿지 프로세스를 공유하고, 필요하면 명령어별 실행 방식으로 전환
+    this.bridgeClient = process.env.ML_BRIDGE_PERSISTENT === 'false'
+      ? null
+      : getMLBridgeClient(this.pythonPath, this.mlBridgePath);
+
+    // 이 행 수 이상의 일괄 예측은 특성/결과를 JSON 대신 .npy 파일로 전달
+    this.binaryTransportMinRows = Number(process.env.ML_BINARY_TRANSPORT_MIN_ROWS || 256);
   }
 
   /**
    * Python 스크립트 실행
    * @param command 실행할 명령어
    * @param data 전송할 데이터
+   * @returns 파싱된 Python 스크립트의 출력 결과
+   */
+  private async executePythonScript<T = any>(command: string, data: any): Promise<T> {
+    if (this.bridgeClient) {
+      return this.bridgeClient.request<T>(command, data);
+    }
+
+    const output = await this.executePythonScriptOnce(command, data);
+    return JSON.parse(output) as T;
+  }
+
+  /**
+   * 특성 행렬을 .npy 파일로 전달하는 일괄 명령어 실행
+   * @param command 실행할 명령어
+   * @param features 특성 행렬
+   * @param data 함께 전송할 데이터
+   * @returns 응답 JSON과 결과 배열
+   */
+  private async executeMatrixScript<T = any>(
+    command: string,
+    features: number[][],
+    data: any = {}
+  ): Promise<{ result: T; output: NpyArray }> {
+    const featuresPath = createTransportPath('features');
+    const outputPath = createTransportPath('output');
+
+    try {
+      writeNpyMatrix(featuresPath, features);
+      const result = await this.executePythonScript<any>(command, {
+        ...data,
+        features_path: featuresPath,
+        output_path: outputPath
+      });
+
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+
+      return { result, output: readNpy(outputPath) };
+    } finally {
+      removeTransportFiles(featuresPath, outputPath);
+    }
+  }
+
+  /**
+   * 명령어 하나를 위해 Python 프로세스를 새로 실행
+   * @param command 실행할 명령어
+   * @param data 전송할 데이터
    * @returns Python 스크립트의 출력 결과
    */
-  private async executePythonScript(command: string, data: any): Promise<string> {
+  private async executePythonScriptOnce(command: string, data: any): Promise<string> {
     return new Promise((resolve, reject) => {
       try {
         const dataString = JSON.stringify(data);
@@ -160,10 +273,7 @@ export class MachineLearningEnhancer {
       const features = this.extractKeywordFeatures(keyword, historicalData);
       
       // ML 브릿지 호출
-      const result = await this.executePythonScript('predict_search_volume', features);
-      
-      // 결과 파싱
-      const forecasts: SearchVolumeForecast[] = JSON.parse(result);
+      const forecasts = await this.executePythonScript<SearchVolumeForecast[]>('predict_search_volume', features);
       
       return forecasts;
     } catch (error) {
@@ -172,6 +282,56 @@ export class MachineLearningEnhancer {
     }
   }
 
+  /**
+   * 여러 키워드 검색량 일괄 예측
+   * @param keywords 키워드 목록
+   * @param horizon 예측 개월 수
+   * @param seed 무작위 변동 시드 (지정 시 결과 재현 가능)
+   * @returns 키워드별 월별 검색량 예측 결과 (입력 순서)
+   */
+  async predictSearchVolumeBatch(keywords: string[], horizon: number = 6, seed?: number): Promise<SearchVolumeForecast[][]> {
+    try {
+      const features = keywords.map((keyword) => {
+        const keywordData = this.db.getKeywordData(keyword);
+        return this.extractKeywordFeatures(keyword, keywordData?.trends);
+      });
+      
+      // 대량 요청은 바이너리 전송 사용 (결과는 [forecast, lower, upper] x 키워드 x 월)
+      if (features.length >= this.binaryTransportMinRows) {
+        const { output } = await this.executeMatrixScript('predict_search_volume_batch', features, { horizon, seed });
+        const [, rows, months] = output.shape;
+        const value = (layer: number, row: number, month: number) => output.data[(layer * rows + row) * months + month];
+
+        return keywords.map((_, index) => Array.from({ length: months }, (_, month) => ({
+          month: month + 1,
+          forecast: value(0, index, month),
+          lower: value(1, index, month),
+          upper: value(2, index, month)
+        })));
+      }
+      
+      // ML 브릿지 호출 (모든 키워드를 한 번에 예측)
+      const result = await this.executePythonScript<SearchVolumeForecastBatch & { error?: string; message?: string }>(
+        'predict_search_volume_batch',
+        { features, horizon, seed }
+      );
+      
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+      
+      return result.forecast.map((row, index) => row.map((forecast, month) => ({
+        month: month + 1,
+        forecast,
+        lower: result.lower[index][month],
+        upper: result.upper[index][month]
+      })));
+    } catch (error) {
+      logger.error(`검색량 일괄 예측 오류: ${error}`);
+      return keywords.map(() => this.generateDefaultSearchForecast());
+    }
+  }
+
   /**
    * 키워드 성공 확률 예측
    * @param keyword 키워드
@@ -192,10 +352,7 @@ export class MachineLearningEnhancer {
       const features = this.extractSuccessFeatures(keyword, metrics);
       
       // ML 브릿지 호출
-      const result = await this.executePythonScript('predict_success_probability', features);
-      
-      // 결과 파싱
-      const probability: SuccessProbability = JSON.parse(result);
+      const probability = await this.executePythonScript<SuccessProbability>('predict_success_probability', features);
       
       return probability;
     } catch (error) {
@@ -208,6 +365,54 @@ export class MachineLearningEnhancer {
     }
   }
   
+  /**
+   * 여러 키워드 성공 확률 일괄 예측
+   * @param keywords 키워드 목록
+   * @param metricsList 키워드별 분석 지표 (선택, keywords와 같은 순서)
+   * @returns 키워드별 성공 확률 및 중요 요인 (입력 순서)
+   */
+  async predictSuccessProbabilityBatch(keywords: string[], metricsList?: any[]): Promise<SuccessProbability[]> {
+    try {
+      const features = keywords.map((keyword, index) => {
+        let metrics = metricsList?.[index];
+        if (!metrics) {
+          metrics = this.db.getKeywordData(keyword)?.metrics;
+        }
+        return this.extractSuccessFeatures(keyword, metrics);
+      });
+      
+      // 대량 요청은 바이너리 전송 사용 (결과는 키워드별 확률)
+      if (features.length >= this.binaryTransportMinRows) {
+        const { result, output } = await this.executeMatrixScript('predict_success_probability_batch', features);
+        return Array.from(output.data, (probability) => ({
+          probability,
+          score: Math.trunc(probability * 100),
+          important_factors: result.important_factors
+        }));
+      }
+      
+      // ML 브릿지 호출 (모든 키워드를 한 번의 predict_proba로 예측)
+      const result = await this.executePythonScript('predict_success_probability_batch', { features });
+      
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+      
+      return result.probabilities.map((probability: number, index: number) => ({
+        probability,
+        score: result.scores[index],
+        important_factors: result.important_factors
+      }));
+    } catch (error) {
+      logger.error(`성공 확률 일괄 예측 오류: ${error}`);
+      return keywords.map(() => ({
+        probability: 0.5,
+        score: 50,
+        important_factors: []
+      }));
+    }
+  }
+  
   /**
    * 키워드 의미 분석
    * @param keyword 분석할 키워드
@@ -216,10 +421,7 @@ export class MachineLearningEnhancer {
   async analyzeKeywordMeaning(keyword: string): Promise<KeywordMeaning> {
     try {
       // Python 스크립트 실행
-      const result = await this.executePythonScript('analyze_keyword_meaning', { keyword });
-      
-      // 결과 파싱
-      const analysis = JSON.parse(result);
+      const analysis = await this.executePythonScript('analyze_keyword_meaning', { keyword });
       
       // 오류 확인
       if (analysis.error) {
@@ -247,6 +449,50 @@ export class MachineLearningEnhancer {
     }
   }
   
+  /**
+   * 여러 키워드 일괄 의미 분석
+   * @param keywords 분석할 키워드 목록
+   * @param onResult 키워드별 결과를 받는 콜백 (지정 시 결과를 모아 두지 않음)
+   * @param options spaCy 배치 크기 및 프로세스 수
+   * @returns 의미 분석 결과 목록 (onResult 지정 시 빈 배열)
+   */
+  async analyzeKeywordsBatch(
+    keywords: string[],
+    onResult?: (analysis: KeywordMeaning) => void,
+    options: { batchSize?: number; nProcess?: number } = {}
+  ): Promise<KeywordMeaning[]> {
+    const data = {
+      keywords,
+      batch_size: options.batchSize,
+      n_process: options.nProcess ?? 1
+    };
+
+    try {
+      if (!this.bridgeClient) {
+        const analyses = await this.executePythonScript<KeywordMeaning[]>('analyze_keywords_batch', data);
+        if (onResult) {
+          analyses.forEach(onResult);
+          return [];
+        }
+        return analyses;
+      }
+
+      const analyses: KeywordMeaning[] = [];
+      await this.bridgeClient.request('analyze_keywords_batch', data, (analysis: KeywordMeaning) => {
+        if (onResult) {
+          onResult(analysis);
+        } else {
+          analyses.push(analysis);
+        }
+      });
+
+      return analyses;
+    } catch (error) {
+      logger.error(`키워드 일괄 의미 분석 오류: ${error}`);
+      throw error;
+    }
+  }
+  
   /**
    * 의미적 연관 키워드 찾기
    * @param keyword 기준 키워드
@@ -278,15 +524,13 @@ export class MachineLearningEnhancer {
   /**
    * 시장 세그먼트 식별
    * @param keyword 기준 키워드
+   * @param category 카테고리 (세그먼트 모델이 있으면 재군집화 없이 배정)
    * @returns 시장 세그먼트 목록
    */
-  async identifyMarketSegments(keyword: string): Promise<MarketSegment[]> {
+  async identifyMarketSegments(keyword: string, category?: string): Promise<MarketSegment[]> {
     try {
       // Python 스크립트 실행
-      const result = await this.executePythonScript('identify_market_segments', { keyword });
-      
-      // 결과 파싱
-      const segments = JSON.parse(result);
+      const segments = await this.executePythonScript('identify_market_segments', { keyword, category });
       
       // 오류 확인
       if (segments.error) {
@@ -300,6 +544,95 @@ export class MachineLearningEnhancer {
     }
   }
 
+  /**
+   * 카테고리 등 대량 키워드 목록 세그먼트 분할
+   * @param keywords 키워드 목록
+   * @param options 세그먼트 수/후보 범위/세그먼트별 반환 키워드 수
+   * @returns 세그먼트 분할 결과 (세그먼트는 크기 내림차순, 키워드는 중심에 가까운 순서)
+   */
+  async segmentKeywords(keywords: string[], options: KeywordSegmentationOptions = {}): Promise<KeywordSegmentation> {
+    try {
+      const result = await this.executePythonScript<KeywordSegmentation & { error?: string; message?: string }>(
+        'segment_keywords',
+        {
+          keywords,
+          n_clusters: options.nClusters,
+          k_min: options.kMin,
+          k_max: options.kMax,
+          max_keywords_per_segment: options.maxKeywordsPerSegment,
+          seed: options.seed
+        }
+      );
+
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+
+      return result;
+    } catch (error) {
+      logger.error(`키워드 세그먼트 분할 오류: ${error}`);
+      throw error;
+    }
+  }
+
+  /**
+   * 카테고리 세그먼트 모델 학습 (이후 assignSegments로 재군집화 없이 배정)
+   * @param category 카테고리 이름
+   * @param keywords 카테고리 키워드 목록
+   * @param options 세그먼트 수/후보 범위
+   * @returns 학습된 세그먼트 요약
+   */
+  async fitSegmentModel(
+    category: string,
+    keywords: string[],
+    options: KeywordSegmentationOptions = {}
+  ): Promise<SegmentModelSummary> {
+    try {
+      const result = await this.executePythonScript<SegmentModelSummary & { error?: string; message?: string }>(
+        'fit_segment_model',
+        {
+          category,
+          keywords,
+          n_clusters: options.nClusters,
+          k_min: options.kMin,
+          k_max: options.kMax,
+          seed: options.seed
+        }
+      );
+
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+
+      return result;
+    } catch (error) {
+      logger.error(`세그먼트 모델 학습 오류: ${error}`);
+      throw error;
+    }
+  }
+
+  /**
+   * 새로 수집된 키워드를 카테고리 세그먼트에 배정
+   * @param category 카테고리 이름
+   * @param keywords 배정할 키워드 목록
+   * @param update 배정한 키워드를 백그라운드 모델 갱신에 반영할지 여부
+   * @returns 키워드별 배정 결과
+   */
+  async assignSegments(category: string, keywords: string[], update: boolean = true): Promise<SegmentAssignment[]> {
+    try {
+      const result = await this.executePythonScript<any>('assign_segments', { category, keywords, update });
+
+      if (result.error) {
+        throw new Error(result.message || result.error);
+      }
+
+      return result as SegmentAssignment[];
+    } catch (error) {
+      logger.error(`세그먼트 배정 오류: ${error}`);
+      throw error;
+    }
+  }
+
   /**
    * 키워드 특성 추출
    * @param keyword 키워드
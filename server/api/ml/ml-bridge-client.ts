@@ -0,0 +1,223 @@
+/**
+ * ML 브릿지 클라이언트
+ *
+ * `ml-bridge.py --serve` 상주 프로세스 하나를 띄워 두고 줄 단위 JSON 요청을
+ * 요청 ID로 다중화하는 모듈
+ */
+
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
+import { logger } from '../../utils/logger';
+
+/**
+ * 응답 대기 중인 요청
+ */
+interface PendingRequest {
+  command: string;
+  resolve: (result: any) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+  onChunk?: (chunk: any) => void;
+}
+
+/**
+ * 상주 ML 브릿지 클라이언트 클래스
+ */
+export class MLBridgeClient {
+  private pythonPath: string;
+  private bridgePath: string;
+  private requestTimeoutMs: number;
+  private bridgeProcess: ChildProcessWithoutNullStreams | null = null;
+  private pending: Map<number, PendingRequest> = new Map();
+  private nextId = 1;
+  private buffer = '';
+
+  /**
+   * 생성자
+   * @param pythonPath Python 실행 파일 경로
+   * @param bridgePath ml-bridge.py 경로
+   * @param requestTimeoutMs 요청별 응답 대기 시간 (밀리초)
+   */
+  constructor(pythonPath: string, bridgePath: string, requestTimeoutMs: number = 60000) {
+    this.pythonPath = pythonPath;
+    this.bridgePath = bridgePath;
+    this.requestTimeoutMs = requestTimeoutMs;
+  }
+
+  /**
+   * 명령어 실행 요청
+   * @param command 실행할 명령어
+   * @param data 전송할 데이터
+   * @param onChunk 스트리밍 명령어의 결과 항목을 받을 콜백 (지정 시 스트리밍 요청)
+   * @returns 파싱된 명령어 실행 결과
+   */
+  request<T = any>(command: string, data: any, onChunk?: (chunk: any) => void): Promise<T> {
+    return new Promise((resolve, reject) => {
+      try {
+        const bridgeProcess = this.ensureProcess();
+        const id = this.nextId++;
+
+        const timer = this.startTimer(id, command);
+        this.pending.set(id, { command, resolve, reject, timer, onChunk });
+
+        const message = onChunk ? { id, command, data } : { id, command, data, stream: false };
+        bridgeProcess.stdin.write(JSON.stringify(message) + '\n');
+      } catch (error) {
+        logger.error(`ML 브릿지 호출 오류: ${error}`);
+        reject(error);
+      }
+    });
+  }
+
+  /**
+   * 상주 프로세스 종료
+   */
+  close(): void {
+    if (this.bridgeProcess) {
+      this.bridgeProcess.kill();
+      this.bridgeProcess = null;
+    }
+  }
+
+  /**
+   * 응답 대기 타이머 시작
+   */
+  private startTimer(id: number, command: string): NodeJS.Timeout {
+    return setTimeout(() => {
+      const request = this.pending.get(id);
+      if (request) {
+        this.pending.delete(id);
+        request.reject(new Error(`ML 브릿지 응답 시간 초과 (${command})`));
+      }
+    }, this.requestTimeoutMs);
+  }
+
+  /**
+   * 상주 프로세스가 없으면 새로 실행
+   */
+  private ensureProcess(): ChildProcessWithoutNullStreams {
+    if (this.bridgeProcess) {
+      return this.bridgeProcess;
+    }
+
+    const bridgeProcess = spawn(this.pythonPath, [this.bridgePath, '--serve']);
+    this.bridgeProcess = bridgeProcess;
+    this.buffer = '';
+
+    bridgeProcess.stdout.on('data', (chunk) => {
+      this.handleOutput(chunk.toString());
+    });
+
+    bridgeProcess.stderr.on('data', (chunk) => {
+      logger.warn(`ML 브릿지 오류: ${chunk.toString()}`);
+    });
+
+    bridgeProcess.stdin.on('error', (error) => {
+      logger.error(`ML 브릿지 입력 오류: ${error}`);
+    });
+
+    bridgeProcess.on('close', (code) => {
+      logger.error(`ML 브릿지 상주 프로세스 종료 (코드: ${code})`);
+      if (this.bridgeProcess === bridgeProcess) {
+        this.bridgeProcess = null;
+      }
+      this.rejectAll(new Error(`ML 브릿지 프로세스 종료 (코드: ${code})`));
+    });
+
+    logger.info('ML 브릿지 상주 프로세스 시작');
+    return bridgeProcess;
+  }
+
+  /**
+   * 표준 출력 데이터를 줄 단위로 나눠 처리
+   */
+  private handleOutput(text: string): void {
+    this.buffer += text;
+
+    let newlineIndex = this.buffer.indexOf('\n');
+    while (newlineIndex !== -1) {
+      const line = this.buffer.slice(0, newlineIndex).trim();
+      this.buffer = this.buffer.slice(newlineIndex + 1);
+      if (line) {
+        this.handleLine(line);
+      }
+      newlineIndex = this.buffer.indexOf('\n');
+    }
+  }
+
+  /**
+   * 응답 한 줄 처리
+   */
+  private handleLine(line: string): void {
+    let message: any;
+    try {
+      message = JSON.parse(line);
+    } catch (error) {
+      logger.warn(`ML 브릿지 응답 파싱 오류: ${line}`);
+      return;
+    }
+
+    if (message.event === 'ready') {
+      logger.info('ML 브릿지 준비 완료');
+      return;
+    }
+
+    const request = this.pending.get(message.id);
+    if (!request) {
+      return;
+    }
+
+    // 스트리밍 항목은 전달만 하고 응답 대기 시간을 연장
+    if ('chunk' in message) {
+      clearTimeout(request.timer);
+      request.timer = this.startTimer(message.id, request.command);
+      request.onChunk?.(message.chunk);
+      return;
+    }
+
+    this.pending.delete(message.id);
+    clearTimeout(request.timer);
+
+    if (message.error) {
+      request.reject(new Error(`ML 브릿지 실행 오류 (${request.command}): ${message.error}`));
+    } else {
+      request.resolve(message.result);
+    }
+  }
+
+  /**
+   * 대기 중인 모든 요청 거부
+   */
+  private rejectAll(error: Error): void {
+    this.pending.forEach((request) => {
+      clearTimeout(request.timer);
+      request.reject(error);
+    });
+    this.pending.clear();
+  }
+}
+
+// 프로세스 전역에서 공유하는 클라이언트 (요청마다 Enhancer가 생성되므로 공유 필요)
+const sharedClients: Map<string, MLBridgeClient> = new Map();
+
+/**
+ * 공유 ML 브릿지 클라이언트 가져오기
+ * @param pythonPath Python 실행 파일 경로
+ * @param bridgePath ml-bridge.py 경로
+ * @returns 공유 클라이언트 인스턴스
+ */
+export function getMLBridgeClient(pythonPath: string, bridgePath: string): MLBridgeClient {
+  const key = `${pythonPath}:${bridgePath}`;
+  let client = sharedClients.get(key);
+
+  if (!client) {
+    client = new MLBridgeClient(pythonPath, bridgePath);
+    sharedClients.set(key, client);
+  }
+
+  return client;
+}
+
+// 서버 종료 시 상주 프로세스 정리
+process.on('exit', () => {
+  sharedClients.forEach((client) => client.close());
+});
@@ -5,9 +5,15 @@ ML 브릿지 - TypeScript 서버에서 Python 머신러닝 모델에 액세스
 import os
 import sys
 import json
+import argparse
+import threading
+import socketserver
 import numpy as np
 import joblib
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from model_registry import ModelRegistry
+from array_transport import load_features, save_array
+from bridge_pool import BridgePool, BROADCAST_TIMEOUT_SECONDS, serve_pool_stdio, serve_pool_socket
+from bridge_metrics import METRICS, stage_timer, record_fallback
 import logging
 
 # 로깅 설정
@@ -23,7 +29,12 @@ os.makedirs(MODEL_DIR, exist_ok=True)
 
 # 의미 분석기 임포트
 try:
-    from semantic_analyzer import SemanticKeywordAnalyzer, analyze_keyword, find_related_keywords, identify_segments
+    from semantic_analyzer import (
+        SemanticKeywordAnalyzer, analyze_keyword, find_related_keywords, identify_segments,
+        get_shared_analyzer, warmup as warmup_semantic_analyzer, rebuild_semantic_index,
+        analyze_keywords_batch, iter_keywords_file, get_result_cache, segment_keywords,
+        fit_segment_model, assign_segments
+    )
     HAS_SEMANTIC_ANALYZER = True
     logging.info("의미 분석기 로드 성공")
 except ImportError as e:
@@ -35,282 +46,821 @@ except ImportError as e:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         if current_dir not in sys.path:
             sys.path.append(current_dir)
-        from semantic_analyzer import SemanticKeywordAnalyzer, analyze_keyword, find_related_keywords, identify_segments
+        from semantic_analyzer import (
+            SemanticKeywordAnalyzer, analyze_keyword, find_related_keywords, identify_segments,
+            get_shared_analyzer, warmup as warmup_semantic_analyzer, rebuild_semantic_index,
+            analyze_keywords_batch, iter_keywords_file, get_result_cache, segment_keywords,
+            fit_segment_model, assign_segments
+        )
         HAS_SEMANTIC_ANALYZER = True
         logging.info("의미 분석기 로드 성공 (경로 추가 후)")
     except ImportError as e2:
         logging.error(f"의미 분석기 로드 재시도 실패: {e2}")
 
+# 성공 확률 모델 특성 이름 (machine-learning-enhancer.ts의 extractSuccessFeatures 순서)
+SUCCESS_FEATURE_NAMES = [
+    '키워드 길이', '단어 수', '검색량', '상품 수', '평균 가격', '경쟁도', '광고 비율',
+    '브랜드 비율', '3개월 성장률', '상승 추세', '마진율', 'CPC 대비 마진'
+]
+
 class MachineLearningBridge:
+    # 결과를 여러 줄로 나눠 보내는 명령어 (상주 모드 전용)
+    STREAMING_COMMANDS = ('analyze_keywords_batch',)
+    
+    # 관리하는 모델 이름 (MODEL_DIR/<이름>.pkl)
+    MODEL_NAMES = ('search_volume_predictor', 'competition_predictor', 'trend_classifier', 'success_probability')
+    
     def __init__(self):
-        self.models = {}
+        self.models = None
         self.initialize_models()
         
-    def initialize_models(self):
-        """모델 초기화 또는 훈련"""
+    @property
+    def semantic_analyzer(self):
+        """프로세스 전역 공유 의미 분석기 (사용 불가 시 None)"""
+        if not HAS_SEMANTIC_ANALYZER:
+            return None
+        return get_shared_analyzer()
+    
+    def warmup(self):
+        """상주 모드 시작 시 의미 분석기 사전 로드"""
+        if not HAS_SEMANTIC_ANALYZER:
+            return
         try:
-            # 모델 파일이 있는지 확인하고, 없으면 간단한 데모 모델 생성
-            search_model_path = os.path.join(MODEL_DIR, 'search_volume_predictor.pkl')
-            if not os.path.exists(search_model_path):
-                logging.info("검색량 예측 모델 생성 중...")
-                self._create_demo_search_model(search_model_path)
-                
-            competition_model_path = os.path.join(MODEL_DIR, 'competition_predictor.pkl')
-            if not os.path.exists(competition_model_path):
-                logging.info("경쟁도 예측 모델 생성 중...")
-                self._create_demo_competition_model(competition_model_path)
-                
-            trend_model_path = os.path.join(MODEL_DIR, 'trend_classifier.pkl')
-            if not os.path.exists(trend_model_path):
-                logging.info("트렌드 분류 모델 생성 중...")
-                self._create_demo_trend_model(trend_model_path)
-                
-            success_model_path = os.path.join(MODEL_DIR, 'success_probability.pkl')
-            if not os.path.exists(success_model_path):
-                logging.info("성공 확률 모델 생성 중...")
-                self._create_demo_success_model(success_model_path)
-                
-            # 모델 로드
-            self.models['search_volume_predictor'] = joblib.load(search_model_path)
-            self.models['competition_predictor'] = joblib.load(competition_model_path)
-            self.models['trend_classifier'] = joblib.load(trend_model_path)
-            self.models['success_probability'] = joblib.load(success_model_path)
-            
-            logging.info("모든 모델 로드 완료")
+            warmup_semantic_analyzer()
+            logging.info("의미 분석기 사전 로드 완료")
         except Exception as e:
-            logging.error(f"모델 초기화 오류: {str(e)}")
-    
-    def _create_demo_search_model(self, model_path):
-        """검색량 예측을 위한 데모 모델 생성"""
-        # 간단한 데모 데이터 생성
-        X = np.random.rand(100, 20)  # 20개 특성을 가진 100개 샘플
-        y = np.sin(X[:, 0]) + 0.1 * np.random.randn(100) + X[:, 1] * 2
-        
-        # 랜덤 포레스트 회귀 모델 훈련
-        model = RandomForestRegressor(n_estimators=10, random_state=42)
-        model.fit(X, y)
-        
-        # 모델 저장
-        joblib.dump(model, model_path)
-    
-    def _create_demo_competition_model(self, model_path):
-        """경쟁도 예측을 위한 데모 모델 생성"""
-        X = np.random.rand(100, 10)
-        y = X[:, 0] * 50 + X[:, 1] * 30 + np.random.randn(100) * 5
-        
-        model = RandomForestRegressor(n_estimators=10, random_state=42)
-        model.fit(X, y)
+            logging.error(f"의미 분석기 사전 로드 오류: {str(e)}")
         
-        joblib.dump(model, model_path)
-    
-    def _create_demo_trend_model(self, model_path):
-        """트렌드 분류를 위한 데모 모델 생성"""
-        X = np.random.rand(100, 15)
-        y = (X[:, 0] + X[:, 1] > 1).astype(int)
+    def initialize_models(self):
+        """
+        모델 레지스트리 초기화 (모델은 처음 사용할 때 로드)
         
-        model = RandomForestClassifier(n_estimators=10, random_state=42)
-        model.fit(X, y)
+        모델 파일이 없으면 요청 중 학습하지 않고 레지스트리가 ModelNotAvailableError를
+        발생시키며, 각 처리기가 이를 오류 응답으로 돌려줍니다 (train_models.py로 사전 학습).
+        """
+        self.models = ModelRegistry(
+            MODEL_DIR,
+            self.MODEL_NAMES,
+            mmap_mode=None if os.environ.get('ML_MODEL_MMAP') == '0' else 'r',
+            # compile_models로 만든 평평한 노드 배열이 있으면 scikit-learn 대신 사용
+            compiled=os.environ.get('ML_COMPILED_MODELS') != '0',
+            # 요청은 대부분 소량 예측이므로 기본적으로 모델 내부 병렬 처리 사용 안 함
+            n_jobs=int(os.environ.get('ML_MODEL_N_JOBS') or 1),
+            # 성공 확률 모델은 로드할 때마다 중요도 순위를 다시 계산
+            on_load={'success_probability': self._on_success_model_loaded}
+        )
         
-        joblib.dump(model, model_path)
+        # 시작 시에는 파일 정보만 비교 (체크섬은 모델 로드/model_status 시 파일 버전마다 한 번)
+        for name, status in self.models.verify(deep=False).items():
+            if status['stale']:
+                logging.warning(f"오래된 모델 아티팩트: {name} - {', '.join(status['reasons'])}")
     
-    def _create_demo_success_model(self, model_path):
-        """성공 확률 예측을 위한 데모 모델 생성"""
-        X = np.random.rand(100, 12)
-        y = (X[:, 0] * 0.3 + X[:, 1] * 0.3 + X[:, 2] * 0.4 > 0.5).astype(int)
-        
-        model = RandomForestClassifier(n_estimators=10, random_state=42)
-        model.fit(X, y)
-        
-        joblib.dump(model, model_path)
+    def _on_success_model_loaded(self, model):
+        """성공 확률 모델 로드 시 중요도 순위 계산"""
+        # 중요도 상위 5개 요인은 모델이 바뀌지 않는 한 동일하므로 로드 시 한 번만 계산
+        importances = model.feature_importances_
+        self.success_importances = importances
+        self.success_top_factors = np.argsort(importances)[-5:][::-1]
     
     def predict_search_volume(self, features_json):
         """검색량 예측"""
         try:
-            features = json.loads(features_json)
+            features = self._parse_request(features_json)
             features_array = np.array(features).reshape(1, -1)
             
-            prediction = self.models['search_volume_predictor'].predict(features_array)[0]
+            model = self.models['search_volume_predictor']
+            with stage_timer('inference'):
+                prediction = model.predict(features_array)
             
             # 예측 결과에 약간의 변동성 추가
-            months_ahead = 6
-            predictions = []
-            base = prediction
-            
-            for i in range(months_ahead):
-                # 작은 증가 또는 감소 추세 추가
-                trend_factor = 1 + (i * 0.03)
-                seasonal_factor = 1 + 0.1 * np.sin(i * np.pi / 6)  # 계절적 변동
-                random_factor = 1 + np.random.randn() * 0.05  # 무작위성
-                
-                month_prediction = base * trend_factor * seasonal_factor * random_factor
-                
-                predictions.append({
+            forecast, lower, upper = self._forecast_horizons(prediction, horizon=6)
+            
+            predictions = [
+                {
                     'month': i + 1,
-                    'forecast': float(month_prediction),
-                    'lower': float(month_prediction * 0.9),
-                    'upper': float(month_prediction * 1.1)
-                })
+                    'forecast': float(forecast[0, i]),
+                    'lower': float(lower[0, i]),
+                    'upper': float(upper[0, i])
+                }
+                for i in range(forecast.shape[1])
+            ]
             
-            return json.dumps(predictions)
+            return self._serialize(predictions)
         except Exception as e:
             logging.error(f"검색량 예측 오류: {str(e)}")
+            record_fallback('empty_search_forecast')
             return json.dumps([])
     
-    def predict_success_probability(self, features_json):
-        """성공 확률 예측"""
+    def predict_search_volume_batch(self, batch_json):
+        """
+        여러 키워드 검색량 일괄 예측
+        
+        Args:
+            batch_json: {"features": [[...], ...], "horizon": 6, "seed": 42} 형태의 JSON 문자열
+                (seed 지정 시 무작위 변동이 재현 가능). features 대신 features_path로
+                float64 .npy 파일을 지정할 수 있으며, output_path를 지정하면 결과를
+                (3, N, H) [forecast, lower, upper] float64 .npy 파일로 기록
+        
+        Returns:
+            {"horizon": H, "forecast": [[...]], "lower": [[...]], "upper": [[...]]} 형태의
+            JSON 문자열 (행은 입력 특성 행 순서, 열은 1개월 후부터 H개월 후까지).
+            output_path 지정 시 {"horizon", "output_path", "shape", "dtype"}
+        """
         try:
-            features = json.loads(features_json)
-            features_array = np.array(features).reshape(1, -1)
+            data = self._parse_request(batch_json)
+            features_array = load_features(data)
+            horizon = int(data.get('horizon', 6))
             
-            # 성공 확률 예측
-            probability = float(self.models['success_probability'].predict_proba(features_array)[0][1])
+            if features_array.ndim != 2 or len(features_array) == 0:
+                return self._error_response('특성 행렬이 필요합니다.', 'features는 (키워드 수, 특성 수) 형태의 2차원 배열이어야 합니다.')
             
-            # 중요 요인 분석
-            feature_names = [
-                '검색량', '상품 수', '평균 가격', '경쟁도', '광고 비율', '브랜드 비율',
-                '3개월 성장률', '상승 추세', '마진율', 'CPC 대비 마진', '키워드 길이', '단어 수'
-            ]
+            model = self.models['search_volume_predictor']
+            with stage_timer('inference'):
+                base = model.predict(features_array)
+                forecast, lower, upper = self._forecast_horizons(base, horizon=horizon, seed=data.get('seed'))
             
-            # 더 많은 feature_names가 필요한 경우 추가
-            while len(feature_names) < len(features):
-                feature_names.append(f'특성_{len(feature_names)+1}')
-                
-            # feature_names를 features 크기에 맞게 자름
-            feature_names = feature_names[:len(features)]
-            
-            # 특성 중요도 계산
-            importances = self.models['success_probability'].feature_importances_
+            if data.get('output_path'):
+                with stage_timer('serialization'):
+                    output = save_array(data['output_path'], np.stack([forecast, lower, upper]))
+                return json.dumps({'horizon': horizon, **output}, ensure_ascii=False)
             
-            # 중요도 상위 5개 요인
-            important_indices = np.argsort(importances)[-5:][::-1]
+            return self._serialize({
+                'horizon': horizon,
+                'forecast': forecast.tolist(),
+                'lower': lower.tolist(),
+                'upper': upper.tolist()
+            })
+        except Exception as e:
+            logging.error(f"검색량 일괄 예측 오류: {str(e)}")
+            return self._error_response('검색량 일괄 예측 오류', str(e))
+    
+    def _forecast_horizons(self, base_predictions, horizon=6, seed=None):
+        """
+        기준 예측값을 월별 예측으로 확장
+        
+        추세(월 3% 증가), 계절성(sin 주기) 및 5% 무작위 변동을 한 번의 행렬 연산으로 적용합니다.
+        
+        Args:
+            base_predictions: (N,) 키워드별 기준 예측값
+            horizon: 예측 개월 수
+            seed: 무작위 변동 시드 (None이면 매번 다름)
+        
+        Returns:
+            (forecast, lower, upper) - 각각 (N, horizon) 배열
+        """
+        base = np.asarray(base_predictions, dtype=np.float64).reshape(-1, 1)
+        months = np.arange(horizon)
+        
+        trend_factor = 1 + months * 0.03  # 작은 증가 추세
+        seasonal_factor = 1 + 0.1 * np.sin(months * np.pi / 6)  # 계절적 변동
+        random_factor = 1 + np.random.default_rng(seed).standard_normal((len(base), horizon)) * 0.05  # 무작위성
+        
+        forecast = base * (trend_factor * seasonal_factor) * random_factor
+        return forecast, forecast * 0.9, forecast * 1.1
+    
+    def predict_success_probability(self, features_json):
+        """성공 확률 예측"""
+        try:
+            features = self._parse_request(features_json)
+            features_array = np.array(features).reshape(1, -1)
             
-            important_factors = [
-                {'factor': feature_names[i], 'importance': float(importances[i])}
-                for i in important_indices if i < len(feature_names)
-            ]
+            # 성공 확률 예측
+            model = self.models['success_probability']
+            with stage_timer('inference'):
+                probability = float(model.predict_proba(features_array)[0][1])
             
             result = {
                 'probability': probability,
                 'score': int(probability * 100),
-                'important_factors': important_factors
+                'important_factors': self._important_factors(len(features))
             }
             
-            return json.dumps(result)
+            return self._serialize(result)
         except Exception as e:
             logging.error(f"성공 확률 예측 오류: {str(e)}")
+            record_fallback('default_success_probability')
             return json.dumps({
                 'probability': 0.5,
                 'score': 50,
                 'important_factors': []
             })
+    
+    def predict_success_probability_batch(self, batch_json):
+        """
+        여러 키워드 성공 확률 일괄 예측
+        
+        Args:
+            batch_json: {"features": [[...], ...]} 형태의 JSON 문자열 ((N, 12) 특성 행렬).
+                features 대신 features_path로 float64 .npy 파일을 지정할 수 있으며,
+                output_path를 지정하면 (N,) 확률을 float64 .npy 파일로 기록
+        
+        Returns:
+            {"probabilities": [...], "scores": [...], "important_factors": [...]} 형태의
+            JSON 문자열 (중요 요인은 모델 전체 기준이므로 모든 행에 공통).
+            output_path 지정 시 {"important_factors", "output_path", "shape", "dtype"}
+        """
+        try:
+            data = self._parse_request(batch_json)
+            features_array = load_features(data)
+            
+            if features_array.ndim != 2 or len(features_array) == 0:
+                return self._error_response('특성 행렬이 필요합니다.', 'features는 (키워드 수, 특성 수) 형태의 2차원 배열이어야 합니다.')
+            
+            model = self.models['success_probability']
+            with stage_timer('inference'):
+                probabilities = model.predict_proba(features_array)[:, 1]
+            important_factors = self._important_factors(features_array.shape[1])
+            
+            if data.get('output_path'):
+                with stage_timer('serialization'):
+                    output = save_array(data['output_path'], probabilities)
+                return json.dumps({'important_factors': important_factors, **output}, ensure_ascii=False)
+            
+            return self._serialize({
+                'probabilities': probabilities.tolist(),
+                'scores': (probabilities * 100).astype(int).tolist(),
+                'important_factors': important_factors
+            })
+        except Exception as e:
+            logging.error(f"성공 확률 일괄 예측 오류: {str(e)}")
+            return self._error_response('성공 확률 일괄 예측 오류', str(e))
+    
+    def _important_factors(self, n_features):
+        """
+        중요도 상위 요인 목록
+        
+        Args:
+            n_features: 입력 특성 수 (이보다 뒤에 있는 특성은 제외)
+        
+        Returns:
+            [{"factor": 이름, "importance": 중요도}, ...] 목록
+        """
+        # 더 많은 특성 이름이 필요한 경우 추가
+        feature_names = SUCCESS_FEATURE_NAMES[:n_features]
+        feature_names += [f'특성_{i + 1}' for i in range(len(feature_names), n_features)]
+        
+        return [
+            {'factor': feature_names[i], 'importance': float(self.success_importances[i])}
+            for i in self.success_top_factors if i < n_features
+        ]
 
     def analyze_keyword_meaning(self, keyword_json):
         """키워드 의미 분석"""
         try:
             if not HAS_SEMANTIC_ANALYZER:
-                return json.dumps({
-                    'error': '의미 분석기를 사용할 수 없습니다.',
-                    'message': '의미 분석기 모듈이 로드되지 않았습니다.'
-                }, ensure_ascii=False)
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
                 
             # JSON에서 키워드 추출
-            data = json.loads(keyword_json)
+            data = self._parse_request(keyword_json)
             keyword = data.get('keyword', '')
             
             if not keyword:
-                return json.dumps({
-                    'error': '키워드가 필요합니다.',
-                    'message': '키워드를 입력하세요.'
-                }, ensure_ascii=False)
+                return self._error_response('키워드가 필요합니다.', '키워드를 입력하세요.')
             
             # 의미 분석 수행
-            analysis = analyze_keyword(keyword)
+            with stage_timer('inference'):
+                analysis = analyze_keyword(keyword)
             
-            return json.dumps(analysis, ensure_ascii=False)
+            return self._serialize(analysis)
         except Exception as e:
             logging.error(f"키워드 의미 분석 오류: {str(e)}")
-            return json.dumps({
-                'error': '의미 분석 오류',
-                'message': str(e)
-            }, ensure_ascii=False)
+            return self._error_response('의미 분석 오류', str(e))
+    
+    def iter_keywords_batch(self, batch_json):
+        """
+        여러 키워드 의미 분석 (스트리밍)
+        
+        Args:
+            batch_json: {"keywords": [...]} 또는 {"path": "키워드 파일"} 형태의 JSON 문자열,
+                선택적으로 batch_size, n_process 포함
+        
+        Yields:
+            키워드별 의미 분석 결과 딕셔너리
+        """
+        if not HAS_SEMANTIC_ANALYZER:
+            raise RuntimeError('의미 분석기 모듈이 로드되지 않았습니다.')
+            
+        data = self._parse_request(batch_json)
+        if data.get('path'):
+            keywords = iter_keywords_file(data['path'])
+        else:
+            keywords = data.get('keywords', [])
+            
+        yield from analyze_keywords_batch(
+            keywords,
+            batch_size=data.get('batch_size'),
+            n_process=data.get('n_process', 1)
+        )
+    
+    def analyze_keywords_batch(self, batch_json):
+        """여러 키워드 의미 분석 (output_path가 있으면 JSONL 파일로 기록)"""
+        try:
+            data = self._parse_request(batch_json)
+            output_path = data.get('output_path')
+            
+            if not output_path:
+                with stage_timer('inference'):
+                    analyses = list(self.iter_keywords_batch(batch_json))
+                return self._serialize(analyses)
+            
+            count = 0
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for analysis in self.iter_keywords_batch(batch_json):
+                    f.write(json.dumps(analysis, ensure_ascii=False) + '\n')
+                    count += 1
+                    
+            return json.dumps({'count': count, 'output_path': output_path}, ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"키워드 일괄 의미 분석 오류: {str(e)}")
+            return self._error_response('일괄 의미 분석 오류', str(e))
+    
+    def stream_command(self, command, data):
+        """
+        스트리밍 명령어 처리
+        
+        Args:
+            command: STREAMING_COMMANDS에 포함된 명령어
+            data: JSON 문자열 데이터
+        
+        Yields:
+            결과 항목 딕셔너리
+        """
+        if command == 'analyze_keywords_batch':
+            yield from self.iter_keywords_batch(data)
+        else:
+            raise ValueError(f'스트리밍을 지원하지 않는 명령어: {command}')
     
     def find_semantic_related(self, keyword_json):
         """의미적 연관 키워드 찾기"""
         try:
             if not HAS_SEMANTIC_ANALYZER:
-                return json.dumps({
-                    'error': '의미 분석기를 사용할 수 없습니다.',
-                    'message': '의미 분석기 모듈이 로드되지 않았습니다.'
-                }, ensure_ascii=False)
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
                 
             # JSON에서 키워드와 옵션 추출
-            data = json.loads(keyword_json)
+            data = self._parse_request(keyword_json)
             keyword = data.get('keyword', '')
             limit = data.get('limit', 20)
             
             if not keyword:
-                return json.dumps({
-                    'error': '키워드가 필요합니다.',
-                    'message': '키워드를 입력하세요.'
-                }, ensure_ascii=False)
+                return self._error_response('키워드가 필요합니다.', '키워드를 입력하세요.')
             
             # 연관 키워드 찾기
-            related = find_related_keywords(keyword, limit=limit)
+            with stage_timer('inference'):
+                related = find_related_keywords(keyword, limit=limit)
             
-            return json.dumps(related, ensure_ascii=False)
+            return self._serialize(related)
         except Exception as e:
             logging.error(f"의미적 연관 키워드 찾기 오류: {str(e)}")
-            return json.dumps({
-                'error': '연관 키워드 찾기 오류',
-                'message': str(e)
-            }, ensure_ascii=False)
+            return self._error_response('연관 키워드 찾기 오류', str(e))
     
     def identify_market_segments(self, keyword_json):
         """시장 세그먼트 식별"""
         try:
             if not HAS_SEMANTIC_ANALYZER:
-                return json.dumps({
-                    'error': '의미 분석기를 사용할 수 없습니다.',
-                    'message': '의미 분석기 모듈이 로드되지 않았습니다.'
-                }, ensure_ascii=False)
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
                 
             # JSON에서 키워드 추출
-            data = json.loads(keyword_json)
+            data = self._parse_request(keyword_json)
             keyword = data.get('keyword', '')
             
             if not keyword:
-                return json.dumps({
-                    'error': '키워드가 필요합니다.',
-                    'message': '키워드를 입력하세요.'
-                }, ensure_ascii=False)
+                return self._error_response('키워드가 필요합니다.', '키워드를 입력하세요.')
             
-            # 세그먼트 식별
-            segments = identify_segments(keyword)
+            # 세그먼트 식별 (카테고리 세그먼트 모델이 있으면 재군집화 없이 배정)
+            with stage_timer('inference'):
+                segments = identify_segments(keyword, category=data.get('category'))
             
-            return json.dumps(segments, ensure_ascii=False)
+            return self._serialize(segments)
         except Exception as e:
             logging.error(f"시장 세그먼트 식별 오류: {str(e)}")
+            return self._error_response('세그먼트 식별 오류', str(e))
+    
+    def segment_keywords(self, options_json):
+        """
+        카테고리 등 대량 키워드 목록 세그먼트 분할
+        
+        Args:
+            options_json: {"keywords": [...] 또는 "keywords_file": 경로, "n_clusters", "k_min", "k_max",
+                          "max_keywords_per_segment", "seed"} 형태의 JSON 문자열
+        
+        Returns:
+            {"k", "silhouette_scores", "segments", "keywords", "vectorized"} 형태의 JSON 문자열
+        """
+        try:
+            if not HAS_SEMANTIC_ANALYZER:
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
+                
+            data = self._parse_request(options_json)
+            if data.get('keywords_file'):
+                keywords = list(iter_keywords_file(data['keywords_file']))
+            else:
+                keywords = data.get('keywords', [])
+                
+            if not keywords:
+                return self._error_response('키워드 목록이 필요합니다.', 'keywords 또는 keywords_file을 입력하세요.')
+            
+            with stage_timer('inference'):
+                result = segment_keywords(
+                    keywords,
+                    n_clusters=data.get('n_clusters'),
+                    k_values=range(int(data.get('k_min', 2)), int(data.get('k_max', 8)) + 1),
+                    max_keywords_per_segment=data.get('max_keywords_per_segment', 100),
+                    seed=data.get('seed', 42)
+                )
+            
+            return self._serialize(result)
+        except Exception as e:
+            logging.error(f"키워드 세그먼트 분할 오류: {str(e)}")
+            return self._error_response('세그먼트 분할 오류', str(e))
+    
+    def fit_segment_model(self, options_json):
+        """
+        카테고리 세그먼트 모델 학습 후 저장 (models/segments)
+        
+        Args:
+            options_json: {"category", "keywords": [...] 또는 "keywords_file": 경로, "n_clusters",
+                          "k_min", "k_max", "seed"} 형태의 JSON 문자열
+        
+        Returns:
+            {"category", "k", "segments", "keywords", "vectorized"} 형태의 JSON 문자열
+        """
+        try:
+            if not HAS_SEMANTIC_ANALYZER:
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
+                
+            data = self._parse_request(options_json)
+            category = data.get('category', '')
+            if data.get('keywords_file'):
+                keywords = list(iter_keywords_file(data['keywords_file']))
+            else:
+                keywords = data.get('keywords', [])
+                
+            if not category or not keywords:
+                return self._error_response('카테고리와 키워드 목록이 필요합니다.', 'category와 keywords 또는 keywords_file을 입력하세요.')
+            
+            with stage_timer('inference'):
+                result = fit_segment_model(
+                    category,
+                    keywords,
+                    n_clusters=data.get('n_clusters'),
+                    k_values=range(int(data.get('k_min', 2)), int(data.get('k_max', 8)) + 1),
+                    seed=data.get('seed', 42)
+                )
+            
+            return self._serialize(result)
+        except Exception as e:
+            logging.error(f"세그먼트 모델 학습 오류: {str(e)}")
+            return self._error_response('세그먼트 모델 학습 오류', str(e))
+    
+    def assign_segments(self, options_json):
+        """
+        저장된 카테고리 세그먼트 모델로 새 키워드 배정
+        
+        Args:
+            options_json: {"category", "keywords": [...], "update": true} 형태의 JSON 문자열
+                          (update가 true면 배정한 키워드를 백그라운드 모델 갱신에 반영)
+        
+        Returns:
+            키워드별 {"keyword", "segment_id", "label", "distance"} 목록 JSON 문자열
+        """
+        try:
+            if not HAS_SEMANTIC_ANALYZER:
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
+                
+            data = self._parse_request(options_json)
+            category = data.get('category', '')
+            keywords = data.get('keywords', [])
+            
+            if not category or not keywords:
+                return self._error_response('카테고리와 키워드 목록이 필요합니다.', 'category와 keywords를 입력하세요.')
+            
+            with stage_timer('inference'):
+                result = assign_segments(category, keywords, update=data.get('update', True))
+            
+            return self._serialize(result)
+        except Exception as e:
+            logging.error(f"세그먼트 배정 오류: {str(e)}")
+            return self._error_response('세그먼트 배정 오류', str(e))
+    
+    def rebuild_semantic_index(self, options_json):
+        """연관 키워드 검색용 이웃 인덱스 재구축"""
+        try:
+            if not HAS_SEMANTIC_ANALYZER:
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
+                
+            options = self._parse_request(options_json)
+            allowed = ('exact_threshold', 'n_lists', 'n_probe', 'recall_queries', 'k', 'seed')
+            result = rebuild_semantic_index(**{key: options[key] for key in allowed if key in options})
+            
+            return json.dumps(result, ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"이웃 인덱스 재구축 오류: {str(e)}")
+            return self._error_response('인덱스 재구축 오류', str(e))
+    
+    def cache_stats(self, options_json):
+        """의미 분석 결과 캐시와 명사 추출 캐시 통계 (clear 옵션 지정 시 결과 캐시 비우기)"""
+        try:
+            if not HAS_SEMANTIC_ANALYZER:
+                return self._error_response('의미 분석기를 사용할 수 없습니다.', '의미 분석기 모듈이 로드되지 않았습니다.')
+                
+            options = self._parse_request(options_json)
+            cache = get_result_cache()
+            if options.get('clear'):
+                cache.clear()
+                
+            result = cache.stats()
+            result['noun_extractor'] = self.semantic_analyzer.noun_extractor.stats()
+            return json.dumps(result, ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"캐시 통계 오류: {str(e)}")
+            return self._error_response('캐시 통계 오류', str(e))
+    
+    def model_status(self, _data=None):
+        """모델 아티팩트 버전/체크섬/로드 상태"""
+        try:
+            return json.dumps(self.models.verify(), ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"모델 상태 확인 오류: {str(e)}")
+            return self._error_response('모델 상태 확인 오류', str(e))
+    
+    def compile_models(self, options_json):
+        """
+        랜덤 포레스트 모델을 평평한 노드 배열(<이름>.forest.npz)로 컴파일
+        
+        Args:
+            options_json: {"models": [모델 이름, ...]} 형태의 JSON 문자열 (기본값: 전체)
+        
+        Returns:
+            {모델 이름: {"match", "max_abs_diff", "nodes", "trees", "saved", ...}} 형태의 JSON 문자열
+            (원본 scikit-learn 예측과 일치할 때만 저장)
+        """
+        try:
+            options = self._parse_request(options_json)
+            names = options.get('models') or list(self.MODEL_NAMES)
+            
+            result = {}
+            for name in names:
+                try:
+                    result[name] = self.models.compile(name)
+                except Exception as e:
+                    logging.error(f"모델 컴파일 오류 ({name}): {str(e)}")
+                    result[name] = {'saved': False, 'error': str(e)}
+                    
+            return json.dumps(result, ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"모델 컴파일 오류: {str(e)}")
+            return self._error_response('모델 컴파일 오류', str(e))
+    
+    def stats(self, options_json):
+        """
+        명령어별 처리 단계 소요 시간과 오류/대체 결과 카운터
+        
+        Args:
+            options_json: {"format": "json" | "prometheus", "reset": false} 형태의 JSON 문자열
+        
+        Returns:
+            JSON 형식은 {"uptime_seconds", "commands", "counters"}, Prometheus 형식은
+            {"format": "prometheus", "text": 텍스트 노출 형식} JSON 문자열
+        """
+        try:
+            options = json.loads(options_json) if options_json else {}
+            if options.get('format') == 'prometheus':
+                result = {'format': 'prometheus', 'text': METRICS.to_prometheus({'pid': os.getpid()})}
+            else:
+                result = METRICS.snapshot()
+                
+            if options.get('reset'):
+                METRICS.reset()
+                
+            return json.dumps(result, ensure_ascii=False)
+        except Exception as e:
+            logging.error(f"지표 조회 오류: {str(e)}")
             return json.dumps({
-                'error': '세그먼트 식별 오류',
+                'error': '지표 조회 오류',
                 'message': str(e)
             }, ensure_ascii=False)
     
+    def _error_response(self, error, message=None):
+        """
+        오류 응답 JSON 생성 (현재 명령어의 오류 수 증가)
+        
+        Args:
+            error: 오류 요약
+            message: 상세 메시지 (선택)
+        
+        Returns:
+            {"error", "message"} 형태의 JSON 문자열
+        """
+        METRICS.record_error()
+        response = {'error': error}
+        if message is not None:
+            response['message'] = message
+        return json.dumps(response, ensure_ascii=False)
+    
+    def _parse_request(self, data_json):
+        """요청 데이터 파싱 (parse 단계 시간 기록, 비어 있으면 빈 딕셔너리)"""
+        if not data_json:
+            return {}
+        with stage_timer('parse'):
+            return json.loads(data_json)
+    
+    def _serialize(self, result):
+        """응답 직렬화 (serialization 단계 시간 기록)"""
+        with stage_timer('serialization'):
+            return json.dumps(result, ensure_ascii=False)
+    
     def process_command(self, command, data):
-        """명령어 처리"""
+        """명령어 처리 (명령어별 요청 수, 오류 수, 전체 소요 시간 기록)"""
+        # 지표 조회 자체는 기록하지 않음
+        if command == 'stats':
+            return self.stats(data)
+        
+        # 명령어 처리기는 예외 대신 _error_response로 오류 JSON을 돌려주며 이때 오류 수가 기록됨
+        with METRICS.command(command):
+            return self._dispatch_command(command, data)
+    
+    def _dispatch_command(self, command, data):
+        """명령어 처리기 호출"""
         if command == 'predict_search_volume':
             return self.predict_search_volume(data)
+        elif command == 'predict_search_volume_batch':
+            return self.predict_search_volume_batch(data)
         elif command == 'predict_success_probability':
             return self.predict_success_probability(data)
+        elif command == 'predict_success_probability_batch':
+            return self.predict_success_probability_batch(data)
         elif command == 'analyze_keyword_meaning':
             return self.analyze_keyword_meaning(data)
         elif command == 'find_semantic_related':
             return self.find_semantic_related(data)
         elif command == 'identify_market_segments':
             return self.identify_market_segments(data)
+        elif command == 'analyze_keywords_batch':
+            return self.analyze_keywords_batch(data)
+        elif command == 'segment_keywords':
+            return self.segment_keywords(data)
+        elif command == 'fit_segment_model':
+            return self.fit_segment_model(data)
+        elif command == 'assign_segments':
+            return self.assign_segments(data)
+        elif command == 'rebuild_semantic_index':
+            return self.rebuild_semantic_index(data)
+        elif command == 'cache_stats':
+            return self.cache_stats(data)
+        elif command == 'model_status':
+            return self.model_status(data)
+        elif command == 'compile_models':
+            return self.compile_models(data)
         else:
-            return json.dumps({'error': f'알 수 없는 명령어: {command}'})
+            return self._error_response(f'알 수 없는 명령어: {command}')
+
+def handle_request(bridge, line, write):
+    """
+    상주 모드의 요청 한 줄 처리
+
+    일반 명령어는 {"id": ..., "result": ...} 한 줄로 응답합니다. 스트리밍 명령어는
+    결과 항목마다 {"id": ..., "chunk": ...} 줄을 보낸 뒤 {"id": ..., "result": {"count": N}}로
+    끝냅니다. 오류는 {"id": ..., "error": ...}로 응답합니다.
+
+    Args:
+        bridge: MachineLearningBridge 인스턴스
+        line: {"id": ..., "command": ..., "data": ...} 형태의 JSON 문자열
+        write: 응답 한 줄(JSON 문자열)을 기록하는 함수
+    """
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        write(json.dumps({'id': None, 'error': f'잘못된 요청 형식: {e}'}, ensure_ascii=False))
+        return
+
+    request_id = request.get('id')
+    encoded_id = json.dumps(request_id)
+    command = request.get('command')
+    if not command:
+        write(json.dumps({'id': request_id, 'error': '명령어가 필요합니다.'}, ensure_ascii=False))
+        return
+
+    # process_command는 JSON 문자열 데이터를 받으므로 객체는 다시 직렬화
+    data = request.get('data', {})
+    if not isinstance(data, str):
+        data = json.dumps(data, ensure_ascii=False)
+
+    try:
+        if command in bridge.STREAMING_COMMANDS and request.get('stream', True):
+            count = 0
+            with METRICS.command(command):
+                for item in bridge.stream_command(command, data):
+                    with stage_timer('serialization'):
+                        chunk = json.dumps(item, ensure_ascii=False)
+                    write('{"id": %s, "chunk": %s}' % (encoded_id, chunk))
+                    count += 1
+            write('{"id": %s, "result": {"count": %d}}' % (encoded_id, count))
+            return
+
+        result = bridge.process_command(command, data)
+    except Exception as e:
+        logging.error(f"명령어 처리 오류 ({command}): {str(e)}")
+        write(json.dumps({'id': request_id, 'error': str(e)}, ensure_ascii=False))
+        return
+
+    # 결과는 이미 JSON 문자열이므로 다시 파싱하지 않고 그대로 감싼다
+    write('{"id": %s, "result": %s}' % (encoded_id, result))
+
+def serve_stdio(bridge):
+    """표준 입출력 기반 상주 모드 (줄 단위 JSON 요청/응답)"""
+    def write(response):
+        sys.stdout.write(response + '\n')
+
+    write(json.dumps({'id': None, 'event': 'ready'}))
+    sys.stdout.flush()
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        handle_request(bridge, line, write)
+        sys.stdout.flush()
+
+def serve_socket(bridge, socket_path):
+    """Unix 소켓 기반 상주 모드 (연결마다 줄 단위 JSON 요청/응답)"""
+    bridge_lock = threading.Lock()
+
+    class BridgeRequestHandler(socketserver.StreamRequestHandler):
+        wbufsize = 1 << 16  # 스트리밍 응답은 요청 단위로 flush
+        def handle(self):
+            def write(response):
+                self.wfile.write((response + '\n').encode('utf-8'))
+
+            for raw_line in self.rfile:
+                line = raw_line.decode('utf-8').strip()
+                if not line:
+                    continue
+                with bridge_lock:
+                    handle_request(bridge, line, write)
+                self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, BridgeRequestHandler) as server:
+        server.daemon_threads = True
+        logging.info(f"ML 브릿지 소켓 대기 중: {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+def serve_main(argv):
+    """상주 모드 진입점"""
+    parser = argparse.ArgumentParser(description='ML 브릿지 상주 모드')
+    parser.add_argument('--socket', help='표준 입출력 대신 사용할 Unix 소켓 경로')
+    parser.add_argument('--no-warmup', action='store_true', help='의미 분석기 사전 로드 생략')
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('ML_BRIDGE_WORKERS') or os.cpu_count() or 1),
+                        help='워커 프로세스 수 (1이면 현재 프로세스에서 직접 처리, 기본값: CPU 코어 수)')
+    parser.add_argument('--semantic-workers', type=int,
+                        default=int(os.environ.get('ML_BRIDGE_SEMANTIC_WORKERS') or 0) or None,
+                        help='의미 분석(spaCy) 워커 수 (기본값: 전체의 1/4)')
+    parser.add_argument('--max-inflight', type=int,
+                        default=int(os.environ.get('ML_BRIDGE_MAX_INFLIGHT') or 0) or None,
+                        help='처리 중 요청 수 한도 (초과 시 과부하 오류, 기본값: 워커 수 x 8)')
+    parser.add_argument('--broadcast-timeout', type=float,
+                        default=float(os.environ.get('ML_BRIDGE_BROADCAST_TIMEOUT') or BROADCAST_TIMEOUT_SECONDS),
+                        help='stats/cache_stats/model_status 워커 응답 대기 시간(초, 지나면 응답한 워커 결과만 반환)')
+    args = parser.parse_args(argv)
+
+    if args.workers > 1:
+        pool = BridgePool(
+            os.path.abspath(__file__),
+            workers=args.workers,
+            semantic_workers=args.semantic_workers,
+            max_inflight=args.max_inflight,
+            warmup=not args.no_warmup,
+            broadcast_timeout=args.broadcast_timeout
+        )
+        pool.start()
+        if args.socket:
+            serve_pool_socket(pool, args.socket)
+        else:
+            serve_pool_stdio(pool)
+        return
+
+    bridge = MachineLearningBridge()
+    if not args.no_warmup:
+        bridge.warmup()
+    logging.info("ML 브릿지 상주 모드 시작")
+
+    if args.socket:
+        serve_socket(bridge, args.socket)
+    else:
+        serve_stdio(bridge)
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--serve':
+        serve_main(sys.argv[2:])
+        return
+
     if len(sys.argv) < 3:
         print(json.dumps({'error': '명령어와 데이터가 필요합니다.'}))
         sys.exit(1)
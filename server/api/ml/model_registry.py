@@ -0,0 +1,397 @@
+"""
+모델 아티팩트 레지스트리 모듈
+
+MODEL_DIR의 모델 파일을 처음 사용할 때 로드하고, 버전/체크섬 메타데이터를
+manifest.json에 기록해 재학습 없이도 오래되거나 바뀐 아티팩트를 감지합니다.
+시작 시에는 파일 정보(크기/수정 시각)만 비교하고, 체크섬은 파일 버전마다 한 번
+(모델 로드 또는 상태 조회 시)만 계산합니다.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import warnings
+import joblib
+import numpy as np
+
+from forest_compiler import COMPILED_SUFFIX, CompiledForest, compile_model
+from bridge_metrics import record_stage
+
+try:
+    import sklearn
+    from sklearn.exceptions import InconsistentVersionWarning
+    SKLEARN_VERSION = sklearn.__version__
+except ImportError:
+    InconsistentVersionWarning = None
+    SKLEARN_VERSION = None
+
+MANIFEST_FILE = 'manifest.json'
+
+class ModelNotAvailableError(FileNotFoundError):
+    """모델 파일이 없음 (브릿지는 요청 중 학습하지 않으므로 train_models.py로 사전 학습 필요)"""
+
+def file_checksum(path):
+    """파일 SHA-256 체크섬"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ModelRegistry:
+    """
+    모델 레지스트리 클래스
+
+    `registry[name]`으로 모델에 접근하면 처음 한 번만 `<name>.pkl`을 로드하고, 이후에는
+    refresh_interval마다 파일 정보(stat)만 확인해 다른 프로세스가 재학습하거나 컴파일한
+    아티팩트를 다시 로드합니다.
+    배열 위주의 아티팩트는 joblib.load(mmap_mode='r')로 로드해 여러 브릿지
+    프로세스가 같은 페이지를 공유합니다. 원본과 체크섬이 일치하는 `<name>.forest.npz`
+    컴파일 결과가 있으면 scikit-learn 모델 대신 CompiledForest를 사용합니다.
+    """
+
+    def __init__(self, model_dir, model_names, mmap_mode='r', on_load=None, compiled=True, n_jobs=1,
+                 refresh_interval=2.0):
+        """
+        초기화
+
+        Args:
+            model_dir: 모델 디렉토리
+            model_names: 관리할 모델 이름 목록
+            mmap_mode: joblib.load 메모리 매핑 모드 (None이면 전체 로드)
+            on_load: {모델 이름: 로드 직후 호출할 함수(model)}
+            compiled: 컴파일된 트리 앙상블이 있으면 사용할지 여부
+            n_jobs: 로드한 scikit-learn 모델의 예측 병렬 작업 수 (None이면 피클에 저장된 설정 유지)
+            refresh_interval: 로드한 모델의 파일 변경 확인 간격(초)
+        """
+        self.model_dir = model_dir
+        self.model_names = list(model_names)
+        self.mmap_mode = mmap_mode
+        self.on_load = on_load or {}
+        self.compiled = compiled
+        self.n_jobs = n_jobs
+        self.refresh_interval = refresh_interval
+        self.manifest_path = os.path.join(model_dir, MANIFEST_FILE)
+
+        self._models = {}
+        self._status = {}
+        self._signatures = {}
+        self._checked_at = {}
+        self._checksums = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __contains__(self, name):
+        return name in self.model_names
+
+    def path(self, name):
+        """모델 파일 경로"""
+        return os.path.join(self.model_dir, f'{name}.pkl')
+
+    def compiled_path(self, name):
+        """컴파일된 트리 앙상블 파일 경로"""
+        return os.path.join(self.model_dir, f'{name}{COMPILED_SUFFIX}')
+
+    @property
+    def loaded(self):
+        """로드된 모델 이름 목록"""
+        return list(self._models.keys())
+
+    def get(self, name):
+        """
+        모델 가져오기 (처음 호출 시 로드)
+
+        Args:
+            name: 모델 이름
+
+        Returns:
+            로드된 모델
+        """
+        model = self._models.get(name)
+        if model is not None and not self._artifact_changed(name):
+            return model
+
+        with self._lock:
+            current = self._models.get(name)
+            if current is not None and current is not model:
+                # 다른 스레드가 먼저 (다시) 로드함
+                return current
+            signature = self._artifact_signature(name)
+            self._models[name] = self._load(name)
+            self._signatures[name] = signature
+            self._checked_at[name] = time.monotonic()
+            return self._models[name]
+
+    def _artifact_signature(self, name):
+        """모델 파일과 컴파일 결과 파일의 (inode, 수정 시각, 크기)"""
+        signature = []
+        for path in (self.path(name), self.compiled_path(name)):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _artifact_changed(self, name):
+        """로드 이후 아티팩트 파일이 바뀌었는지 확인 (refresh_interval마다 stat만 수행)"""
+        now = time.monotonic()
+        if now - self._checked_at.get(name, 0.0) < self.refresh_interval:
+            return False
+        self._checked_at[name] = now
+        if self._artifact_signature(name) == self._signatures.get(name):
+            return False
+        logging.info(f"모델 아티팩트 변경 감지, 다시 로드: {name}")
+        return True
+
+    def _load(self, name):
+        """모델 파일 로드 및 메타데이터 확인"""
+        if name not in self.model_names:
+            raise KeyError(f'등록되지 않은 모델: {name}')
+
+        path = self.path(name)
+        if not os.path.exists(path):
+            raise ModelNotAvailableError(
+                f'모델 파일이 없습니다: {path} (python3 train_models.py로 먼저 학습하세요)'
+            )
+
+        status = self.check(name)
+        start = time.perf_counter()
+
+        if self.compiled and status['compiled']:
+            model = CompiledForest.load(self.compiled_path(name))
+            status['loaded'] = True
+            status['load_seconds'] = time.perf_counter() - start
+            self._status[name] = status
+            record_stage('model_load', status['load_seconds'])
+            logging.info(f"컴파일된 모델 로드 완료: {name} ({status['load_seconds'] * 1000:.1f}ms)")
+            return self._after_load(name, model)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            model = joblib.load(path, mmap_mode=self.mmap_mode)
+
+        # 다른 scikit-learn 버전에서 저장된 모델은 재학습 없이 오래된 아티팩트로 표시
+        for warning in caught:
+            if InconsistentVersionWarning is not None and issubclass(warning.category, InconsistentVersionWarning):
+                reason = f'scikit-learn 버전 불일치 ({warning.message.original_sklearn_version} -> {SKLEARN_VERSION})'
+                status['stale'] = True
+                if reason not in status['reasons']:
+                    status['reasons'].append(reason)
+            else:
+                warnings.showwarning(warning.message, warning.category, warning.filename, warning.lineno)
+
+        if self.n_jobs is not None and hasattr(model, 'n_jobs'):
+            model.n_jobs = self.n_jobs
+
+        status['loaded'] = True
+        status['compiled'] = False
+        status['load_seconds'] = time.perf_counter() - start
+        self._status[name] = status
+        record_stage('model_load', status['load_seconds'])
+
+        if status['stale']:
+            logging.warning(f"오래된 모델 아티팩트: {name} - {', '.join(status['reasons'])}")
+        logging.info(f"모델 로드 완료: {name} ({status['load_seconds'] * 1000:.1f}ms)")
+        return self._after_load(name, model)
+
+    def _after_load(self, name, model):
+        """로드 직후 훅 호출"""
+        hook = self.on_load.get(name)
+        if hook is not None:
+            hook(model)
+        return model
+
+    def compile(self, name):
+        """
+        원본 모델을 평평한 노드 배열로 컴파일해 `<name>.forest.npz`로 저장
+
+        원본과 예측이 일치할 때만 저장하며, 이미 로드된 모델은 다음 사용 시
+        컴파일 결과로 다시 로드됩니다.
+
+        Args:
+            name: 모델 이름
+
+        Returns:
+            compile_model 결과 딕셔너리
+        """
+        if name not in self.model_names:
+            raise KeyError(f'등록되지 않은 모델: {name}')
+
+        path = self.path(name)
+        if not os.path.exists(path):
+            raise ModelNotAvailableError(
+                f'모델 파일이 없습니다: {path} (python3 train_models.py로 먼저 학습하세요)'
+            )
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = joblib.load(path)
+        result = compile_model(model, self.compiled_path(name), source_sha256=self.checksum(name))
+
+        if result['saved']:
+            with self._lock:
+                self._models.pop(name, None)
+                self._status.pop(name, None)
+        else:
+            logging.warning(f"컴파일 결과 불일치로 저장하지 않음: {name} (최대 오차 {result['max_abs_diff']})")
+        return result
+
+    def read_manifest(self):
+        """manifest.json 읽기 (없으면 빈 딕셔너리)"""
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def record(self, name, version=None, **extra):
+        """
+        모델 파일의 메타데이터를 manifest.json에 기록
+
+        Args:
+            name: 모델 이름
+            version: 모델 버전 문자열 (기본값: 기록 시각)
+            **extra: 함께 기록할 추가 메타데이터 (학습 데이터 정보 등)
+
+        Returns:
+            기록된 메타데이터 딕셔너리
+        """
+        stat = os.stat(self.path(name))
+        entry = {
+            'version': version or time.strftime('%Y%m%d%H%M%S'),
+            'sha256': self.checksum(name),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sklearn_version': SKLEARN_VERSION,
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%S')
+        }
+        entry.update(extra)
+
+        with self._lock:
+            manifest = self.read_manifest()
+            manifest[name] = entry
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        return entry
+
+    def checksum(self, name):
+        """
+        모델 파일 SHA-256 체크섬 (파일이 바뀌지 않았으면 이전 계산 결과 재사용)
+
+        Args:
+            name: 모델 이름
+
+        Returns:
+            체크섬 16진수 문자열
+        """
+        path = self.path(name)
+        stat = os.stat(path)
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        cached = self._checksums.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        checksum = file_checksum(path)
+        self._checksums[name] = (signature, checksum)
+        return checksum
+
+    def check(self, name, deep=True):
+        """
+        모델 파일과 manifest 기록 비교
+
+        Args:
+            name: 모델 이름
+            deep: True면 체크섬까지 비교, False면 파일 크기/수정 시각만 비교
+                (컴파일 결과도 존재 여부만 확인)
+
+        Returns:
+            {"exists", "stale", "reasons", "version", ...} 상태 딕셔너리
+        """
+        path = self.path(name)
+        entry = self.read_manifest().get(name)
+        status = {
+            'name': name,
+            'exists': os.path.exists(path),
+            'loaded': name in self._models,
+            'registered': entry is not None,
+            'stale': False,
+            'reasons': [],
+            'version': entry.get('version') if entry else None,
+            'compiled': False
+        }
+
+        if not status['exists']:
+            status['stale'] = True
+            status['reasons'].append('모델 파일 없음')
+            return status
+
+        if deep:
+            checksum = self.checksum(name)
+            status['compiled'] = self._compiled_matches(name, checksum)
+        else:
+            status['compiled'] = os.path.exists(self.compiled_path(name))
+
+        if entry is None:
+            # 출처를 알 수 없는 아티팩트는 표시만 하고 로드는 허용
+            status['reasons'].append('manifest 기록 없음')
+        else:
+            if deep:
+                if checksum != entry.get('sha256'):
+                    status['stale'] = True
+                    status['reasons'].append('체크섬 불일치')
+            else:
+                stat = os.stat(path)
+                # mtime_ns가 없는 이전 manifest 기록은 크기만 비교
+                if stat.st_size != entry.get('size') or \
+                        entry.get('mtime_ns', stat.st_mtime_ns) != stat.st_mtime_ns:
+                    status['stale'] = True
+                    status['reasons'].append('파일 크기/수정 시각 불일치')
+            if entry.get('sklearn_version') and entry['sklearn_version'] != SKLEARN_VERSION:
+                status['stale'] = True
+                status['reasons'].append(
+                    f"scikit-learn 버전 불일치 ({entry['sklearn_version']} -> {SKLEARN_VERSION})"
+                )
+        return status
+
+    def _compiled_matches(self, name, checksum):
+        """컴파일 결과가 현재 원본 모델 파일에서 만들어졌는지 확인"""
+        compiled_path = self.compiled_path(name)
+        if not os.path.exists(compiled_path):
+            return False
+        try:
+            with np.load(compiled_path, allow_pickle=False) as data:
+                return str(data['source_sha256']) == checksum
+        except Exception as e:
+            logging.warning(f"컴파일된 모델 확인 오류: {name} - {str(e)}")
+            return False
+
+    def verify(self, deep=True):
+        """
+        모든 모델 상태 확인 (모델을 로드하지 않음)
+
+        Args:
+            deep: True면 체크섬까지 비교, False면 파일 정보(stat)만 비교
+
+        Returns:
+            {모델 이름: 상태 딕셔너리}
+        """
+        result = {}
+        for name in self.model_names:
+            status = self.check(name, deep=deep)
+            # 로드 중 감지한 정보(버전 경고 등)가 있으면 함께 반영
+            loaded_status = self._status.get(name)
+            if loaded_status:
+                for reason in loaded_status['reasons']:
+                    if reason not in status['reasons']:
+                        status['reasons'].append(reason)
+                status['stale'] = status['stale'] or loaded_status['stale']
+                status['load_seconds'] = loaded_status.get('load_seconds')
+                status['compiled'] = loaded_status['compiled']
+            result[name] = status
+        return result
@@ -0,0 +1,461 @@
+"""
+명사 추출 모듈
+
+키워드별 명사 추출 결과를 캐시하고, 1~4어절 쇼핑 검색어는 spaCy 파이프라인 대신
+어절 사전으로 명사를 판별합니다. 어절 사전은 spaCy가 태깅한 결과에서 어절별 품사 빈도를
+학습해 만들며, 사전으로 판별할 수 없는 어절이 있는 키워드만 spaCy로 처리합니다.
+
+어절 판별 순서:
+    1. 사전에 있는 어절: 관측 횟수와 품사 일치율이 기준 이상이면 다수 품사 사용
+    2. 명사 + 조사: 조사를 떼어낸 어간이 사전의 명사면 명사
+    3. 복합 명사: 어절 전체가 사전의 2음절 이상 명사로 나뉘면 명사
+
+사용 예:
+    python3 noun_extractor.py --keywords-file keywords.jsonl --evaluate --save
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+
+# 기본 어절 사전 저장 디렉토리
+NOUN_LEXICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'nouns')
+
+# 빠른 경로를 적용하는 최대 어절 수
+FAST_PATH_MAX_WORDS = 4
+
+# 어절 사전 판별 기준 (최소 관측 횟수, 다수 품사 비율)
+MIN_TOKEN_OBSERVATIONS = 2
+MIN_TOKEN_AGREEMENT = 0.9
+
+# 명사 추출 결과 캐시 최대 키워드 수
+NOUN_CACHE_SIZE = 200000
+
+# 이 수만큼 새로 관측하면 어절 사전을 백그라운드에서 저장
+AUTOSAVE_OBSERVATIONS = 2000
+
+# 체언 뒤에 붙는 조사 (긴 것부터 검사)
+PARTICLES = tuple(sorted((
+    '에서부터', '으로부터', '에게서', '한테서', '이라도', '에서', '에게', '한테', '으로', '까지',
+    '부터', '처럼', '보다', '이랑', '라도', '이나', '마다', '은', '는', '이', '가', '을', '를',
+    '의', '에', '로', '와', '과', '도', '만', '랑', '나'
+), key=len, reverse=True))
+
+# spaCy 토크나이저가 어절을 더 나누지 않는 단순 어절 (한글/영문/숫자만)
+SIMPLE_TOKEN_PATTERN = re.compile(r'^[0-9A-Za-z가-힣]+$')
+
+NOUN_POS = 'NOUN'
+
+class NounExtractor:
+    """
+    명사 추출기
+
+    spaCy Doc에서 얻은 명사는 키워드별로 캐시하고 어절별 품사 빈도를 학습합니다.
+    여러 스레드에서 동시에 호출할 수 있습니다.
+    """
+
+    def __init__(self, nlp, model_key, lexicon_dir=None, cache_size=NOUN_CACHE_SIZE,
+                 max_words=FAST_PATH_MAX_WORDS, disable=(), autosave=True):
+        """
+        초기화
+
+        Args:
+            nlp: spaCy 파이프라인 (사전으로 판별할 수 없는 키워드 처리용)
+            model_key: 파이프라인 식별자 (모델 이름/버전, 어절 사전 파일 이름)
+            lexicon_dir: 어절 사전 저장 디렉토리 (기본값: NOUN_LEXICON_DIR)
+            cache_size: 명사 추출 결과 캐시 최대 키워드 수
+            max_words: 빠른 경로를 적용하는 최대 어절 수 (0이면 빠른 경로 사용 안 함)
+            disable: nlp.pipe에서 비활성화할 컴포넌트 목록
+            autosave: 새 관측이 쌓이면 어절 사전을 자동 저장할지 여부
+        """
+        self.nlp = nlp
+        self.model_key = model_key
+        self.lexicon_path = os.path.join(
+            lexicon_dir or NOUN_LEXICON_DIR,
+            re.sub(r'[^0-9A-Za-z._-]+', '_', model_key) + '.json'
+        )
+        self.cache_size = cache_size
+        self.max_words = max_words
+        self.disable = list(disable)
+        self.autosave = autosave
+
+        # 어절 -> [명사 관측 수, 기타 품사 관측 수]
+        self._tokens = {}
+        self._nouns = set()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._saving = False
+
+        self.cache_hits = 0
+        self.fast_path = 0
+        self.fallbacks = 0
+
+        self.load()
+
+    def extract(self, keyword):
+        """
+        키워드 명사 추출
+
+        Args:
+            keyword: 키워드 문자열
+
+        Returns:
+            명사 목록 (spaCy 토큰 텍스트 기준)
+        """
+        return self.extract_batch([keyword])[0]
+
+    def extract_batch(self, keywords, batch_size=256, n_process=1):
+        """
+        여러 키워드 명사 추출
+
+        캐시와 어절 사전으로 처리할 수 없는 키워드만 모아 nlp.pipe로 한 번에 태깅합니다.
+
+        Args:
+            keywords: 키워드 문자열 목록
+            batch_size: nlp.pipe 배치 크기
+            n_process: spaCy 처리 프로세스 수
+
+        Returns:
+            키워드별 명사 목록의 리스트 (입력 순서)
+        """
+        keywords = list(keywords)
+        results = [None] * len(keywords)
+        missing = {}
+
+        for i, keyword in enumerate(keywords):
+            nouns = self._cached(keyword)
+            if nouns is None:
+                nouns = self.fast_extract(keyword)
+                if nouns is not None:
+                    self.fast_path += 1
+                    self._remember(keyword, nouns)
+            if nouns is None:
+                missing.setdefault(keyword, []).append(i)
+            else:
+                results[i] = nouns
+
+        if missing:
+            self.fallbacks += len(missing)
+            docs = self.nlp.pipe(list(missing), batch_size=batch_size, n_process=n_process, disable=self.disable)
+            for keyword, doc in zip(list(missing), docs):
+                nouns = self.record(keyword, doc)
+                for i in missing[keyword]:
+                    results[i] = nouns
+
+        return results
+
+    def record(self, keyword, doc):
+        """
+        spaCy로 태깅한 Doc에서 명사를 추출해 캐시하고 어절 품사 빈도 학습
+
+        Args:
+            keyword: 키워드 문자열
+            doc: keyword에 대한 spaCy Doc
+
+        Returns:
+            명사 목록
+        """
+        nouns = [token.text for token in doc if token.pos_ == NOUN_POS]
+        self._learn(doc)
+        self._remember(keyword, nouns)
+        return nouns
+
+    def fast_extract(self, keyword):
+        """
+        어절 사전으로 명사 추출 (빠른 경로)
+
+        Args:
+            keyword: 키워드 문자열
+
+        Returns:
+            명사 목록 (판별할 수 없는 어절이 있거나 어절 수가 많으면 None)
+        """
+        words = keyword.split()
+        if not words or len(words) > self.max_words:
+            return None
+
+        nouns = []
+        for word in words:
+            is_noun = self._classify(word)
+            if is_noun is None:
+                return None
+            if is_noun:
+                nouns.append(word)
+        return nouns
+
+    def _classify(self, word):
+        """어절 품사 판별 (명사 True, 기타 False, 판별 불가 None)"""
+        if not SIMPLE_TOKEN_PATTERN.match(word):
+            return None
+
+        counts = self._tokens.get(word)
+        if counts is not None:
+            total = counts[0] + counts[1]
+            if total >= MIN_TOKEN_OBSERVATIONS:
+                majority = max(counts)
+                if majority / total >= MIN_TOKEN_AGREEMENT:
+                    return counts[0] >= counts[1]
+            return None
+
+        # 명사 + 조사
+        for particle in PARTICLES:
+            if word.endswith(particle) and word[:-len(particle)] in self._nouns:
+                return True
+
+        # 복합 명사
+        if self._is_compound_noun(word):
+            return True
+        return None
+
+    def _is_compound_noun(self, word):
+        """어절 전체가 사전의 2음절 이상 명사들로 나뉘는지 확인"""
+        n = len(word)
+        if n < 4:
+            return False
+        reachable = [False] * (n + 1)
+        reachable[0] = True
+        for end in range(2, n + 1):
+            for start in range(0, end - 1):
+                if reachable[start] and word[start:end] in self._nouns:
+                    reachable[end] = True
+                    break
+        return reachable[n]
+
+    def _learn(self, doc):
+        """Doc의 단순 어절별 품사 관측 추가"""
+        observations = 0
+        with self._lock:
+            for token in doc:
+                text = token.text
+                if not SIMPLE_TOKEN_PATTERN.match(text):
+                    continue
+                counts = self._tokens.setdefault(text, [0, 0])
+                counts[0 if token.pos_ == NOUN_POS else 1] += 1
+                if counts[0] >= MIN_TOKEN_OBSERVATIONS and counts[0] / (counts[0] + counts[1]) >= MIN_TOKEN_AGREEMENT:
+                    self._nouns.add(text)
+                else:
+                    self._nouns.discard(text)
+                observations += 1
+            self._unsaved += observations
+            start = self.autosave and self._unsaved >= AUTOSAVE_OBSERVATIONS and not self._saving
+            if start:
+                self._saving = True
+
+        if start:
+            threading.Thread(target=self._background_save, daemon=True).start()
+
+    def _cached(self, keyword):
+        """캐시 조회 (최근 사용 순서 갱신)"""
+        with self._lock:
+            nouns = self._cache.get(keyword)
+            if nouns is not None:
+                self._cache.move_to_end(keyword)
+                self.cache_hits += 1
+            return nouns
+
+    def _remember(self, keyword, nouns):
+        """캐시 저장 (최대 크기를 넘으면 가장 오래된 항목 제거)"""
+        with self._lock:
+            self._cache[keyword] = nouns
+            self._cache.move_to_end(keyword)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def learn(self, keywords, batch_size=256, n_process=1):
+        """
+        spaCy로 키워드를 태깅해 어절 사전 학습 (캐시와 무관하게 항상 태깅)
+
+        Args:
+            keywords: 키워드 문자열 이터러블
+            batch_size: nlp.pipe 배치 크기
+            n_process: spaCy 처리 프로세스 수
+
+        Returns:
+            학습한 키워드 수
+        """
+        count = 0
+        for keyword, doc in zip_docs(self.nlp, keywords, batch_size, n_process, self.disable):
+            self.record(keyword, doc)
+            count += 1
+        return count
+
+    def load(self):
+        """저장된 어절 사전 로드 (파이프라인 식별자가 다르면 무시)"""
+        if not os.path.exists(self.lexicon_path):
+            return
+        try:
+            with open(self.lexicon_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"어절 사전 로드 실패: {str(e)}")
+            return
+
+        if data.get('model') != self.model_key:
+            logging.warning(f"어절 사전 모델 불일치: {data.get('model')} (현재: {self.model_key})")
+            return
+
+        with self._lock:
+            self._tokens = {token: list(counts) for token, counts in data.get('tokens', {}).items()}
+            self._nouns = {
+                token for token, (noun, other) in self._tokens.items()
+                if noun >= MIN_TOKEN_OBSERVATIONS and noun / (noun + other) >= MIN_TOKEN_AGREEMENT
+            }
+        logging.info(f"어절 사전 로드: {self.lexicon_path} (어절 {len(self._tokens)}개)")
+
+    def save(self):
+        """어절 사전 저장 (임시 파일에 기록 후 교체)"""
+        with self._lock:
+            data = {'model': self.model_key, 'tokens': {token: list(counts) for token, counts in self._tokens.items()}}
+            self._unsaved = 0
+
+        os.makedirs(os.path.dirname(self.lexicon_path), exist_ok=True)
+        tmp_path = f'{self.lexicon_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.lexicon_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _background_save(self):
+        """백그라운드 저장 스레드 본문"""
+        try:
+            self.save()
+        except Exception as e:
+            logging.error(f"어절 사전 저장 오류: {str(e)}")
+        finally:
+            with self._lock:
+                self._saving = False
+
+    def stats(self):
+        """캐시/빠른 경로/spaCy 처리 통계"""
+        with self._lock:
+            return {
+                'cache_entries': len(self._cache),
+                'cache_hits': self.cache_hits,
+                'fast_path': self.fast_path,
+                'spacy_fallbacks': self.fallbacks,
+                'lexicon_tokens': len(self._tokens),
+                'lexicon_nouns': len(self._nouns)
+            }
+
+def zip_docs(nlp, keywords, batch_size=256, n_process=1, disable=()):
+    """(키워드, Doc) 쌍 제너레이터"""
+    docs = nlp.pipe(
+        ((keyword, keyword) for keyword in keywords),
+        as_tuples=True,
+        batch_size=batch_size,
+        n_process=n_process,
+        disable=list(disable)
+    )
+    for doc, keyword in docs:
+        yield keyword, doc
+
+def compare_with_spacy(extractor, keywords, batch_size=256):
+    """
+    빠른 경로 명사 추출을 spaCy 결과와 비교
+
+    학습에 쓰지 않은 키워드로 측정해야 실제 처음 보는 검색어에 대한 정확도가 됩니다.
+
+    Args:
+        extractor: 어절 사전을 학습한 NounExtractor
+        keywords: 평가 키워드 목록
+        batch_size: nlp.pipe 배치 크기
+
+    Returns:
+        {"keywords", "coverage", "exact_match", "precision", "recall",
+         "fast_ms_per_keyword", "spacy_ms_per_keyword"} 딕셔너리 (정확도 지표는 빠른 경로 처리 키워드 기준)
+    """
+    keywords = list(keywords)
+
+    start = time.perf_counter()
+    fast_results = [extractor.fast_extract(keyword) for keyword in keywords]
+    fast_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [
+        [token.text for token in doc if token.pos_ == NOUN_POS]
+        for _, doc in zip_docs(extractor.nlp, keywords, batch_size, disable=extractor.disable)
+    ]
+    spacy_seconds = time.perf_counter() - start
+
+    covered = exact = true_positive = predicted = actual = 0
+    for fast, expected in zip(fast_results, reference):
+        if fast is None:
+            continue
+        covered += 1
+        exact += fast == expected
+        overlap = sum(min(fast.count(noun), expected.count(noun)) for noun in set(fast))
+        true_positive += overlap
+        predicted += len(fast)
+        actual += len(expected)
+
+    n = len(keywords)
+    return {
+        'keywords': n,
+        'coverage': covered / n if n else 0.0,
+        'exact_match': exact / covered if covered else 0.0,
+        'precision': true_positive / predicted if predicted else 1.0,
+        'recall': true_positive / actual if actual else 1.0,
+        'fast_ms_per_keyword': fast_seconds * 1000 / n if n else 0.0,
+        'spacy_ms_per_keyword': spacy_seconds * 1000 / n if n else 0.0
+    }
+
+def main(argv=None):
+    """어절 사전 학습/평가 CLI"""
+    parser = argparse.ArgumentParser(description='명사 추출 어절 사전 학습 및 spaCy 대비 정확도 측정')
+    parser.add_argument('--keywords-file', required=True, help='키워드 파일 (JSONL 또는 한 줄에 하나)')
+    parser.add_argument('--model', default='ko_core_news_sm', help='spaCy 모델 이름 또는 경로')
+    parser.add_argument('--lexicon-dir', default=None, help=f'어절 사전 디렉토리 (기본값: {NOUN_LEXICON_DIR})')
+    parser.add_argument('--evaluate', action='store_true', help='일부 키워드를 떼어 두고 학습 후 정확도 측정')
+    parser.add_argument('--test-ratio', type=float, default=0.2, help='평가용 키워드 비율')
+    parser.add_argument('--batch-size', type=int, default=256, help='nlp.pipe 배치 크기')
+    parser.add_argument('--seed', type=int, default=42, help='평가용 분할 난수 시드')
+    parser.add_argument('--save', action='store_true', help='학습한 어절 사전 저장')
+    args = parser.parse_args(argv)
+
+    import spacy
+    from semantic_analyzer import iter_keywords_file
+
+    nlp = spacy.load(args.model)
+    meta = nlp.meta
+    extractor = NounExtractor(
+        nlp,
+        f"{meta.get('lang', 'ko')}_{meta.get('name', 'unknown')}-{meta.get('version', '0')}",
+        lexicon_dir=args.lexicon_dir,
+        disable=[name for name in ('parser', 'ner') if name in nlp.pipe_names],
+        autosave=False
+    )
+
+    keywords = list(dict.fromkeys(iter_keywords_file(args.keywords_file)))
+    test_keywords = []
+    if args.evaluate:
+        random.Random(args.seed).shuffle(keywords)
+        n_test = int(len(keywords) * args.test_ratio)
+        test_keywords, keywords = keywords[:n_test], keywords[n_test:]
+
+    start = time.perf_counter()
+    learned = extractor.learn(keywords, batch_size=args.batch_size)
+    result = {'learned_keywords': learned, 'learn_seconds': time.perf_counter() - start, **extractor.stats()}
+
+    if test_keywords:
+        result['evaluation'] = compare_with_spacy(extractor, test_keywords, batch_size=args.batch_size)
+
+    if args.save:
+        extractor.save()
+        result['lexicon_path'] = extractor.lexicon_path
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+    sys.exit(main())
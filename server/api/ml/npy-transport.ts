@@ -0,0 +1,125 @@
+/**
+ * 배열 바이너리 전송 모듈
+ *
+ * 대량 일괄 예측의 특성 행렬과 결과를 JSON 대신 .npy 파일(헤더 + float64 버퍼)로
+ * ML 브릿지와 주고받는 모듈. 공유 메모리 tmpfs(/dev/shm)가 있으면 그곳에 파일을 둔다.
+ * JSON 경로와 같은 float64를 사용하므로 전송 방식에 따라 결과가 달라지지 않는다.
+ */
+
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { randomUUID } from 'crypto';
+
+const NPY_MAGIC = Buffer.from([0x93, 0x4e, 0x55, 0x4d, 0x50, 0x59]);
+
+/**
+ * .npy 파일에서 읽은 배열
+ */
+export interface NpyArray {
+  shape: number[];
+  data: Float32Array | Float64Array;
+}
+
+/**
+ * 전송 파일 디렉토리 (공유 메모리 tmpfs가 있으면 사용)
+ */
+export function getTransportDir(): string {
+  try {
+    fs.accessSync('/dev/shm', fs.constants.W_OK);
+    return '/dev/shm';
+  } catch {
+    return os.tmpdir();
+  }
+}
+
+/**
+ * 새 전송 파일 경로 생성
+ * @param prefix 파일 이름 접두사
+ * @returns .npy 파일 경로
+ */
+export function createTransportPath(prefix: string): string {
+  return path.join(getTransportDir(), `ml-bridge-${prefix}-${process.pid}-${randomUUID()}.npy`);
+}
+
+/**
+ * 2차원 숫자 배열을 float64 .npy 파일로 기록
+ * @param filePath 저장 경로
+ * @param rows 행 목록 (모든 행의 길이가 같아야 함)
+ */
+export function writeNpyMatrix(filePath: string, rows: number[][]): void {
+  const columns = rows.length > 0 ? rows[0].length : 0;
+  const values = new Float64Array(rows.length * columns);
+
+  rows.forEach((row, rowIndex) => {
+    if (row.length !== columns) {
+      throw new Error(`특성 행 길이 불일치: ${row.length} (예상: ${columns})`);
+    }
+    values.set(row, rowIndex * columns);
+  });
+
+  // 헤더는 매직 문자열 + 버전 + 길이 + 딕셔너리 문자열이며 전체가 64바이트 배수여야 함
+  let header = `{'descr': '<f8', 'fortran_order': False, 'shape': (${rows.length}, ${columns}), }`;
+  const preambleLength = NPY_MAGIC.length + 2 + 2;
+  const padding = 64 - ((preambleLength + header.length + 1) % 64);
+  header = header + ' '.repeat(padding % 64) + '\n';
+
+  const preamble = Buffer.alloc(preambleLength);
+  NPY_MAGIC.copy(preamble, 0);
+  preamble.writeUInt8(1, 6);
+  preamble.writeUInt8(0, 7);
+  preamble.writeUInt16LE(header.length, 8);
+
+  const body = Buffer.from(values.buffer, values.byteOffset, values.byteLength);
+  fs.writeFileSync(filePath, Buffer.concat([preamble, Buffer.from(header, 'latin1'), body]));
+}
+
+/**
+ * float32/float64 .npy 파일 읽기
+ * @param filePath 파일 경로
+ * @returns 형태와 값 배열
+ */
+export function readNpy(filePath: string): NpyArray {
+  const buffer = fs.readFileSync(filePath);
+  if (!buffer.subarray(0, NPY_MAGIC.length).equals(NPY_MAGIC)) {
+    throw new Error(`.npy 파일 형식이 아닙니다: ${filePath}`);
+  }
+
+  const major = buffer.readUInt8(6);
+  const headerLength = major === 1 ? buffer.readUInt16LE(8) : buffer.readUInt32LE(8);
+  const headerStart = major === 1 ? 10 : 12;
+  const header = buffer.toString('latin1', headerStart, headerStart + headerLength);
+
+  const descr = /'descr':\s*'([^']+)'/.exec(header)?.[1];
+  const shapeText = /'shape':\s*\(([^)]*)\)/.exec(header)?.[1] ?? '';
+  if (/'fortran_order':\s*True/.test(header)) {
+    throw new Error('fortran_order 배열은 지원하지 않습니다.');
+  }
+
+  const shape = shapeText.split(',').map((value) => value.trim()).filter(Boolean).map(Number);
+  const size = shape.reduce((total, value) => total * value, 1);
+
+  // 데이터 시작 위치가 정렬되지 않을 수 있으므로 값 버퍼를 복사해 사용
+  const dataStart = headerStart + headerLength;
+  const bytes = buffer.subarray(dataStart);
+  const copy = new ArrayBuffer(bytes.length);
+  new Uint8Array(copy).set(bytes);
+
+  if (descr === '<f4') {
+    return { shape, data: new Float32Array(copy, 0, size) };
+  }
+  if (descr === '<f8') {
+    return { shape, data: new Float64Array(copy, 0, size) };
+  }
+  throw new Error(`지원하지 않는 .npy 자료형: ${descr}`);
+}
+
+/**
+ * 전송 파일 삭제 (없으면 무시)
+ * @param filePaths 삭제할 파일 경로 목록
+ */
+export function removeTransportFiles(...filePaths: string[]): void {
+  filePaths.forEach((filePath) => {
+    fs.rm(filePath, { force: true }, () => undefined);
+  });
+}
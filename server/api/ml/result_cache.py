@@ -0,0 +1,283 @@
+"""
+분석 결과 캐시 모듈
+
+자주 요청되는 키워드의 의미 분석 결과를 크기/TTL 제한이 있는 LRU 캐시에 보관하고,
+선택적으로 SQLite 데이터베이스에 저장해 브릿지 재시작 후에도 재사용합니다.
+"""
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+
+def normalize_keyword(keyword):
+    """캐시 키용 키워드 정규화 (앞뒤 공백 제거, 연속 공백 축약, 소문자화)"""
+    return re.sub(r'\s+', ' ', str(keyword)).strip().lower()
+
+def make_cache_key(operation, keyword, **params):
+    """
+    캐시 키 생성
+
+    Args:
+        operation: 분석 종류 (analyze_keyword 등)
+        keyword: 키워드 문자열
+        **params: 결과에 영향을 주는 추가 파라미터
+
+    Returns:
+        캐시 키 문자열
+    """
+    key = f'{operation}:{normalize_keyword(keyword)}'
+    if params:
+        key += ':' + json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return key
+
+class SQLiteCacheBackend:
+    """
+    SQLite 캐시 저장소
+
+    캐시 항목을 semantic_cache 테이블에 만료 시각과 함께 저장합니다.
+    """
+
+    def __init__(self, db_path, table='semantic_cache'):
+        """
+        초기화
+
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+            table: 캐시 테이블 이름
+        """
+        self.db_path = db_path
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {self.table} (
+            cache_key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at REAL
+        )
+        ''')
+        self._conn.commit()
+
+    def get(self, key):
+        """저장된 (값 JSON 문자열, 만료 시각) 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT value, expires_at FROM {self.table} WHERE cache_key = ?', (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            return None
+        return row
+
+    def set(self, key, value, expires_at):
+        """항목 저장"""
+        with self._lock:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (cache_key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, expires_at)
+            )
+            self._conn.commit()
+
+    def purge_expired(self):
+        """만료된 항목 삭제"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE expires_at <= ?', (time.time(),))
+            self._conn.commit()
+
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._conn.execute(f'DELETE FROM {self.table}')
+            self._conn.commit()
+
+class LRUCache:
+    """
+    LRU 결과 캐시 클래스
+
+    항목 수와 전체 크기(직렬화된 바이트 수)를 제한하며, TTL이 지난 항목은 조회 시 버립니다.
+    값은 JSON으로 직렬화해 보관하므로 조회 결과를 호출자가 수정해도 캐시에 영향이 없습니다.
+    get_or_compute 계산 중 대체 결과(모델/벡터 없음, 오류 등 실제 실패)가 쓰였으면
+    fallback_ttl 동안만 메모리에 보관해, 일시적인 실패 결과가 영속 저장소나 긴 TTL로
+    남지 않게 합니다. 이렇게 보관한 항목을 다시 돌려줄 때도 대체 결과로 기록하므로,
+    그 값으로 계산한 상위 결과(세그먼트 등) 역시 영속 저장되지 않습니다.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, ttl=3600, backend=None,
+                 fallback_ttl=60, fallback_count=None, record_fallback=None):
+        """
+        초기화
+
+        Args:
+            max_entries: 최대 항목 수
+            max_bytes: 최대 전체 크기 (바이트)
+            ttl: 항목 유효 시간 (초, None이면 만료 없음)
+            backend: 영속 저장소 (SQLiteCacheBackend 등, 선택)
+            fallback_ttl: 대체 결과 유효 시간 (초, None이면 대체 결과는 저장하지 않음)
+            fallback_count: 현재 스레드의 대체 결과 사용 횟수를 반환하는 함수 (없으면 구분하지 않음)
+            record_fallback: 대체 결과 기록 함수(kind), 보관된 대체 결과를 돌려줄 때 호출
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.backend = backend
+        self.fallback_ttl = fallback_ttl
+        self.fallback_count = fallback_count
+        self.record_fallback = record_fallback
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            캐시된 값 (없으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _, fallback = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                else:
+                    self._remove(key)
+                    entry = None
+
+        if entry is not None:
+            if fallback and self.record_fallback is not None:
+                self.record_fallback('cached_fallback')
+            return json.loads(value)
+
+        if self.backend is not None:
+            try:
+                row = self.backend.get(key)
+            except Exception as e:
+                logging.warning(f"캐시 저장소 조회 오류: {str(e)}")
+                row = None
+            if row is not None:
+                with self._lock:
+                    self.hits += 1
+                    self.backend_hits += 1
+                    self._store(key, row[0], row[1])
+                return json.loads(row[0])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        """
+        캐시 저장
+
+        Args:
+            key: 캐시 키
+            value: JSON 직렬화 가능한 값
+        """
+        serialized = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._store(key, serialized, expires_at)
+
+        if self.backend is not None:
+            try:
+                self.backend.set(key, serialized, expires_at)
+            except Exception as e:
+                logging.warning(f"캐시 저장소 기록 오류: {str(e)}")
+
+    def get_or_compute(self, key, compute):
+        """
+        캐시 조회 후 없으면 계산해 저장
+
+        Args:
+            key: 캐시 키
+            compute: 값을 계산하는 인자 없는 함수
+
+        Returns:
+            캐시된 값 또는 새로 계산한 값
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        before = self.fallback_count() if self.fallback_count else 0
+        value = compute()
+        if self.fallback_count is None or self.fallback_count() == before:
+            self.set(key, value)
+            return value
+
+        # 대체 결과는 짧게 메모리에만 보관 (원인이 해소되면 곧 다시 계산)
+        with self._lock:
+            self.fallbacks += 1
+            if self.fallback_ttl is not None:
+                self._store(key, json.dumps(value, ensure_ascii=False), time.time() + self.fallback_ttl,
+                            fallback=True)
+        return value
+
+    def clear(self):
+        """메모리 캐시와 영속 저장소 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        """적중/미적중 통계 반환"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'backend_hits': self.backend_hits,
+                'evictions': self.evictions,
+                'fallbacks': self.fallbacks,
+                'fallback_ttl': self.fallback_ttl,
+                'hit_rate': self.hits / requests if requests else 0.0,
+                'persistent': self.backend is not None
+            }
+
+    def _store(self, key, serialized, expires_at, fallback=False):
+        """잠금 상태에서 항목 저장 후 크기 제한 적용"""
+        if key in self._entries:
+            self._remove(key)
+
+        size = len(serialized.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (serialized, expires_at, size, fallback)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        """잠금 상태에서 항목 제거"""
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
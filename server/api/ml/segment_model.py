@@ -0,0 +1,393 @@
+"""
+카테고리별 세그먼트 모델 모듈
+
+카테고리 키워드를 한 번 군집화한 결과(세그먼트 중심, 중심별 누적 키워드 수, 세그먼트별 명사 빈도)를
+모델 디렉토리에 저장해 두고, 새로 수집된 키워드는 다시 군집화하지 않고 가장 가까운 중심에
+O(k·d)로 배정합니다. 배정된 키워드 벡터는 쌓아 두었다가 백그라운드에서 미니배치 갱신으로
+중심에 반영합니다.
+"""
+import os
+import re
+import json
+import time
+import fcntl
+import hashlib
+import logging
+import threading
+import numpy as np
+from collections import Counter
+from contextlib import contextmanager
+
+from segmentation import select_k, fit_kmeans, label_noun_counters
+
+# 기본 저장 디렉토리
+SEGMENT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models', 'segments')
+
+SEGMENT_SUFFIX = '.segments.npz'
+
+# 이 수 이상의 배정 벡터가 쌓이면 백그라운드 갱신 시작
+REFIT_MIN_PENDING = 512
+
+# 세그먼트별로 보관하는 최대 명사 수 (레이블 계산용)
+MAX_NOUNS_PER_SEGMENT = 200
+
+class SegmentModel:
+    """
+    세그먼트 모델 클래스
+
+    배정은 ||x||² 항을 뺀 거리(||c||² - 2·x·c)의 최솟값으로 계산하므로 키워드당 k·d 연산만 필요합니다.
+    """
+
+    def __init__(self, category, centroids, counts, noun_counts, vector_key, fitted_at=None, updates=0):
+        """
+        초기화
+
+        Args:
+            category: 카테고리 이름
+            centroids: (k, dim) 세그먼트 중심 행렬
+            counts: (k,) 중심별 누적 키워드 수 (미니배치 갱신 학습률 계산용)
+            noun_counts: 세그먼트별 명사 빈도 Counter 목록
+            vector_key: 벡터를 만든 임베딩 공간 식별자 (다른 공간의 벡터 배정 방지)
+            fitted_at: 최초 학습 시각 (epoch 초)
+            updates: 미니배치 갱신 횟수
+        """
+        self.category = category
+        self.counts = np.asarray(counts, dtype=np.float64)
+        self.noun_counts = [Counter(counter) for counter in noun_counts]
+        self.vector_key = vector_key
+        self.fitted_at = fitted_at or time.time()
+        self.updates = updates
+        self._update_lock = threading.Lock()
+        self._set_centroids(centroids)
+
+    def _set_centroids(self, centroids):
+        """중심, 중심 제곱 노름, 세그먼트 레이블 교체 (배정 중인 스레드는 이전 값 또는 새 값 한 벌만 봄)"""
+        centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._state = (centroids, np.einsum('ij,ij->i', centroids, centroids))
+        self.labels = [' '.join(nouns) for nouns in label_noun_counters(self.noun_counts)]
+
+    @property
+    def centroids(self):
+        return self._state[0]
+
+    @property
+    def n_clusters(self):
+        return len(self.centroids)
+
+    @classmethod
+    def fit(cls, category, vectors, noun_lists, vector_key, n_clusters=None, k_values=range(2, 9), seed=42):
+        """
+        키워드 벡터로 세그먼트 모델 학습
+
+        Args:
+            category: 카테고리 이름
+            vectors: (N, dim) 키워드 벡터 행렬
+            noun_lists: 키워드별 명사 목록
+            vector_key: 임베딩 공간 식별자
+            n_clusters: 세그먼트 수 (None이면 k_values 중 실루엣 점수로 선택)
+            k_values: 자동 선택 시 후보 세그먼트 수
+            seed: 난수 시드
+
+        Returns:
+            (SegmentModel, 키워드별 세그먼트 번호 배열) 튜플
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(vectors) == 0:
+            raise ValueError('세그먼트 모델을 학습할 키워드 벡터가 없습니다.')
+
+        if n_clusters is None:
+            n_clusters, _ = select_k(vectors, k_values, seed=seed)
+        n_clusters = max(1, min(int(n_clusters), len(vectors)))
+
+        estimator = fit_kmeans(vectors, n_clusters, seed=seed)
+        labels = estimator.labels_
+        model = cls(
+            category,
+            estimator.cluster_centers_,
+            np.bincount(labels, minlength=n_clusters),
+            _count_nouns(noun_lists, labels, n_clusters),
+            vector_key
+        )
+        return model, labels
+
+    def assign(self, vectors):
+        """
+        가장 가까운 세그먼트 배정
+
+        Args:
+            vectors: (N, dim) 키워드 벡터 행렬
+
+        Returns:
+            (세그먼트 번호 배열, 중심까지 유클리드 거리 배열) 튜플
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(vectors) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        centroids, centroid_sq_norms = self._state
+        partial = centroid_sq_norms - 2.0 * (vectors @ centroids.T)
+        segment_ids = np.argmin(partial, axis=1)
+        squared = partial[np.arange(len(vectors)), segment_ids] + np.einsum('ij,ij->i', vectors, vectors)
+        return segment_ids, np.sqrt(np.maximum(squared, 0.0))
+
+    def partial_fit(self, vectors, noun_lists=None):
+        """
+        미니배치 k-평균 갱신 (중심별 누적 수에 반비례하는 학습률로 중심 이동)
+
+        Args:
+            vectors: (N, dim) 새 키워드 벡터 행렬
+            noun_lists: 키워드별 명사 목록 (레이블 갱신용, 선택)
+
+        Returns:
+            키워드별 세그먼트 번호 배열
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._update_lock:
+            return self._partial_fit(vectors, noun_lists)
+
+    def _partial_fit(self, vectors, noun_lists):
+        segment_ids, _ = self.assign(vectors)
+        if len(vectors) == 0:
+            return segment_ids
+
+        batch_counts = np.bincount(segment_ids, minlength=self.n_clusters)
+        batch_sums = np.zeros_like(self.centroids, dtype=np.float64)
+        np.add.at(batch_sums, segment_ids, vectors)
+
+        updated = np.flatnonzero(batch_counts)
+        self.counts[updated] += batch_counts[updated]
+        # c ← c + (Σx - n·c) / 누적 수
+        centroids = self.centroids.astype(np.float64)
+        centroids[updated] += (
+            batch_sums[updated] - batch_counts[updated, None] * centroids[updated]
+        ) / self.counts[updated, None]
+
+        if noun_lists is not None:
+            for segment_id, counter in enumerate(_count_nouns(noun_lists, segment_ids, self.n_clusters)):
+                merged = self.noun_counts[segment_id] + counter
+                self.noun_counts[segment_id] = Counter(dict(merged.most_common(MAX_NOUNS_PER_SEGMENT)))
+
+        self.updates += 1
+        self._set_centroids(centroids)
+        return segment_ids
+
+    def summary(self):
+        """세그먼트 목록 요약"""
+        return [
+            {'id': segment_id, 'label': self.labels[segment_id], 'size': int(self.counts[segment_id])}
+            for segment_id in range(self.n_clusters)
+        ]
+
+    def save(self, path):
+        """
+        npz 파일로 저장 (임시 파일에 기록 후 교체)
+
+        Args:
+            path: 저장 경로 (<카테고리 키>.segments.npz)
+        """
+        meta = {
+            'category': self.category,
+            'vector_key': self.vector_key,
+            'fitted_at': self.fitted_at,
+            'updates': self.updates,
+            'noun_counts': [dict(counter) for counter in self.noun_counts]
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz'
+        try:
+            np.savez(tmp_path, centroids=self.centroids, counts=self.counts,
+                     meta=np.array(json.dumps(meta, ensure_ascii=False)))
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        npz 파일에서 로드
+
+        Args:
+            path: save 결과 파일 경로
+
+        Returns:
+            SegmentModel 인스턴스
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            return cls(
+                meta['category'],
+                data['centroids'],
+                data['counts'],
+                meta['noun_counts'],
+                meta['vector_key'],
+                fitted_at=meta.get('fitted_at'),
+                updates=meta.get('updates', 0)
+            )
+
+def _count_nouns(noun_lists, labels, n_clusters):
+    """세그먼트별 명사 빈도 (상위 MAX_NOUNS_PER_SEGMENT개)"""
+    counters = [Counter() for _ in range(n_clusters)]
+    for nouns, label in zip(noun_lists, labels):
+        counters[label].update(nouns)
+    return [Counter(dict(counter.most_common(MAX_NOUNS_PER_SEGMENT))) for counter in counters]
+
+class SegmentModelStore:
+    """
+    카테고리별 세그먼트 모델 저장소
+
+    모델은 처음 사용할 때 로드하고, 다른 프로세스가 파일을 교체하면 다음 조회 시 다시 읽습니다.
+    배정된 키워드 벡터는 카테고리별로 쌓아 두었다가 REFIT_MIN_PENDING개가 넘으면
+    백그라운드 스레드에서 partial_fit 후 저장합니다. 로드 → 갱신 → 저장은 카테고리별
+    파일 잠금 아래에서 수행하므로 여러 워커 프로세스의 갱신이 서로 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, segment_dir=None, refit_min_pending=REFIT_MIN_PENDING, background=True):
+        """
+        초기화
+
+        Args:
+            segment_dir: 저장 디렉토리 (기본값: SEGMENT_DIR)
+            refit_min_pending: 백그라운드 갱신을 시작하는 대기 벡터 수
+            background: False면 갱신 조건을 만족해도 refit 호출 전까지 반영하지 않음
+        """
+        self.segment_dir = segment_dir or SEGMENT_DIR
+        self.refit_min_pending = refit_min_pending
+        self.background = background
+        self._models = {}
+        self._signatures = {}
+        self._pending = {}
+        self._refitting = set()
+        self._lock = threading.Lock()
+
+    def path(self, category):
+        """카테고리 모델 파일 경로 (한글 카테고리 이름도 안전한 파일 이름으로 변환)"""
+        slug = re.sub(r'[^0-9A-Za-z._-]+', '_', category).strip('_')[:40]
+        digest = hashlib.sha1(category.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.segment_dir, f'{slug or "category"}-{digest}{SEGMENT_SUFFIX}')
+
+    @contextmanager
+    def _file_lock(self, category):
+        """카테고리 모델 파일의 프로세스 간 배타 잠금"""
+        os.makedirs(self.segment_dir, exist_ok=True)
+        with open(self.path(category) + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _signature(stat):
+        """파일 교체 감지용 (inode, 수정 시각, 크기)"""
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, category):
+        """
+        카테고리 모델 조회
+
+        Args:
+            category: 카테고리 이름
+
+        Returns:
+            SegmentModel 인스턴스 (모델이 없으면 None)
+        """
+        path = self.path(category)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        signature = self._signature(stat)
+        with self._lock:
+            if self._signatures.get(category) != signature:
+                self._models[category] = SegmentModel.load(path)
+                self._signatures[category] = signature
+            return self._models[category]
+
+    def put(self, model):
+        """모델 저장 후 캐시 교체"""
+        path = self.path(model.category)
+        with self._file_lock(model.category), self._lock:
+            model.save(path)
+            self._models[model.category] = model
+            self._signatures[model.category] = self._signature(os.stat(path))
+            self._pending.pop(model.category, None)
+
+    def observe(self, category, vectors, noun_lists):
+        """
+        배정된 키워드 벡터를 갱신 대기열에 추가
+
+        Args:
+            category: 카테고리 이름
+            vectors: (N, dim) 키워드 벡터 행렬
+            noun_lists: 키워드별 명사 목록
+
+        Returns:
+            대기 중인 벡터 수
+        """
+        if len(vectors) == 0:
+            return self.pending_count(category)
+
+        with self._lock:
+            pending = self._pending.setdefault(category, {'vectors': [], 'nouns': [], 'count': 0})
+            pending['vectors'].append(np.asarray(vectors, dtype=np.float32))
+            pending['nouns'].extend(noun_lists)
+            pending['count'] += len(vectors)
+            count = pending['count']
+            start = (
+                self.background and count >= self.refit_min_pending
+                and category not in self._refitting
+            )
+            if start:
+                self._refitting.add(category)
+
+        if start:
+            threading.Thread(target=self._background_refit, args=(category,), daemon=True).start()
+        return count
+
+    def pending_count(self, category):
+        """갱신 대기 중인 벡터 수"""
+        with self._lock:
+            return self._pending.get(category, {}).get('count', 0)
+
+    def refit(self, category):
+        """
+        대기 중인 벡터로 모델 갱신 후 저장
+
+        Args:
+            category: 카테고리 이름
+
+        Returns:
+            반영한 벡터 수 (모델이나 대기 벡터가 없으면 0)
+        """
+        with self._lock:
+            pending = self._pending.pop(category, None)
+        if not pending:
+            return 0
+
+        vectors = np.concatenate(pending['vectors'])
+        path = self.path(category)
+        with self._file_lock(category):
+            # 잠금을 잡은 뒤 다시 읽어 다른 프로세스가 저장한 최신 모델에 반영
+            model = self.get(category)
+            if model is None:
+                return 0
+
+            model.partial_fit(vectors, pending['nouns'])
+            with self._lock:
+                model.save(path)
+                self._signatures[category] = self._signature(os.stat(path))
+
+        logging.info(f"세그먼트 모델 갱신: {category} (키워드 {len(vectors)}개 반영, 누적 갱신 {model.updates}회)")
+        return len(vectors)
+
+    def _background_refit(self, category):
+        """백그라운드 갱신 스레드 본문"""
+        try:
+            self.refit(category)
+        except Exception as e:
+            logging.error(f"세그먼트 모델 갱신 오류 ({category}): {str(e)}")
+        finally:
+            with self._lock:
+                self._refitting.discard(category)
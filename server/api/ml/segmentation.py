@@ -0,0 +1,202 @@
+"""
+키워드 세그먼트 분할 모듈
+
+이미 계산된 키워드 벡터와 명사 추출 결과로 키워드를 군집화하고 세그먼트 레이블을 붙입니다.
+키워드가 많으면 MiniBatchKMeans를 사용하고, 세그먼트 수(k)는 표본 실루엣 점수로 고릅니다.
+"""
+import math
+import logging
+import numpy as np
+from collections import Counter
+
+# scikit-learn은 선택적으로 가져오기 (사용 불가 시 호출 측에서 기본 세그먼트 사용)
+try:
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# 이 행 수 이상이면 MiniBatchKMeans 사용
+MINIBATCH_THRESHOLD = 2000
+
+# k 후보 비교 시 군집화에 쓰는 최대 표본 수와 실루엣 점수 계산 표본 수
+SELECTION_SAMPLE_SIZE = 10000
+SILHOUETTE_SAMPLE_SIZE = 2000
+
+# 세그먼트 레이블에 쓰는 명사 수
+LABEL_NOUNS = 3
+
+def fit_kmeans(vectors, n_clusters, seed=42):
+    """
+    k-평균 군집화 모델 학습
+
+    Args:
+        vectors: (N, dim) 벡터 행렬
+        n_clusters: 군집 수
+        seed: 난수 시드
+
+    Returns:
+        학습된 KMeans 또는 MiniBatchKMeans 모델
+    """
+    if len(vectors) >= MINIBATCH_THRESHOLD:
+        model = MiniBatchKMeans(
+            n_clusters=n_clusters,
+            batch_size=2048,
+            n_init=3,
+            max_no_improvement=10,
+            random_state=seed
+        )
+    else:
+        model = KMeans(n_clusters=n_clusters, n_init=4, random_state=seed)
+    return model.fit(vectors)
+
+def select_k(vectors, k_values, seed=42, sample_size=SELECTION_SAMPLE_SIZE,
+             silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE):
+    """
+    표본 실루엣 점수로 세그먼트 수 선택
+
+    전체 행렬 대신 무작위 표본으로 후보 k마다 군집화하고, 실루엣 점수는 그중 일부
+    표본에서만 계산하므로 키워드 수와 무관하게 거의 일정한 시간이 걸립니다.
+
+    Args:
+        vectors: (N, dim) 벡터 행렬
+        k_values: 후보 세그먼트 수 목록
+        seed: 난수 시드
+        sample_size: 후보별 군집화에 쓰는 최대 행 수
+        silhouette_sample_size: 실루엣 점수 계산 최대 행 수
+
+    Returns:
+        (선택된 k, {k: 실루엣 점수}) 튜플 (비교할 후보가 없으면 점수는 빈 딕셔너리)
+    """
+    n_rows = len(vectors)
+    candidates = sorted({int(k) for k in k_values if 2 <= k < n_rows})
+    if not candidates:
+        return max(1, min(min(k_values, default=1), n_rows)), {}
+    if len(candidates) == 1:
+        return candidates[0], {}
+
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if n_rows > sample_size:
+        sample = vectors[np.sort(rng.choice(n_rows, sample_size, replace=False))]
+
+    scores = {}
+    for k in candidates:
+        labels = fit_kmeans(sample, k, seed=seed).labels_
+        if len(np.unique(labels)) < 2:
+            continue
+        scores[k] = float(silhouette_score(
+            sample, labels,
+            sample_size=min(silhouette_sample_size, len(sample)),
+            random_state=seed
+        ))
+
+    if not scores:
+        return candidates[0], {}
+    # 점수가 같으면 더 작은 k 선택
+    best = max(scores, key=lambda k: (scores[k], -k))
+    return best, scores
+
+def label_segments(noun_lists, labels, n_clusters, n_nouns=LABEL_NOUNS):
+    """
+    세그먼트별 대표 명사 레이블 생성
+
+    세그먼트 안에서 자주 나오면서 다른 세그먼트에는 덜 나오는 명사를 고릅니다.
+    (빈도 × log(1 + 세그먼트 수 / 해당 명사가 나온 세그먼트 수))
+
+    Args:
+        noun_lists: 키워드별 명사 목록
+        labels: 키워드별 세그먼트 번호 배열
+        n_clusters: 세그먼트 수
+        n_nouns: 레이블에 쓰는 명사 수
+
+    Returns:
+        세그먼트 번호별 대표 명사 목록의 리스트
+    """
+    counters = [Counter() for _ in range(n_clusters)]
+    for nouns, label in zip(noun_lists, labels):
+        counters[label].update(nouns)
+    return label_noun_counters(counters, n_nouns)
+
+def label_noun_counters(counters, n_nouns=LABEL_NOUNS):
+    """
+    세그먼트별 명사 빈도로 대표 명사 선택
+
+    Args:
+        counters: 세그먼트 번호 순서의 명사 빈도 Counter 목록
+        n_nouns: 레이블에 쓰는 명사 수
+
+    Returns:
+        세그먼트 번호별 대표 명사 목록의 리스트
+    """
+    n_clusters = len(counters)
+    document_frequency = Counter()
+    for counter in counters:
+        document_frequency.update(counter.keys())
+
+    top_nouns = []
+    for counter in counters:
+        scored = sorted(
+            counter.items(),
+            key=lambda item: (-item[1] * math.log(1 + n_clusters / document_frequency[item[0]]), item[0])
+        )
+        top_nouns.append([noun for noun, _ in scored[:n_nouns]])
+    return top_nouns
+
+def segment_keywords(keywords, vectors, noun_lists, n_clusters=None, k_values=range(2, 9),
+                     max_keywords_per_segment=None, seed=42):
+    """
+    키워드 세그먼트 분할
+
+    Args:
+        keywords: 키워드 목록 (vectors 행 순서)
+        vectors: (N, dim) 키워드 벡터 행렬
+        noun_lists: 키워드별 명사 목록 (레이블 생성용)
+        n_clusters: 세그먼트 수 (None이면 k_values 중 실루엣 점수로 선택)
+        k_values: 자동 선택 시 후보 세그먼트 수
+        max_keywords_per_segment: 세그먼트별로 반환할 최대 키워드 수 (None이면 전체)
+        seed: 난수 시드
+
+    Returns:
+        {"k", "silhouette_scores", "segments": [{"id", "label", "size", "keywords"}, ...]} 딕셔너리
+        (각 세그먼트의 키워드는 중심에 가까운 순서, 세그먼트는 크기 내림차순)
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n_rows = len(vectors)
+    if n_rows == 0:
+        return {'k': 0, 'silhouette_scores': {}, 'segments': []}
+
+    scores = {}
+    if n_clusters is None:
+        n_clusters, scores = select_k(vectors, k_values, seed=seed)
+    n_clusters = max(1, min(int(n_clusters), n_rows))
+
+    model = fit_kmeans(vectors, n_clusters, seed=seed)
+    labels = model.labels_
+    distances = np.linalg.norm(vectors - model.cluster_centers_[labels], axis=1)
+    top_nouns = label_segments(noun_lists, labels, n_clusters)
+
+    segments = []
+    for cluster_id in range(n_clusters):
+        members = np.flatnonzero(labels == cluster_id)
+        if len(members) == 0:
+            continue
+        size = len(members)
+        members = members[np.argsort(distances[members], kind='stable')]
+        if max_keywords_per_segment is not None:
+            members = members[:max_keywords_per_segment]
+        segments.append({
+            'id': cluster_id,
+            'label': ' '.join(top_nouns[cluster_id]),
+            'size': size,
+            'keywords': [keywords[i] for i in members]
+        })
+    segments.sort(key=lambda segment: (-segment['size'], segment['id']))
+
+    logging.info(f"세그먼트 분할 완료: 키워드 {n_rows}개, 세그먼트 {len(segments)}개")
+    return {
+        'k': n_clusters,
+        'silhouette_scores': {str(k): score for k, score in scores.items()},
+        'segments': segments
+    }
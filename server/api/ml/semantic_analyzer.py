@@ -5,17 +5,22 @@
 """
 import os
 import json
+import logging
+import threading
 import numpy as np
 import spacy
-from collections import Counter
 
-# scikit-learn은 선택적으로 가져오기 (벡터 작업에서만 사용)
-try:
-    from sklearn.cluster import KMeans
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+from embedding_store import KeywordEmbeddingStore
+from ann_index import ExactIndex, build_index, save_index, load_index, measure_recall
+from lexicon_matcher import LexiconMatcher
+from result_cache import LRUCache, SQLiteCacheBackend, make_cache_key
+from bridge_metrics import record_fallback, fallback_count
+
+# 세그먼트 분할은 scikit-learn이 있을 때만 사용 (SKLEARN_AVAILABLE)
+from segmentation import SKLEARN_AVAILABLE, segment_keywords as cluster_keywords
+from segment_model import SegmentModel, SegmentModelStore
+from model_registry import ModelNotAvailableError
+from noun_extractor import NounExtractor
 
 class SemanticKeywordAnalyzer:
     """
@@ -24,12 +29,21 @@ class SemanticKeywordAnalyzer:
     키워드의 의미 분석, 관련 키워드 발굴, 시장 세그먼트 식별 등을 수행합니다.
     """
     
-    def __init__(self, db_connector=None):
+    # 유사도 임계값
+    SIMILARITY_THRESHOLD = 0.6
+    
+    # 벡터화/품사 태깅에 필요 없는 파이프라인 컴포넌트
+    UNUSED_PIPE_COMPONENTS = ('parser', 'ner')
+    
+    def __init__(self, db_connector=None, batch_size=256, use_embedding_store=True, embedding_dir=None):
         """
         초기화
         
         Args:
             db_connector: 데이터베이스 커넥터 인스턴스
+            batch_size: nlp.pipe 배치 크기
+            use_embedding_store: 키워드 벡터를 디스크 임베딩 저장소에 캐시할지 여부
+            embedding_dir: 임베딩 저장 디렉토리 (기본값: embedding_store.EMBEDDING_DIR)
         """
         # 한국어 NLP 모델 로드
         try:
@@ -39,8 +53,34 @@ class SemanticKeywordAnalyzer:
             self.nlp = spacy.load('ko_core_news_sm')
         
         self.db = db_connector
+        self.batch_size = batch_size
+        self.use_embedding_store = use_embedding_store and os.environ.get('SEMANTIC_EMBEDDING_STORE') != '0'
+        self.embedding_dir = embedding_dir or os.environ.get('SEMANTIC_EMBEDDING_DIR')
+        self._embedding_store = None
+        self._vector_dim = None
+        self._semantic_index = None
+        self._indexed_rows = 0
+        self._index_lock = threading.Lock()
         self.intent_keywords = self._load_intent_keywords()
         self.categories_map = self._load_categories_map()
+        self.sentiment_words = self._load_sentiment_words()
+        
+        # 모든 사전을 한 번에 훑는 매처 (사전 크기와 무관하게 키워드 길이에 비례)
+        self.lexicon_matcher = LexiconMatcher({
+            'categories': self.categories_map,
+            'intent': self.intent_keywords,
+            'sentiment': self.sentiment_words
+        })
+        
+        # 명사 추출 캐시와 어절 사전 빠른 경로 (SEMANTIC_NOUN_FAST_PATH=0이면 항상 spaCy 사용)
+        meta = self.nlp.meta
+        self.noun_extractor = NounExtractor(
+            self.nlp,
+            f"{meta.get('lang', 'ko')}_{meta.get('name', 'unknown')}-{meta.get('version', '0')}",
+            lexicon_dir=os.environ.get('SEMANTIC_NOUN_LEXICON_DIR'),
+            max_words=0 if os.environ.get('SEMANTIC_NOUN_FAST_PATH') == '0' else 4,
+            disable=self._disabled_components()
+        )
         
     def _load_intent_keywords(self):
         """검색 의도 관련 키워드 사전 로드"""
@@ -63,6 +103,13 @@ class SemanticKeywordAnalyzer:
             "건강": ["건강", "다이어트", "영양", "보충제", "보조", "약", "영양제", "식품"]
         }
         
+    def _load_sentiment_words(self):
+        """감성 사전 로드"""
+        return {
+            "positive": ["좋은", "훌륭한", "추천", "최고", "베스트", "인기", "효과"],
+            "negative": ["나쁜", "최악", "문제", "안좋은", "부작용", "위험", "사기"]
+        }
+        
     def analyze_keyword_meaning(self, keyword):
         """
         키워드의 의미적 분석
@@ -73,20 +120,64 @@ class SemanticKeywordAnalyzer:
         Returns:
             의미 분석 결과 딕셔너리
         """
-        # 형태소 분석 및 품사 태깅
-        doc = self.nlp(keyword)
+        # 명사 추출 (캐시/어절 사전으로 판별할 수 없을 때만 spaCy 태깅)
+        nouns = self.noun_extractor.extract(keyword)
+        
+        return self._analyze_nouns(keyword, nouns)
+    
+    def analyze_keywords_meaning_batch(self, keywords, batch_size=None, n_process=1):
+        """
+        여러 키워드의 의미적 분석 (스트리밍)
+        
+        batch_size개씩 명사를 추출하며, 캐시/어절 사전으로 판별할 수 없는 키워드만
+        nlp.pipe로 태깅합니다. n_process > 1이면 spaCy 멀티프로세싱을 사용합니다.
+        
+        Args:
+            keywords: 키워드 문자열 이터러블 (리스트 또는 파일에서 읽는 제너레이터)
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            n_process: spaCy 처리 프로세스 수
+            
+        Yields:
+            키워드별 의미 분석 결과 딕셔너리 (입력 순서 유지)
+        """
+        batch_size = batch_size or self.batch_size
+        chunk = []
+        for keyword in keywords:
+            chunk.append(keyword)
+            if len(chunk) >= batch_size:
+                yield from self._analyze_chunk(chunk, batch_size, n_process)
+                chunk = []
+        if chunk:
+            yield from self._analyze_chunk(chunk, batch_size, n_process)
+    
+    def _analyze_chunk(self, keywords, batch_size, n_process):
+        """키워드 묶음 명사 추출 후 의미 분석 결과 생성"""
+        noun_lists = self.noun_extractor.extract_batch(keywords, batch_size=batch_size, n_process=n_process)
+        for keyword, nouns in zip(keywords, noun_lists):
+            yield self._analyze_nouns(keyword, nouns)
+    
+    def _analyze_nouns(self, keyword, nouns):
+        """
+        추출한 명사로 의미 분석 결과 생성
         
-        # 명사 추출
-        nouns = [token.text for token in doc if token.pos_ == 'NOUN']
+        Args:
+            keyword: 키워드 문자열
+            nouns: keyword의 명사 목록
+            
+        Returns:
+            의미 분석 결과 딕셔너리
+        """
+        # 키워드 전체의 사전 매칭은 한 번만 수행해 카테고리/의도/감성 분석에 공유
+        matches = self.lexicon_matcher.match(keyword)
         
         # 의미 카테고리 분류
-        categories = self._classify_semantic_categories(keyword, nouns)
+        categories = self._classify_semantic_categories(keyword, nouns, keyword_matches=matches)
         
         # 키워드 의도 분석 (정보 탐색, 구매 의도 등)
-        intent = self._analyze_search_intent(keyword)
+        intent = self._analyze_search_intent(keyword, matches=matches)
         
         # 키워드 감성 분석
-        sentiment = self._analyze_sentiment(keyword)
+        sentiment = self._analyze_sentiment(keyword, matches=matches)
         
         return {
             'keyword': keyword,
@@ -96,37 +187,38 @@ class SemanticKeywordAnalyzer:
             'sentiment': sentiment
         }
     
-    def _classify_semantic_categories(self, keyword, nouns):
+    def _classify_semantic_categories(self, keyword, nouns, keyword_matches=None):
         """
         키워드의 의미 카테고리 분류
         
         Args:
             keyword: 키워드 문자열
             nouns: 추출된 명사 목록
+            keyword_matches: 키워드 전체에 대한 lexicon_matcher 결과 (없으면 새로 계산)
             
         Returns:
             카테고리와 점수 목록
         """
-        categories = []
+        if keyword_matches is None:
+            keyword_matches = self.lexicon_matcher.match(keyword)
         
-        # 전체 키워드와 명사 결합
-        tokens = [keyword] + nouns
+        # 전체 키워드와 명사 결합 (토큰별 매칭 결과)
+        token_matches = [keyword_matches.get('categories', {})]
+        for noun in nouns:
+            token_matches.append(self.lexicon_matcher.match(noun).get('categories', {}))
+        
+        categories = []
         
         # 각 카테고리별 점수 계산
-        for category, related_words in self.categories_map.items():
-            score = 0
+        for category in self.categories_map:
             matches = []
+            for matched in token_matches:
+                matches.extend(matched.get(category, []))
             
-            for token in tokens:
-                for word in related_words:
-                    if word in token:
-                        score += 1
-                        matches.append(word)
-            
-            if score > 0:
+            if matches:
                 categories.append({
                     'category': category,
-                    'score': score,
+                    'score': len(matches),
                     'matches': matches
                 })
         
@@ -136,32 +228,30 @@ class SemanticKeywordAnalyzer:
         # 상위 3개만 반환
         return categories[:3]
     
-    def _analyze_search_intent(self, keyword):
+    def _analyze_search_intent(self, keyword, matches=None):
         """
         검색 의도 분석
         
         Args:
             keyword: 키워드 문자열
+            matches: 키워드에 대한 lexicon_matcher 결과 (없으면 새로 계산)
             
         Returns:
             의도 분석 결과 딕셔너리
         """
+        if matches is None:
+            matches = self.lexicon_matcher.match(keyword)
+        intent_matches = matches.get('intent', {})
+        
         intents = []
         
-        for intent, words in self.intent_keywords.items():
-            score = 0
-            matches = []
-            
-            for word in words:
-                if word in keyword:
-                    score += 1
-                    matches.append(word)
-            
-            if score > 0:
+        for intent in self.intent_keywords:
+            words = intent_matches.get(intent)
+            if words:
                 intents.append({
                     'intent': intent,
-                    'score': score,
-                    'matches': matches
+                    'score': len(words),
+                    'matches': words
                 })
         
         intents.sort(key=lambda x: x['score'], reverse=True)
@@ -177,29 +267,23 @@ class SemanticKeywordAnalyzer:
             'matches': []
         }
     
-    def _analyze_sentiment(self, keyword):
+    def _analyze_sentiment(self, keyword, matches=None):
         """
         감성 분석
         
         Args:
             keyword: 키워드 문자열
+            matches: 키워드에 대한 lexicon_matcher 결과 (없으면 새로 계산)
             
         Returns:
             감성 분석 결과
         """
-        positive_words = ["좋은", "훌륭한", "추천", "최고", "베스트", "인기", "효과"]
-        negative_words = ["나쁜", "최악", "문제", "안좋은", "부작용", "위험", "사기"]
+        if matches is None:
+            matches = self.lexicon_matcher.match(keyword)
+        sentiment_matches = matches.get('sentiment', {})
         
-        pos_score = 0
-        neg_score = 0
-        
-        for word in positive_words:
-            if word in keyword:
-                pos_score += 1
-                
-        for word in negative_words:
-            if word in keyword:
-                neg_score += 1
+        pos_score = len(sentiment_matches.get('positive', []))
+        neg_score = len(sentiment_matches.get('negative', []))
         
         # 긍정/부정 점수 산출
         sentiment = "중립"
@@ -214,60 +298,63 @@ class SemanticKeywordAnalyzer:
             'negative_score': neg_score
         }
     
-    def find_semantic_related_keywords(self, keyword, top_n=20):
+    def find_semantic_related_keywords(self, keyword, top_n=20, batch_size=None):
         """
         의미적으로 관련된 키워드 찾기
         
         Args:
             keyword: 기준 키워드
             top_n: 반환할 최대 키워드 수
+            batch_size: 후보 키워드 벡터화 배치 크기 (기본값: self.batch_size)
             
         Returns:
             관련 키워드 리스트
         """
         # scikit-learn 모듈이 없으면 기본 키워드로 대체
         if not SKLEARN_AVAILABLE:
+            record_fallback('default_related_keywords')
             return self._generate_default_related_keywords(keyword)
         
-        # 키워드 토크나이징
-        tokenized = self.nlp(keyword)
-        
-        try:
-            # 벡터 표현
-            keyword_vector = np.mean([token.vector for token in tokenized if token.has_vector], axis=0)
-        except:
-            # 벡터가 없거나 오류가 발생하면 기본 키워드 제시
+        # 키워드 벡터 표현
+        _, keyword_matrix = self._vectorize_keywords([keyword])
+        if len(keyword_matrix) == 0:
+            # 벡터가 없으면 기본 키워드 제시
+            record_fallback('default_related_keywords')
             return self._generate_default_related_keywords(keyword)
+        keyword_vector = keyword_matrix[0]
+        
+        # 이웃 검색 인덱스가 구축되어 있으면 임베딩 저장소 전체에서 검색
+        index = self.semantic_index
+        if index is not None and len(index):
+            candidates = self._search_semantic_index(index, keyword, keyword_vector, top_n)
+            if len(candidates) < top_n:
+                candidates.extend(self._generate_default_related_keywords(keyword))
+            return candidates[:top_n]
         
         # 데이터베이스에서 키워드 목록 가져오기
+        from_db = False
         if self.db:
             try:
                 all_keywords = self.db.getAllKeywords(limit=1000)  # DB 키워드 사용
+                from_db = True
             except:
+                record_fallback('default_keywords')
                 all_keywords = self._generate_default_keywords(keyword)  # 기본 키워드 사용
         else:
             all_keywords = self._generate_default_keywords(keyword)  # 기본 키워드 사용
-            
-        # 의미적 유사 키워드 후보 목록
-        candidates = []
         
-        for kw in all_keywords:
-            try:
-                # 유사도 계산
-                kw_doc = self.nlp(kw)
-                kw_vector = np.mean([token.vector for token in kw_doc if token.has_vector], axis=0)
-                similarity = cosine_similarity([keyword_vector], [kw_vector])[0][0]
-                
-                if similarity > 0.6:  # 유사도 임계값
-                    candidates.append({
-                        'keyword': kw,
-                        'similarity': float(similarity)
-                    })
-            except Exception as e:
-                continue
-                
-        # 유사도 기준 상위 n개 반환
-        candidates.sort(key=lambda x: x['similarity'], reverse=True)
+        # 후보 키워드를 한 번에 벡터화한 뒤 행렬-벡터 곱으로 유사도 계산 (DB 키워드만 저장소에 추가)
+        valid_keywords, matrix = self._vectorize_keywords(all_keywords, batch_size=batch_size,
+                                                          store=from_db)
+        indices, similarities = self._top_k_similar(keyword_vector, matrix, top_n)
+        
+        candidates = [
+            {
+                'keyword': valid_keywords[i],
+                'similarity': float(similarity)
+            }
+            for i, similarity in zip(indices, similarities)
+        ]
         
         # 결과가 충분하지 않으면 기본 키워드로 보충
         if len(candidates) < top_n:
@@ -275,15 +362,269 @@ class SemanticKeywordAnalyzer:
             
         return candidates[:top_n]
     
+    def _search_semantic_index(self, index, keyword, keyword_vector, top_n):
+        """이웃 검색 인덱스에서 유사도 임계값을 넘는 연관 키워드 검색 (기준 키워드 자신은 제외)"""
+        ids, similarities = index.search(keyword_vector, top_n + 1)
+        keywords = self.embedding_store.keywords
+        
+        candidates = []
+        for row, similarity in zip(ids, similarities):
+            if similarity <= self.SIMILARITY_THRESHOLD or keywords[row] == keyword:
+                continue
+            candidates.append({
+                'keyword': keywords[row],
+                'similarity': float(similarity)
+            })
+        return candidates[:top_n]
+    
+    @property
+    def semantic_index(self):
+        """
+        임베딩 저장소 위의 이웃 검색 인덱스
+        
+        rebuild_semantic_index로 구축된 인덱스 파일이 없으면 None을 반환합니다.
+        저장소에 새로 추가된 키워드는 검색 전에 인덱스에 증분 반영됩니다.
+        """
+        store = self.embedding_store
+        if store is None:
+            return None
+        
+        with self._index_lock:
+            if self._semantic_index is None:
+                path = self._semantic_index_path(store)
+                if not os.path.exists(path):
+                    return None
+                self._semantic_index, self._indexed_rows = load_index(path)
+            
+            store.refresh()
+            if len(store) > self._indexed_rows:
+                self._add_store_rows(self._semantic_index, store, self._indexed_rows)
+                self._indexed_rows = len(store)
+            
+            return self._semantic_index
+    
+    def rebuild_semantic_index(self, exact_threshold=20000, n_lists=None, n_probe=16,
+                               recall_queries=100, k=20, seed=42):
+        """
+        임베딩 저장소 전체로 이웃 검색 인덱스 재구축
+        
+        Args:
+            exact_threshold: 이보다 작은 코퍼스는 완전 탐색 인덱스 사용
+            n_lists: IVF 셀 수 (기본값: sqrt(N))
+            n_probe: IVF 검색 시 확인할 셀 수
+            recall_queries: 재현율 측정에 사용할 표본 질의 수 (0이면 측정 생략)
+            k: 재현율 측정 이웃 수
+            seed: 난수 시드
+            
+        Returns:
+            인덱스 종류, 크기, 재현율 정보 딕셔너리
+        """
+        store = self.embedding_store
+        if store is None:
+            raise RuntimeError('임베딩 저장소를 사용할 수 없습니다.')
+        
+        store.refresh()
+        count = len(store)
+        matrix = store.matrix
+        rows = np.flatnonzero(np.any(matrix != 0, axis=1))
+        if len(rows) == 0:
+            raise RuntimeError('인덱스를 구축할 키워드 벡터가 없습니다.')
+        vectors = np.asarray(matrix[rows])
+        
+        index = build_index(rows, vectors, exact_threshold=exact_threshold,
+                            n_lists=n_lists, n_probe=n_probe, seed=seed)
+        save_index(index, self._semantic_index_path(store), count)
+        
+        with self._index_lock:
+            self._semantic_index = index
+            self._indexed_rows = count
+        
+        result = {
+            'kind': index.kind,
+            'size': len(index),
+            'dim': int(index.dim)
+        }
+        
+        if index.kind != ExactIndex.kind and recall_queries > 0:
+            exact = ExactIndex(index.dim)
+            exact.add(rows, vectors)
+            rng = np.random.default_rng(seed)
+            sample = rng.choice(len(vectors), min(recall_queries, len(vectors)), replace=False)
+            result['recall'] = measure_recall(index, exact, vectors[sample], k=k)
+        
+        return result
+    
+    def _semantic_index_path(self, store):
+        """임베딩 저장소에 대응하는 인덱스 파일 경로"""
+        return os.path.join(store.store_dir, f'{store.key}.index.npz')
+    
+    def _add_store_rows(self, index, store, start):
+        """임베딩 저장소의 start 행 이후 벡터를 인덱스에 추가"""
+        vectors = np.asarray(store.matrix[start:])
+        valid = np.flatnonzero(np.any(vectors != 0, axis=1))
+        index.add(valid + start, vectors[valid])
+    
+    def _disabled_components(self):
+        """현재 파이프라인에서 비활성화할 컴포넌트 목록"""
+        return [name for name in self.UNUSED_PIPE_COMPONENTS if name in self.nlp.pipe_names]
+    
+    @property
+    def vector_dim(self):
+        """파이프라인이 생성하는 토큰 벡터 차원"""
+        if self._vector_dim is None:
+            disabled = self._disabled_components()
+            probe = next(self.nlp.pipe(['벡터'], disable=disabled))
+            self._vector_dim = int(probe[0].vector.shape[0]) if len(probe) else 0
+        return self._vector_dim
+    
+    @property
+    def vector_space_key(self):
+        """키워드 벡터 공간 식별자 (모델 이름/버전/차원, 세그먼트 모델 호환성 확인용)"""
+        meta = self.nlp.meta
+        return f"{meta.get('lang', 'ko')}_{meta.get('name', 'unknown')}-{meta.get('version', '0')}-{self.vector_dim}"
+    
+    @property
+    def embedding_store(self):
+        """현재 파이프라인 모델에 대응하는 임베딩 저장소 (사용 불가 시 None)"""
+        if self._embedding_store is None and self.use_embedding_store:
+            try:
+                meta = self.nlp.meta
+                self._embedding_store = KeywordEmbeddingStore(
+                    f"{meta.get('lang', 'ko')}_{meta.get('name', 'unknown')}",
+                    meta.get('version', '0'),
+                    self.vector_dim,
+                    store_dir=self.embedding_dir
+                )
+            except Exception as e:
+                logging.warning(f"임베딩 저장소 사용 불가: {str(e)}")
+                self.use_embedding_store = False
+        return self._embedding_store
+    
+    def _vectorize_keywords(self, keywords, batch_size=None, store=False):
+        """
+        키워드 목록 일괄 벡터화
+        
+        임베딩 저장소에 있는 키워드는 저장된 벡터를 사용하고 나머지만 계산합니다.
+        저장소의 키워드는 이웃 검색 인덱스의 연관 키워드 후보가 되므로, 색인기나
+        데이터베이스에서 온 키워드(store=True)만 저장소에 추가하고 질의/요청 키워드는
+        추가하지 않습니다. 벡터가 있는 토큰이 하나도 없는 키워드는 제외합니다.
+        
+        Args:
+            keywords: 키워드 문자열 목록
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            store: 저장소에 없는 키워드 벡터를 저장소에 추가할지 여부
+            
+        Returns:
+            (유효 키워드 목록, (N, dim) float32 벡터 행렬)
+        """
+        keywords = list(keywords)
+        embedding_store = self.embedding_store
+        
+        if embedding_store is None:
+            matrix, has_vector = self._compute_keyword_vectors(keywords, batch_size)
+        else:
+            rows = embedding_store.lookup(keywords)
+            missing = list(dict.fromkeys(kw for kw, row in zip(keywords, rows) if row < 0))
+            if missing and store:
+                # 벡터가 없는 키워드도 영벡터로 저장해 다시 계산하지 않음
+                missing_matrix, _ = self._compute_keyword_vectors(missing, batch_size)
+                embedding_store.add(missing, missing_matrix)
+                rows = embedding_store.lookup(keywords)
+                matrix = embedding_store.matrix[rows]
+            elif missing:
+                # 저장하지 않는 키워드는 계산한 벡터를 저장된 벡터 사이에 채움
+                missing_matrix, _ = self._compute_keyword_vectors(missing, batch_size)
+                missing_rows = {kw: i for i, kw in enumerate(missing)}
+                matrix = np.empty((len(keywords), embedding_store.dim), dtype=np.float32)
+                stored = rows >= 0
+                matrix[stored] = embedding_store.matrix[rows[stored]]
+                matrix[~stored] = missing_matrix[[missing_rows[kw] for kw, row in zip(keywords, rows) if row < 0]]
+            else:
+                matrix = embedding_store.matrix[rows]
+            has_vector = np.any(matrix != 0, axis=1)
+        
+        valid = np.flatnonzero(has_vector)
+        return [keywords[i] for i in valid], np.ascontiguousarray(matrix[valid], dtype=np.float32)
+    
+    def _compute_keyword_vectors(self, keywords, batch_size=None):
+        """
+        nlp.pipe로 키워드 벡터 계산
+        
+        Args:
+            keywords: 키워드 문자열 목록
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            
+        Returns:
+            ((N, dim) float32 벡터 행렬, 벡터 존재 여부 불리언 배열)
+        """
+        disabled = self._disabled_components()
+        docs = self.nlp.pipe(keywords, batch_size=batch_size or self.batch_size, disable=disabled)
+        
+        matrix = np.zeros((len(keywords), self.vector_dim), dtype=np.float32)
+        has_vector = np.zeros(len(keywords), dtype=bool)
+        for i, doc in enumerate(docs):
+            # 같은 Doc에서 명사도 추출해 두면 세그먼트 레이블 생성 시 다시 태깅하지 않음
+            self.noun_extractor.record(keywords[i], doc)
+            token_vectors = [token.vector for token in doc if token.has_vector]
+            if token_vectors:
+                matrix[i] = np.mean(token_vectors, axis=0)
+                has_vector[i] = True
+            
+        return matrix, has_vector
+    
+    def extract_nouns_batch(self, keywords, batch_size=None):
+        """
+        키워드 목록의 명사 추출
+        
+        의미 분석이나 벡터 계산 중에 이미 태깅한 키워드는 캐시된 결과를, 짧은 검색어는
+        어절 사전을 사용하고 나머지만 nlp.pipe로 한 번에 태깅합니다.
+        
+        Args:
+            keywords: 키워드 문자열 목록
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            
+        Returns:
+            키워드별 명사 목록의 리스트 (입력 순서)
+        """
+        return self.noun_extractor.extract_batch(keywords, batch_size=batch_size or self.batch_size)
+    
+    def _top_k_similar(self, query_vector, matrix, top_n):
+        """
+        코사인 유사도 상위 k개 선택
+        
+        Args:
+            query_vector: 기준 벡터
+            matrix: (N, dim) 후보 벡터 행렬
+            top_n: 반환할 최대 개수
+            
+        Returns:
+            (유사도 내림차순 후보 인덱스 배열, 유사도 배열)
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+        query_norm = np.linalg.norm(query_vector)
+        if len(matrix) == 0 or top_n <= 0 or query_norm == 0:
+            return empty
+        
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = np.inf  # 영벡터는 유사도 0
+        similarities = (matrix @ (query_vector / query_norm)) / norms
+        
+        indices = np.flatnonzero(similarities > self.SIMILARITY_THRESHOLD)
+        if len(indices) > top_n:
+            indices = np.sort(indices[np.argpartition(-similarities[indices], top_n - 1)[:top_n]])
+        indices = indices[np.argsort(-similarities[indices], kind='stable')]
+        
+        return indices, similarities[indices]
+    
     def _generate_default_keywords(self, base_keyword):
-        """기본 키워드 생성"""
+        """기본 키워드 생성 (DB가 없을 때의 기본 후보 목록, 실패 시에만 호출부에서 대체 결과로 기록)"""
         return [
             "의류", "가전", "식품", "화장품", "가구", "도서", "스포츠", "자동차",
             "여행", "주방", "컴퓨터", "가방", "신발", "액세서리", "건강식품"
         ]
     
     def _generate_default_related_keywords(self, keyword):
-        """기본 연관 키워드 생성"""
+        """기본 연관 키워드 생성 (결과가 부족할 때 보충용으로도 사용, 실패 시에만 호출부에서 대체 결과로 기록)"""
         default_suffixes = ["추천", "가격", "할인", "후기", "구매", "비교", "종류", "브랜드", "사용법", "효과"]
         default_prefixes = ["인기", "최고", "저렴한", "고급", "추천", "신상", "할인", "프리미엄"]
         
@@ -315,63 +656,140 @@ class SemanticKeywordAnalyzer:
         """
         # scikit-learn 모듈이 없으면 기본 세그먼트 생성
         if not SKLEARN_AVAILABLE:
+            record_fallback('default_segments')
             return self._generate_default_segments(keyword, related_keywords)
             
         # 모든 키워드 통합
         all_keywords = [keyword] + [kw['keyword'] for kw in related_keywords]
         
-        # 각 키워드의 벡터 표현
-        vectors = []
-        valid_keywords = []
+        try:
+            # 최대 5개 세그먼트 (세그먼트 수는 실루엣 점수로 선택)
+            result = self.segment_keywords(all_keywords, k_values=range(2, 6))
+        except Exception as e:
+            logging.error(f"세그먼트 분할 오류: {str(e)}")
+            record_fallback('default_segments')
+            return self._generate_default_segments(keyword, related_keywords)
         
-        for kw in all_keywords:
-            try:
-                doc = self.nlp(kw)
-                vec = np.mean([token.vector for token in doc if token.has_vector], axis=0)
-                vectors.append(vec)
-                valid_keywords.append(kw)
-            except Exception as e:
-                continue
-                
-        if not vectors:
+        if not result['segments']:
+            # 벡터화된 키워드가 부족해 군집화하지 못함
+            record_fallback('default_segments')
             return self._generate_default_segments(keyword, related_keywords)
             
-        try:
-            # 클러스터링 (K-means)
-            n_clusters = min(5, len(vectors))  # 최대 5개 세그먼트
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
-            clusters = kmeans.fit_predict(vectors)
+        return [
+            {'id': segment['id'], 'label': segment['label'], 'keywords': segment['keywords']}
+            for segment in result['segments']
+        ]
+    
+    def segment_keywords(self, keywords, n_clusters=None, k_values=range(2, 9),
+                         max_keywords_per_segment=None, batch_size=None, seed=42):
+        """
+        키워드 목록 세그먼트 분할
+        
+        벡터는 임베딩 저장소, 명사는 명사 캐시에서 가져오므로 카테고리 전체 키워드처럼
+        이미 색인된 목록은 spaCy를 다시 실행하지 않고 군집화만 수행합니다.
+        
+        Args:
+            keywords: 키워드 문자열 목록
+            n_clusters: 세그먼트 수 (None이면 k_values 중 실루엣 점수로 선택)
+            k_values: 자동 선택 시 후보 세그먼트 수
+            max_keywords_per_segment: 세그먼트별로 반환할 최대 키워드 수 (None이면 전체)
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            seed: 난수 시드
             
-            # 세그먼트별 키워드 그룹화
-            segments = {}
-            for i, cluster_id in enumerate(clusters):
-                if cluster_id not in segments:
-                    segments[cluster_id] = []
-                segments[cluster_id].append(valid_keywords[i])
-                
-            # 각 세그먼트에 대표 레이블 부여
-            labeled_segments = []
-            for cluster_id, keywords in segments.items():
-                # 가장 높은 빈도의 명사 추출
-                all_nouns = []
-                for kw in keywords:
-                    doc = self.nlp(kw)
-                    nouns = [token.text for token in doc if token.pos_ == 'NOUN']
-                    all_nouns.extend(nouns)
-                    
-                noun_counter = Counter(all_nouns)
-                top_nouns = [noun for noun, _ in noun_counter.most_common(3)]
-                
-                labeled_segments.append({
-                    'id': int(cluster_id),
-                    'label': ' '.join(top_nouns),
-                    'keywords': keywords
-                })
-                
-            return labeled_segments
-        except Exception as e:
-            return self._generate_default_segments(keyword, related_keywords)
+        Returns:
+            {"k", "silhouette_scores", "segments": [{"id", "label", "size", "keywords"}, ...]} 딕셔너리
+        """
+        keywords = list(dict.fromkeys(keywords))
+        valid_keywords, vectors = self._vectorize_keywords(keywords, batch_size=batch_size)
+        noun_lists = self.extract_nouns_batch(valid_keywords, batch_size=batch_size)
+        
+        result = cluster_keywords(
+            valid_keywords, vectors, noun_lists,
+            n_clusters=n_clusters,
+            k_values=k_values,
+            max_keywords_per_segment=max_keywords_per_segment,
+            seed=seed
+        )
+        result['keywords'] = len(keywords)
+        result['vectorized'] = len(valid_keywords)
+        return result
+            
+    def fit_segment_model(self, store, category, keywords, n_clusters=None, k_values=range(2, 9),
+                          batch_size=None, seed=42):
+        """
+        카테고리 세그먼트 모델 학습 후 저장
+        
+        Args:
+            store: SegmentModelStore 인스턴스
+            category: 카테고리 이름
+            keywords: 카테고리 키워드 목록
+            n_clusters: 세그먼트 수 (None이면 k_values 중 실루엣 점수로 선택)
+            k_values: 자동 선택 시 후보 세그먼트 수
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            seed: 난수 시드
             
+        Returns:
+            {"category", "k", "segments": [{"id", "label", "size"}, ...], "keywords", "vectorized"} 딕셔너리
+        """
+        keywords = list(dict.fromkeys(keywords))
+        valid_keywords, vectors = self._vectorize_keywords(keywords, batch_size=batch_size)
+        noun_lists = self.extract_nouns_batch(valid_keywords, batch_size=batch_size)
+        
+        model, _ = SegmentModel.fit(
+            category, vectors, noun_lists, self.vector_space_key,
+            n_clusters=n_clusters, k_values=k_values, seed=seed
+        )
+        store.put(model)
+        logging.info(f"세그먼트 모델 저장: {category} (키워드 {len(valid_keywords)}개, 세그먼트 {model.n_clusters}개)")
+        
+        return {
+            'category': category,
+            'k': model.n_clusters,
+            'segments': model.summary(),
+            'keywords': len(keywords),
+            'vectorized': len(valid_keywords)
+        }
+    
+    def assign_segments(self, store, category, keywords, update=True, batch_size=None):
+        """
+        저장된 카테고리 세그먼트 모델로 키워드 배정 (재군집화 없음)
+        
+        Args:
+            store: SegmentModelStore 인스턴스
+            category: 카테고리 이름
+            keywords: 배정할 키워드 목록
+            update: 배정한 키워드를 백그라운드 모델 갱신 대기열에 추가할지 여부
+            batch_size: nlp.pipe 배치 크기 (기본값: self.batch_size)
+            
+        Returns:
+            키워드별 {"keyword", "segment_id", "label", "distance"} 목록 (입력 순서,
+            벡터가 없는 키워드는 segment_id가 None)
+        """
+        model = store.get(category)
+        if model is None:
+            raise ModelNotAvailableError(
+                f'세그먼트 모델이 없습니다: {category} (fit_segment_model로 먼저 학습하세요)'
+            )
+        if model.vector_key != self.vector_space_key:
+            raise ValueError(
+                f'세그먼트 모델 벡터 공간 불일치: {model.vector_key} (현재: {self.vector_space_key}), 다시 학습하세요'
+            )
+        
+        keywords = list(keywords)
+        valid_keywords, vectors = self._vectorize_keywords(keywords, batch_size=batch_size)
+        segment_ids, distances = model.assign(vectors)
+        labels = model.labels
+        
+        if update and len(valid_keywords):
+            store.observe(category, vectors, self.extract_nouns_batch(valid_keywords, batch_size=batch_size))
+        
+        assigned = {
+            keyword: {'segment_id': int(segment_id), 'label': labels[segment_id], 'distance': float(distance)}
+            for keyword, segment_id, distance in zip(valid_keywords, segment_ids, distances)
+        }
+        empty = {'segment_id': None, 'label': None, 'distance': None}
+        return [{'keyword': keyword, **assigned.get(keyword, empty)} for keyword in keywords]
+    
     def _generate_default_segments(self, keyword, related_keywords):
         """기본 세그먼트 생성"""
         # 키워드 목록을 카테고리별로 그룹화
@@ -416,25 +834,255 @@ class SemanticKeywordAnalyzer:
             
         return result_segments
 
+# 프로세스 전역 공유 분석기 (spaCy 파이프라인은 프로세스당 한 번만 로드)
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_shared_analyzer():
+    """
+    공유 분석기 반환
+
+    최초 호출 시에만 SemanticKeywordAnalyzer를 생성하며, 여러 스레드에서
+    동시에 호출해도 spaCy 모델은 한 번만 로드됩니다.
+
+    Returns:
+        공유 SemanticKeywordAnalyzer 인스턴스
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_analyzer_lock:
+            if _shared_analyzer is None:
+                _shared_analyzer = SemanticKeywordAnalyzer()
+    return _shared_analyzer
+
+# 프로세스 전역 세그먼트 모델 저장소 (ML_SEGMENT_DIR로 디렉토리 지정)
+_segment_store = None
+_segment_store_lock = threading.Lock()
+
+def get_segment_store():
+    """
+    공유 세그먼트 모델 저장소 반환
+    
+    ML_SEGMENT_REFIT_MIN_PENDING 환경 변수로 백그라운드 갱신을 시작하는 대기 키워드 수를 조정합니다.
+    
+    Returns:
+        공유 SegmentModelStore 인스턴스
+    """
+    global _segment_store
+    if _segment_store is None:
+        with _segment_store_lock:
+            if _segment_store is None:
+                _segment_store = SegmentModelStore(
+                    os.environ.get('ML_SEGMENT_DIR'),
+                    refit_min_pending=int(os.environ.get('ML_SEGMENT_REFIT_MIN_PENDING', 512))
+                )
+    return _segment_store
+
+# 프로세스 전역 결과 캐시 (환경 변수로 크기/TTL/영속 저장소 설정)
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """
+    공유 결과 캐시 반환
+    
+    SEMANTIC_CACHE_SIZE(항목 수), SEMANTIC_CACHE_MAX_BYTES, SEMANTIC_CACHE_TTL(초) 환경 변수로
+    제한을 조정하고, SEMANTIC_CACHE_DB에 SQLite 파일 경로를 지정하면 재시작 후에도 유지됩니다.
+    대체 결과는 SEMANTIC_CACHE_FALLBACK_TTL(초, 기본 60) 동안만 메모리에 보관합니다.
+    
+    Returns:
+        공유 LRUCache 인스턴스
+    """
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                backend = None
+                db_path = os.environ.get('SEMANTIC_CACHE_DB')
+                if db_path:
+                    try:
+                        backend = SQLiteCacheBackend(db_path)
+                    except Exception as e:
+                        logging.warning(f"캐시 저장소 사용 불가: {str(e)}")
+                
+                ttl = float(os.environ.get('SEMANTIC_CACHE_TTL', 3600))
+                fallback_ttl = float(os.environ.get('SEMANTIC_CACHE_FALLBACK_TTL', 60))
+                _result_cache = LRUCache(
+                    max_entries=int(os.environ.get('SEMANTIC_CACHE_SIZE', 2048)),
+                    max_bytes=int(os.environ.get('SEMANTIC_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+                    ttl=ttl if ttl > 0 else None,
+                    backend=backend,
+                    # 기본 키워드/세그먼트 등 대체 결과는 짧게만 보관 (0이면 저장 안 함)
+                    fallback_ttl=fallback_ttl if fallback_ttl > 0 else None,
+                    fallback_count=fallback_count,
+                    record_fallback=record_fallback
+                )
+    return _result_cache
+
+def warmup():
+    """
+    공유 분석기 사전 초기화
+
+    서버 시작 시 호출하면 첫 요청이 모델 로드 비용을 부담하지 않습니다.
+
+    Returns:
+        공유 SemanticKeywordAnalyzer 인스턴스
+    """
+    analyzer = get_shared_analyzer()
+    # 파이프라인 첫 실행 시의 지연 초기화 비용도 미리 지불
+    analyzer.nlp('워밍업')
+    return analyzer
+
+def index_keywords(keywords):
+    """
+    키워드 벡터를 미리 계산해 임베딩 저장소에 추가
+    
+    새 키워드가 데이터베이스에 저장될 때 호출하면 이후 유사도 계산에서
+    벡터를 다시 계산하지 않습니다.
+    
+    Args:
+        keywords: 키워드 문자열 목록
+        
+    Returns:
+        벡터가 있는 키워드 수
+    """
+    analyzer = get_shared_analyzer()
+    valid_keywords, _ = analyzer._vectorize_keywords(keywords, store=True)
+    return len(valid_keywords)
+
+def rebuild_semantic_index(**options):
+    """
+    연관 키워드 검색용 이웃 인덱스 재구축
+    
+    Args:
+        **options: SemanticKeywordAnalyzer.rebuild_semantic_index 옵션
+        
+    Returns:
+        인덱스 구축 결과 딕셔너리
+    """
+    analyzer = get_shared_analyzer()
+    return analyzer.rebuild_semantic_index(**options)
+
+def segment_keywords(keywords, **options):
+    """
+    카테고리 등 대량 키워드 목록 세그먼트 분할
+    
+    Args:
+        keywords: 키워드 문자열 목록
+        **options: SemanticKeywordAnalyzer.segment_keywords 옵션
+        
+    Returns:
+        세그먼트 분할 결과 딕셔너리
+    """
+    analyzer = get_shared_analyzer()
+    return analyzer.segment_keywords(keywords, **options)
+
+def fit_segment_model(category, keywords, **options):
+    """
+    카테고리 세그먼트 모델 학습 후 저장
+    
+    Args:
+        category: 카테고리 이름
+        keywords: 카테고리 키워드 목록
+        **options: SemanticKeywordAnalyzer.fit_segment_model 옵션
+        
+    Returns:
+        학습 결과 딕셔너리
+    """
+    analyzer = get_shared_analyzer()
+    return analyzer.fit_segment_model(get_segment_store(), category, keywords, **options)
+
+def assign_segments(category, keywords, update=True):
+    """
+    저장된 카테고리 세그먼트 모델로 키워드 배정
+    
+    Args:
+        category: 카테고리 이름
+        keywords: 배정할 키워드 목록
+        update: 배정한 키워드를 모델 갱신에 반영할지 여부
+        
+    Returns:
+        키워드별 배정 결과 목록
+    """
+    analyzer = get_shared_analyzer()
+    return analyzer.assign_segments(get_segment_store(), category, keywords, update=update)
+
+def iter_keywords_file(path):
+    """
+    키워드 파일 읽기
+    
+    JSONL 파일의 각 줄은 JSON 문자열, {"keyword": ...} 객체 또는 일반 텍스트일 수 있습니다.
+    
+    Args:
+        path: 키워드 파일 경로
+        
+    Yields:
+        키워드 문자열
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line[0] in '{"':
+                item = json.loads(line)
+                keyword = item.get('keyword', '') if isinstance(item, dict) else item
+            else:
+                keyword = line
+            if keyword:
+                yield keyword
+
 # API 처리 함수들
 def analyze_keyword(keyword):
     """키워드 의미 분석"""
-    analyzer = SemanticKeywordAnalyzer()
-    analysis = analyzer.analyze_keyword_meaning(keyword)
+    analysis = get_result_cache().get_or_compute(
+        make_cache_key('analyze_keyword', keyword),
+        lambda: get_shared_analyzer().analyze_keyword_meaning(keyword)
+    )
+    # 정규화 전 키워드 표기는 요청 그대로 유지
+    analysis['keyword'] = keyword
     return analysis
 
+def analyze_keywords_batch(keywords, batch_size=None, n_process=1):
+    """여러 키워드 의미 분석 (결과를 하나씩 반환하는 제너레이터)"""
+    analyzer = get_shared_analyzer()
+    return analyzer.analyze_keywords_meaning_batch(keywords, batch_size=batch_size, n_process=n_process)
+
 def find_related_keywords(keyword, limit=20):
     """의미적 연관 키워드 찾기"""
-    analyzer = SemanticKeywordAnalyzer()
-    related = analyzer.find_semantic_related_keywords(keyword, top_n=limit)
-    return related
+    return get_result_cache().get_or_compute(
+        make_cache_key('find_related_keywords', keyword, limit=limit),
+        lambda: get_shared_analyzer().find_semantic_related_keywords(keyword, top_n=limit)
+    )
 
-def identify_segments(keyword):
-    """키워드 시장 세그먼트 식별"""
-    analyzer = SemanticKeywordAnalyzer()
-    related = analyzer.find_semantic_related_keywords(keyword, top_n=30)
-    segments = analyzer.identify_market_segments(keyword, related)
-    return segments
+def identify_segments(keyword, category=None):
+    """
+    키워드 시장 세그먼트 식별
+    
+    category의 세그먼트 모델이 있으면 다시 군집화하지 않고 기준/연관 키워드를 저장된
+    세그먼트에 배정해 묶습니다.
+    """
+    if category and get_segment_store().get(category) is not None:
+        related = find_related_keywords(keyword, limit=30)
+        assignments = assign_segments(category, [keyword] + [kw['keyword'] for kw in related], update=False)
+        
+        segments = {}
+        for item in assignments:
+            if item['segment_id'] is None:
+                continue
+            segment = segments.setdefault(
+                item['segment_id'], {'id': item['segment_id'], 'label': item['label'], 'keywords': []}
+            )
+            if item['keyword'] not in segment['keywords']:
+                segment['keywords'].append(item['keyword'])
+        return sorted(segments.values(), key=lambda segment: -len(segment['keywords']))
+    
+    def compute():
+        analyzer = get_shared_analyzer()
+        related = find_related_keywords(keyword, limit=30)
+        return analyzer.identify_market_segments(keyword, related)
+    
+    return get_result_cache().get_or_compute(make_cache_key('identify_segments', keyword), compute)
 
 # CLI 테스트
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+"""
+키워드 임베딩 저장소 테스트
+
+python3 -m unittest test_embedding_store (server/api/ml 디렉토리에서 실행)
+"""
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from embedding_store import KeywordEmbeddingStore
+
+class KeywordEmbeddingStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    def open_store(self):
+        return KeywordEmbeddingStore('test', '1', 4, store_dir=self.store_dir, initial_capacity=2)
+
+    def test_line_separator_characters_round_trip(self):
+        """U+2028/U+2029/U+0085 등이 들어간 키워드도 추가 후 다시 열었을 때 한 행으로 유지"""
+        keywords = ['다이어트\u2028보조제', '단백질\u2029쉐이크', '비타민\x85젤리', '줄\n바꿈', '일반 키워드']
+        vectors = np.arange(len(keywords) * 4, dtype=np.float32).reshape(len(keywords), 4)
+
+        store = self.open_store()
+        self.assertEqual(store.add(keywords, vectors), len(keywords))
+        self.assertEqual(store.keywords, keywords)
+
+        reopened = self.open_store()
+        self.assertEqual(reopened.keywords, keywords)
+        np.testing.assert_array_equal(reopened.lookup(keywords), np.arange(len(keywords)))
+        np.testing.assert_array_equal(reopened.matrix, vectors)
+
+    def test_incremental_reload_after_append(self):
+        """다른 인스턴스가 추가한 키워드만 이어서 읽음"""
+        first = self.open_store()
+        second = self.open_store()
+
+        first.add(['가 나'], np.ones((1, 4)))
+        first.add(['다', '라'], np.zeros((2, 4)))
+
+        np.testing.assert_array_equal(second.lookup(['가 나', '다', '라', '없음']), [0, 1, 2, -1])
+        self.assertEqual(len(second), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+ML 모델 오프라인 학습 파이프라인
+
+keywords, keyword_trends, products 테이블로 ML 브릿지가 사용하는 네 가지 모델을 학습하고
+MODEL_DIR에 원자적으로 기록합니다. 브릿지는 요청 처리 중에 모델을 학습하지 않으므로
+배포 후 이 스크립트를 먼저 실행해야 합니다.
+
+사용 예:
+    python3 train_models.py --db gugongil_keywords.db
+    python3 train_models.py --db gugongil_keywords.db --models success_probability
+    python3 train_models.py --allow-demo   # 학습 데이터가 부족하면 데모 데이터 사용
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import logging
+import numpy as np
+import joblib
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+
+from model_registry import ModelRegistry
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+
+# 모델 디렉토리 설정 (ml-bridge.py와 동일)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# 특성 수 (machine-learning-enhancer.ts의 특성 추출 함수와 일치)
+FEATURE_COUNTS = {
+    'search_volume_predictor': 20,
+    'competition_predictor': 10,
+    'trend_classifier': 15,
+    'success_probability': 12
+}
+
+# 기본 수익성 지표 (DB에 없으므로 machine-learning-enhancer.ts 기본값 사용)
+DEFAULT_MARGIN_RATE = 0.3
+DEFAULT_MARGIN_TO_CPC = 5
+
+# 쇼핑 결과 광고 비율 (0~1, DB에 저장되지 않으므로 machine-learning-enhancer.ts 기본값 사용)
+DEFAULT_AD_RATIO = 0.2
+
+def _to_float(value):
+    """숫자 또는 숫자 문자열을 float로 변환 (변환할 수 없으면 None)"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class TrainingDataset:
+    """
+    학습 데이터 로더
+
+    SQLite 데이터베이스에서 키워드별 기본 정보, 트렌드 시계열, 상품 통계를 한 번에 읽습니다.
+    """
+
+    def __init__(self, db_path):
+        """
+        초기화
+
+        Args:
+            db_path: 키워드 분석 SQLite 데이터베이스 경로
+        """
+        self.keywords = []
+        self.trends = {}
+        self.product_stats = {}
+        self.ad_keywords = set()
+
+        if not db_path or not os.path.exists(db_path):
+            logging.warning(f"학습 데이터베이스 없음: {db_path}")
+            return
+
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            self._load(conn)
+        finally:
+            conn.close()
+
+    def _load(self, conn):
+        """테이블 읽기"""
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT id, keyword, search_volume, competition FROM keywords')
+        self.keywords = []
+        skipped = {'search_volume': 0, 'competition': 0}
+        for row in cursor.fetchall():
+            kw = dict(row)
+            # API 경쟁도 지수("높음"/"중간"/"낮음")처럼 숫자가 아닌 값은 결측으로 처리
+            for column in skipped:
+                value = _to_float(kw[column])
+                if value is None and kw[column] is not None:
+                    skipped[column] += 1
+                kw[column] = value
+            self.keywords.append(kw)
+
+        for column, count in skipped.items():
+            if count:
+                logging.warning(f"숫자가 아닌 {column} 값 제외: {count}개 행")
+
+        cursor.execute('''
+        SELECT keyword_id, search_volume
+        FROM keyword_trends
+        WHERE search_volume IS NOT NULL
+        ORDER BY keyword_id, date
+        ''')
+        for row in cursor.fetchall():
+            self.trends.setdefault(row['keyword_id'], []).append(float(row['search_volume']))
+
+        cursor.execute('''
+        SELECT keyword_id,
+               COUNT(*) AS product_count,
+               AVG(price) AS avg_price,
+               AVG(CASE WHEN brand IS NOT NULL AND brand != '' THEN 1.0 ELSE 0.0 END) AS brand_ratio,
+               AVG(review_count) AS avg_reviews,
+               AVG(rating) AS avg_rating
+        FROM products
+        GROUP BY keyword_id
+        ''')
+        self.product_stats = {row['keyword_id']: dict(row) for row in cursor.fetchall()}
+
+        try:
+            cursor.execute('SELECT keyword FROM ad_keywords WHERE is_active = 1')
+            self.ad_keywords = {row['keyword'] for row in cursor.fetchall()}
+        except sqlite3.OperationalError:
+            self.ad_keywords = set()
+
+        logging.info(
+            f"학습 데이터 로드: 키워드 {len(self.keywords)}개, 트렌드 {len(self.trends)}개, "
+            f"상품 통계 {len(self.product_stats)}개"
+        )
+
+def _growth(values):
+    """첫 값 대비 마지막 값 성장률"""
+    if len(values) < 2 or not values[0]:
+        return 0.0
+    return (values[-1] - values[0]) / values[0]
+
+def _keyword_shape(keyword):
+    """키워드 길이와 단어 수"""
+    return [len(keyword), len(keyword.split())]
+
+def _pad(features, size):
+    """특성 벡터를 size 길이로 0 채움"""
+    return features + [0.0] * (size - len(features))
+
+def build_search_volume_samples(dataset):
+    """검색량 예측 학습 데이터 (과거 추이 -> 다음 달 검색량)"""
+    X, y = [], []
+    for kw in dataset.keywords:
+        series = dataset.trends.get(kw['id'], [])
+        for t in range(3, len(series)):
+            history = series[:t]
+            features = _keyword_shape(kw['keyword']) + [
+                float(np.mean(history[-3:])),
+                float(np.mean(history)),
+                _growth(history)
+            ]
+            X.append(_pad(features, FEATURE_COUNTS['search_volume_predictor']))
+            y.append(series[t])
+    return np.array(X, dtype=np.float64), np.array(y, dtype=np.float64)
+
+def build_competition_samples(dataset):
+    """경쟁도 예측 학습 데이터 (키워드/상품 통계 -> 경쟁도)"""
+    X, y = [], []
+    for kw in dataset.keywords:
+        if kw['competition'] is None:
+            continue
+        stats = dataset.product_stats.get(kw['id'], {})
+        features = _keyword_shape(kw['keyword']) + [
+            float(kw['search_volume'] or 0),
+            float(stats.get('product_count') or 0),
+            float(stats.get('avg_price') or 0),
+            float(stats.get('brand_ratio') or 0),
+            float(stats.get('avg_reviews') or 0),
+            float(stats.get('avg_rating') or 0),
+            1.0 if kw['keyword'] in dataset.ad_keywords else 0.0,
+            _growth(dataset.trends.get(kw['id'], []))
+        ]
+        X.append(features)
+        y.append(float(kw['competition']))
+    return np.array(X, dtype=np.float64), np.array(y, dtype=np.float64)
+
+def build_trend_samples(dataset):
+    """트렌드 분류 학습 데이터 (최근 추이 -> 다음 달 상승 여부)"""
+    window = FEATURE_COUNTS['trend_classifier'] - 2
+    X, y = [], []
+    for kw in dataset.keywords:
+        series = dataset.trends.get(kw['id'], [])
+        for t in range(2, len(series)):
+            history = series[max(0, t - window):t]
+            scale = np.mean(history) or 1.0
+            normalized = [value / scale for value in history]
+            features = _keyword_shape(kw['keyword']) + [0.0] * (window - len(normalized)) + normalized
+            X.append(features)
+            y.append(int(series[t] > series[t - 1]))
+    return np.array(X, dtype=np.float64), np.array(y, dtype=np.int64)
+
+def build_success_samples(dataset):
+    """
+    성공 확률 학습 데이터
+
+    DB에 판매 성과가 없으므로 검색량이 중앙값 이상이면서 경쟁도가 중앙값 이하인
+    키워드를 성공(1)으로 표시합니다.
+    """
+    rows = [kw for kw in dataset.keywords if kw['search_volume'] is not None and kw['competition'] is not None]
+    if not rows:
+        return np.empty((0, FEATURE_COUNTS['success_probability'])), np.empty(0, dtype=np.int64)
+
+    volume_median = np.median([kw['search_volume'] for kw in rows])
+    competition_median = np.median([kw['competition'] for kw in rows])
+
+    X, y = [], []
+    for kw in rows:
+        stats = dataset.product_stats.get(kw['id'], {})
+        series = dataset.trends.get(kw['id'], [])
+        features = _keyword_shape(kw['keyword']) + [
+            float(kw['search_volume']),
+            float(stats.get('product_count') or 0),
+            float(stats.get('avg_price') or 0),
+            float(kw['competition']),
+            DEFAULT_AD_RATIO,
+            float(stats.get('brand_ratio') or 0),
+            _growth(series[-4:]),
+            1.0 if len(series) > 1 and series[-1] > series[-2] else 0.0,
+            DEFAULT_MARGIN_RATE,
+            DEFAULT_MARGIN_TO_CPC
+        ]
+        X.append(features)
+        y.append(int(kw['search_volume'] >= volume_median and kw['competition'] <= competition_median))
+    return np.array(X, dtype=np.float64), np.array(y, dtype=np.int64)
+
+def build_demo_samples(name, rng):
+    """학습 데이터가 없을 때 사용할 데모 데이터 (기존 브릿지 내장 데모 모델과 동일한 분포)"""
+    X = rng.random((100, FEATURE_COUNTS[name]))
+    if name == 'search_volume_predictor':
+        y = np.sin(X[:, 0]) + 0.1 * rng.standard_normal(100) + X[:, 1] * 2
+    elif name == 'competition_predictor':
+        y = X[:, 0] * 50 + X[:, 1] * 30 + rng.standard_normal(100) * 5
+    elif name == 'trend_classifier':
+        y = (X[:, 0] + X[:, 1] > 1).astype(int)
+    else:
+        y = (X[:, 0] * 0.3 + X[:, 1] * 0.3 + X[:, 2] * 0.4 > 0.5).astype(int)
+    return X, y
+
+SAMPLE_BUILDERS = {
+    'search_volume_predictor': build_search_volume_samples,
+    'competition_predictor': build_competition_samples,
+    'trend_classifier': build_trend_samples,
+    'success_probability': build_success_samples
+}
+
+CLASSIFIERS = ('trend_classifier', 'success_probability')
+
+def train_model(name, X, y, n_estimators=100, n_jobs=-1, seed=42):
+    """
+    랜덤 포레스트 학습
+
+    Args:
+        name: 모델 이름
+        X: 특성 행렬
+        y: 타깃 배열
+        n_estimators: 트리 수
+        n_jobs: 병렬 학습 프로세스 수 (-1이면 모든 코어)
+        seed: 난수 시드
+
+    Returns:
+        학습된 모델
+    """
+    model_class = RandomForestClassifier if name in CLASSIFIERS else RandomForestRegressor
+    model = model_class(n_estimators=n_estimators, n_jobs=n_jobs, random_state=seed)
+    model.fit(X, y)
+    return model
+
+def save_model_atomic(model, path):
+    """임시 파일에 저장한 뒤 교체해 읽는 쪽이 반쯤 기록된 파일을 보지 않도록 함"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+def train_all(db_path, model_names=None, model_dir=MODEL_DIR, allow_demo=False,
+              min_samples=30, n_estimators=100, n_jobs=-1, seed=42, compile_forest=False):
+    """
+    모델 학습 후 MODEL_DIR에 기록
+
+    Args:
+        db_path: 키워드 분석 SQLite 데이터베이스 경로
+        model_names: 학습할 모델 이름 목록 (기본값: 전체)
+        model_dir: 모델 디렉토리
+        allow_demo: 학습 데이터가 부족한 모델을 데모 데이터로 학습할지 여부
+        min_samples: 모델별 최소 학습 샘플 수
+        n_estimators: 트리 수
+        n_jobs: 병렬 학습 프로세스 수
+        seed: 난수 시드
+        compile_forest: 학습 후 평평한 노드 배열(<이름>.forest.npz)로도 저장할지 여부
+
+    Returns:
+        {모델 이름: 학습 결과 딕셔너리}
+    """
+    os.makedirs(model_dir, exist_ok=True)
+    model_names = model_names or list(SAMPLE_BUILDERS.keys())
+    registry = ModelRegistry(model_dir, SAMPLE_BUILDERS.keys())
+    dataset = TrainingDataset(db_path)
+    rng = np.random.default_rng(seed)
+    version = time.strftime('%Y%m%d%H%M%S')
+
+    results = {}
+    for name in model_names:
+        X, y = SAMPLE_BUILDERS[name](dataset)
+        source = 'database'
+
+        if len(X) < min_samples or (name in CLASSIFIERS and len(np.unique(y)) < 2):
+            if not allow_demo:
+                logging.error(f"학습 데이터 부족: {name} ({len(X)}개 샘플) - --allow-demo로 데모 모델 생성 가능")
+                results[name] = {'trained': False, 'samples': len(X)}
+                continue
+            logging.warning(f"학습 데이터 부족으로 데모 데이터 사용: {name} ({len(X)}개 샘플)")
+            X, y = build_demo_samples(name, rng)
+            source = 'demo'
+
+        start = time.perf_counter()
+        model = train_model(name, X, y, n_estimators=n_estimators, n_jobs=n_jobs, seed=seed)
+        elapsed = time.perf_counter() - start
+
+        # 학습 병렬 설정이 피클에 남으면 한 행 예측도 joblib 스레드 풀을 거치므로 초기화
+        model.n_jobs = 1
+        save_model_atomic(model, registry.path(name))
+        entry = registry.record(name, version=version, source=source, samples=len(X),
+                                n_estimators=n_estimators)
+        logging.info(f"모델 학습 완료: {name} ({source}, {len(X)}개 샘플, {elapsed:.1f}초)")
+        results[name] = {'trained': True, 'seconds': elapsed, **entry}
+
+        if compile_forest:
+            compiled = registry.compile(name)
+            results[name]['compiled'] = compiled['saved']
+            logging.info(f"모델 컴파일: {name} (노드 {compiled['nodes']}개, 최대 오차 {compiled['max_abs_diff']:.2e})")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='ML 브릿지 모델 오프라인 학습')
+    parser.add_argument('--db', default=os.environ.get('KEYWORD_DB_PATH', 'gugongil_keywords.db'),
+                        help='키워드 분석 SQLite 데이터베이스 경로')
+    parser.add_argument('--models', help='학습할 모델 이름 (쉼표 구분, 기본값: 전체)')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='모델 저장 디렉토리')
+    parser.add_argument('--allow-demo', action='store_true', help='학습 데이터가 부족하면 데모 데이터로 학습')
+    parser.add_argument('--min-samples', type=int, default=30, help='모델별 최소 학습 샘플 수')
+    parser.add_argument('--n-estimators', type=int, default=100, help='랜덤 포레스트 트리 수')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='병렬 학습 프로세스 수 (-1: 모든 코어)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    parser.add_argument('--compile', action='store_true', help='학습 후 컴파일된 트리 앙상블(.forest.npz)도 저장')
+    args = parser.parse_args()
+
+    model_names = None
+    if args.models:
+        model_names = [name.strip() for name in args.models.split(',') if name.strip()]
+        unknown = [name for name in model_names if name not in SAMPLE_BUILDERS]
+        if unknown:
+            parser.error(f"알 수 없는 모델: {', '.join(unknown)}")
+
+    results = train_all(
+        args.db,
+        model_names=model_names,
+        model_dir=args.model_dir,
+        allow_demo=args.allow_demo,
+        min_samples=args.min_samples,
+        n_estimators=args.n_estimators,
+        n_jobs=args.n_jobs,
+        seed=args.seed,
+        compile_forest=args.compile
+    )
+
+    if not all(result['trained'] for result in results.values()):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()